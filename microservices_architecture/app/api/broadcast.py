@@ -0,0 +1,243 @@
+"""
+Nöbet listesi değişikliklerinin Server-Sent Events ile yayınlanması.
+
+Her API süreci tek bir yayıncı (`DutyBroadcaster`) çalıştırır. Yayıncı veri
+sürümü değişikliklerini yanıt önbelleğinin izleme thread'inden alır
+(PostgreSQL'de LISTEN/NOTIFY, diğer veritabanlarında yoklama; bkz.
+`app.api.cache`); önbellek kapalıysa sürümü kendisi yoklar. Sürüm her
+değiştiğinde günün anlık görüntüsünden olay bir kez kodlanır ve aynı baytlar
+tüm bağlantılara dağıtılır; bağlantı başına veritabanı sorgusu yapılmaz.
+
+Her bağlantının tek elemanlık bir kuyruğu vardır: istemci yetişemezse eski
+olay yenisiyle değiştirilir (sadece son durum önemlidir). Boştaki bir
+bağlantı sadece bir kuyruk ve bekleyen bir coroutine'dir; binlerce bağlantı
+ucuza açık tutulabilir.
+
+Akış, istemci bağlantıyı kestiğinde (`request.is_disconnected()`) veya
+yayıncı durdurulduğunda biter. uvicorn kapanırken shutdown olayından önce açık
+bağlantıların bitmesini bekler; bu bekleme `--timeout-graceful-shutdown` ile
+sınırlanır (run_api.py ve docker-compose'da 5 sn), süre dolunca kalan akışlar
+iptal edilir ve ardından shutdown olayı çalışır.
+"""
+import asyncio
+import datetime
+import json
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+from loguru import logger
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from app.api.cache import get_response_cache
+from app.config import get_settings
+from app.database.connection import SessionLocal
+from app.database.version import get_data_version
+
+settings = get_settings()
+
+# SSE olay adı
+OLAY_ADI = "nobet-listesi"
+
+
+def _olay_hazirla(surum: int, tarih: datetime.date) -> Dict[bool, bytes]:
+    """
+    Tarihin güncel anlık görüntüsünden SSE olayını kodlar.
+
+    Returns:
+        Dict[bool, bytes]: Liste içermeyen (False) ve listeyi içeren (True) olay baytları
+    """
+    from app.api.snapshot import current_snapshot
+
+    db = SessionLocal()
+    try:
+        anlik = current_snapshot(db, tarih)
+    finally:
+        db.close()
+
+    # Görüntü arada oluşan daha yeni bir sürüme ait olabilir; olay görüntünün sürümünü taşır
+    ozet = json.dumps(
+        {
+            "veri_surumu": anlik.veri_surumu,
+            "tarih": tarih.isoformat(),
+            "etag": anlik.etag,
+            "eczane_sayisi": anlik.eczane_sayisi,
+        },
+        ensure_ascii=False, separators=(",", ":"),
+    ).encode("utf-8")
+    bas = f"id: {anlik.veri_surumu}\nevent: {OLAY_ADI}\ndata: ".encode("utf-8")
+    return {
+        False: bas + ozet + b"\n\n",
+        # Anlık görüntü JSON'u tek satırdır; olaya olduğu gibi eklenir
+        True: bas + ozet[:-1] + b',"eczaneler":' + anlik.json_icerik + b"}\n\n",
+    }
+
+
+class DutyBroadcaster:
+    """Veri sürümü değişikliklerini süreçteki tüm SSE bağlantılarına dağıtan yayıncı."""
+
+    def __init__(self):
+        self._aboneler: Set[asyncio.Queue] = set()
+        self._dongu: Optional[asyncio.AbstractEventLoop] = None
+        self._yoklama: Optional[asyncio.Task] = None
+        self._olay: Optional[Tuple[Tuple[int, datetime.date], Dict[bool, bytes]]] = None
+        self._olay_kilidi: Optional[asyncio.Lock] = None
+        self._surum: Optional[int] = None
+        self._sayaclar = {"yayin": 0, "teslim": 0, "ustune_yazilan": 0, "reddedilen": 0}
+
+    def start(self):
+        """Olay döngüsünü kaydeder ve veri sürümü bildirimlerine abone olur (startup olayında çağrılır)."""
+        if self._dongu is not None:
+            return
+        self._dongu = asyncio.get_running_loop()
+        self._olay_kilidi = asyncio.Lock()
+        get_response_cache().add_listener(self._surum_degisti)
+
+    async def stop(self):
+        """Açık akışları sonlandırır ve yoklama görevini durdurur (shutdown olayında çağrılır)."""
+        self._akislari_kapat()
+        if self._yoklama is not None:
+            self._yoklama.cancel()
+            self._yoklama = None
+        self._dongu = None
+
+    def _akislari_kapat(self):
+        """Her bağlantının kuyruğuna akışı bitiren `None` koyar."""
+        for kuyruk in list(self._aboneler):
+            if kuyruk.full():
+                kuyruk.get_nowait()
+            kuyruk.put_nowait(None)
+
+    @property
+    def baglanti_sayisi(self) -> int:
+        """Açık akış sayısı."""
+        return len(self._aboneler)
+
+    # Sürüm takibi
+
+    def _surum_degisti(self, surum: int):
+        """İzleme thread'inden çağrılır; yayını olay döngüsüne aktarır."""
+        dongu = self._dongu
+        if dongu is not None and not dongu.is_closed():
+            dongu.call_soon_threadsafe(lambda: asyncio.ensure_future(self._yayinla(surum)))
+
+    async def _guncel_surum(self) -> int:
+        """Yanıt önbelleğinin izlediği sürümü, önbellek kapalıysa veritabanındaki sürümü döndürür."""
+        surum = get_response_cache().surum
+        if surum is not None:
+            return surum
+        if self._surum is None:
+            self._surum = await run_in_threadpool(self._surumu_oku)
+        return self._surum
+
+    @staticmethod
+    def _surumu_oku() -> int:
+        db = SessionLocal()
+        try:
+            return get_data_version(db)
+        finally:
+            db.close()
+
+    async def _yokla(self):
+        """Yanıt önbelleği sürümü izlemiyorsa sürümü `DATA_VERSION_POLL_SECONDS` aralıklarla okur."""
+        while True:
+            await asyncio.sleep(settings.DATA_VERSION_POLL_SECONDS)
+            if get_response_cache().surum is not None:
+                continue
+            try:
+                surum = await run_in_threadpool(self._surumu_oku)
+            except Exception as e:
+                logger.error(f"Canlı yayın için veri sürümü okunamadı: {str(e)}")
+                continue
+            if surum != self._surum:
+                await self._yayinla(surum)
+
+    # Yayın
+
+    async def _olay_al(self, surum: int) -> Dict[bool, bytes]:
+        """Sürümün olayını döndürür; süreçte sürüm ve gün başına bir kez kodlanır."""
+        anahtar = (surum, datetime.date.today())
+        if self._olay_kilidi is None:
+            self._olay_kilidi = asyncio.Lock()
+        async with self._olay_kilidi:
+            if self._olay is None or self._olay[0] != anahtar:
+                self._olay = (anahtar, await run_in_threadpool(_olay_hazirla, *anahtar))
+            return self._olay[1]
+
+    async def _yayinla(self, surum: int):
+        """Yeni sürümün olayını tüm bağlantıların kuyruğuna koyar."""
+        self._surum = surum
+        if not self._aboneler:
+            return
+        try:
+            olay = await self._olay_al(surum)
+        except Exception as e:
+            logger.error(f"Veri sürümü {surum} için canlı yayın olayı hazırlanamadı: {str(e)}")
+            return
+
+        self._sayaclar["yayin"] += 1
+        for kuyruk in list(self._aboneler):
+            if kuyruk.full():
+                kuyruk.get_nowait()
+                self._sayaclar["ustune_yazilan"] += 1
+            kuyruk.put_nowait(olay)
+        logger.info(f"Veri sürümü {surum} {len(self._aboneler)} canlı yayın bağlantısına gönderildi")
+
+    async def stream(self, request: Request, liste: bool, son_olay_id: Optional[str]) -> AsyncIterator[bytes]:
+        """
+        Bir bağlantının SSE akışını üretir.
+
+        Önce güncel durum gönderilir (istemcinin `Last-Event-ID`'si güncel
+        sürümse gönderilmez), ardından her sürüm değişikliğinde bir olay ve
+        aradaki boş sürelerde `STREAM_HEARTBEAT_SECONDS` aralıklarla yorum
+        satırı gönderilir. İstemci bağlantıyı keserse veya yayıncı
+        durdurulursa akış biter ve abonelik kaldırılır.
+        """
+        if self._dongu is None:
+            self.start()
+        kuyruk: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._aboneler.add(kuyruk)
+        if self._yoklama is None and get_response_cache().surum is None:
+            self._yoklama = asyncio.ensure_future(self._yokla())
+        try:
+            yield f"retry: {settings.STREAM_RETRY_MS}\n\n".encode("utf-8")
+
+            surum = await self._guncel_surum()
+            if son_olay_id != str(surum):
+                yield (await self._olay_al(surum))[liste]
+                self._sayaclar["teslim"] += 1
+
+            while not await request.is_disconnected():
+                try:
+                    olay = await asyncio.wait_for(kuyruk.get(), timeout=settings.STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if olay is None:
+                    # Sunucu kapanıyor; istemci `retry` süresi sonra başka bir sürece bağlanır
+                    return
+                yield olay[liste]
+                self._sayaclar["teslim"] += 1
+        finally:
+            self._aboneler.discard(kuyruk)
+
+    def reject(self):
+        """Bağlantı sınırı nedeniyle reddedilen bir isteği sayar."""
+        self._sayaclar["reddedilen"] += 1
+
+    def istatistik(self) -> Dict[str, Any]:
+        """Açık bağlantı sayısı, yayın/teslim sayaçları ve son yayınlanan sürüm."""
+        return {
+            **self._sayaclar,
+            "baglanti": len(self._aboneler),
+            "en_fazla_baglanti": settings.STREAM_MAX_CONNECTIONS,
+            "veri_surumu": self._surum,
+            "izleme": "onbellek" if get_response_cache().surum is not None else "yoklama",
+        }
+
+
+@lru_cache()
+def get_duty_broadcaster() -> DutyBroadcaster:
+    """Süreç genelinde paylaşılan yayıncıyı döndürür."""
+    return DutyBroadcaster()
+
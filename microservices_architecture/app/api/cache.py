@@ -0,0 +1,240 @@
+"""
+Veri sürümüne bağlı API yanıt önbelleği.
+
+Yanıtlar JSON'a çevrilmiş bayt olarak saklanır; isabet durumunda ne
+veritabanına gidilir ne de Pydantic nesneleri oluşturulur. Önbellek,
+`veri_surumu` sayacı değiştiğinde (scraper veya koordinat güncelleme
+endpoint'leri veri yazdığında) tamamen temizlenir. Sayaç PostgreSQL'de
+LISTEN/NOTIFY ile, diğer veritabanlarında `DATA_VERSION_POLL_SECONDS`
+aralıklarla yoklanarak izlenir.
+"""
+import json
+import select
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from loguru import logger
+
+from app.config import get_settings
+from app.database.connection import get_engine
+from app.database.version import VERI_SURUMU_KANALI, get_data_version
+
+settings = get_settings()
+
+
+def _json_bayt(veri: Any) -> bytes:
+    """Veriyi FastAPI'nin JSONResponse çıktısıyla aynı biçimde JSON baytına çevirir."""
+    return json.dumps(
+        jsonable_encoder(veri), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class ResponseCache:
+    """
+    Veri sürümüyle geçersiz kılınan, LRU tahliyeli yanıt önbelleği.
+
+    İzleme thread'i başlatılmadan (`start`) önbellek devre dışıdır ve her
+    istek doğrudan üretilir; böylece sürüm takibi olmayan bir süreç asla
+    eski veri döndürmez.
+    """
+
+    def __init__(self, max_kayit: int = 1000):
+        self.max_kayit = max_kayit
+        self._kayitlar: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._kilit = threading.Lock()
+        self._surum: Optional[int] = None
+        self._durdur = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sayaclar = {"isabet": 0, "iskalama": 0, "tahliye": 0, "gecersiz_kilma": 0}
+        self._bellek = 0
+        self._dinleyiciler: List[Callable[[int], None]] = []
+        self.izleme_yontemi: Optional[str] = None
+
+    # Sürüm takibi
+
+    def start(self):
+        """Güncel sürümü okur ve sürüm izleme thread'ini başlatır."""
+        if self._thread is not None:
+            return
+
+        engine = get_engine()
+        with engine.connect() as conn:
+            self._surum = get_data_version(conn)
+
+        self._durdur.clear()
+        hedef = self._dinle if engine.dialect.name == "postgresql" else self._yokla
+        self.izleme_yontemi = "listen" if engine.dialect.name == "postgresql" else "yoklama"
+        self._thread = threading.Thread(target=hedef, name="yanit-onbellegi", daemon=True)
+        self._thread.start()
+        logger.info(f"Yanıt önbelleği başlatıldı (veri sürümü {self._surum}, izleme: {self.izleme_yontemi})")
+
+    def stop(self):
+        """Sürüm izleme thread'ini durdurur ve önbelleği devre dışı bırakır."""
+        self._durdur.set()
+        if self._thread is not None:
+            self._thread.join(timeout=settings.DATA_VERSION_POLL_SECONDS + 1)
+        self._thread = None
+        self._surum = None
+        self.clear()
+
+    @property
+    def surum(self) -> Optional[int]:
+        """İzlenen veri sürümü (izleme başlatılmadıysa None)."""
+        return self._surum
+
+    def add_listener(self, dinleyici: Callable[[int], None]):
+        """
+        Veri sürümü değiştiğinde yeni sürümle çağrılacak fonksiyonu ekler.
+
+        Dinleyiciler izleme thread'inden çağrılır; uzun sürmemeli ve hata fırlatmamalıdır.
+        """
+        self._dinleyiciler.append(dinleyici)
+
+    def set_version(self, surum: int):
+        """Yeni veri sürümünü kaydeder; sürüm değiştiyse önbelleği temizler ve dinleyicilere bildirir."""
+        with self._kilit:
+            if self._surum is None or surum == self._surum:
+                return
+            self._surum = surum
+            self._sayaclar["gecersiz_kilma"] += 1
+            self._kayitlar.clear()
+            self._bellek = 0
+        logger.info(f"Veri sürümü {surum} oldu, yanıt önbelleği temizlendi")
+
+        for dinleyici in list(self._dinleyiciler):
+            try:
+                dinleyici(surum)
+            except Exception as e:
+                logger.error(f"Veri sürümü dinleyicisi hata verdi: {str(e)}")
+
+    def _yokla(self):
+        """Sürüm sayacını belirli aralıklarla okur (SQLite ve diğerleri için)."""
+        while not self._durdur.wait(settings.DATA_VERSION_POLL_SECONDS):
+            try:
+                with get_engine().connect() as conn:
+                    self.set_version(get_data_version(conn))
+            except Exception as e:
+                logger.error(f"Veri sürümü okunamadı: {str(e)}")
+
+    def _dinle(self):
+        """PostgreSQL'de `veri_surumu` kanalını dinler; bağlantı koparsa yeniden bağlanır."""
+        engine = get_engine()
+        while not self._durdur.is_set():
+            baglanti = None
+            try:
+                # Havuzdan bağımsız, sadece dinlemeye ayrılmış bağlantı
+                cargs, cparams = engine.dialect.create_connect_args(engine.url)
+                baglanti = engine.dialect.dbapi.connect(*cargs, **cparams)
+                baglanti.autocommit = True
+                with baglanti.cursor() as cur:
+                    cur.execute(f"LISTEN {VERI_SURUMU_KANALI}")
+
+                # LISTEN başladıktan sonra kaçırılmış bir artış olmasın
+                with engine.connect() as conn:
+                    self.set_version(get_data_version(conn))
+
+                while not self._durdur.is_set():
+                    hazir, _, _ = select.select([baglanti], [], [], settings.DATA_VERSION_POLL_SECONDS)
+                    if not hazir:
+                        continue
+                    baglanti.poll()
+                    while baglanti.notifies:
+                        bildirim = baglanti.notifies.pop(0)
+                        self.set_version(int(bildirim.payload))
+
+            except Exception as e:
+                logger.error(f"Veri sürümü bildirimleri dinlenemiyor: {str(e)}")
+                self._durdur.wait(settings.DATA_VERSION_POLL_SECONDS)
+            finally:
+                if baglanti is not None:
+                    try:
+                        baglanti.close()
+                    except Exception:
+                        pass
+
+    # Önbellek işlemleri
+
+    def clear(self):
+        """Tüm kayıtları siler."""
+        with self._kilit:
+            self._kayitlar.clear()
+            self._bellek = 0
+
+    def json_response(self, anahtar: Hashable, uret: Callable[[], Any]) -> Response:
+        """
+        Anahtarın önbellekteki JSON yanıtını döndürür; yoksa `uret` ile üretip saklar.
+
+        Args:
+            anahtar: Endpoint adı ve sorgu parametrelerinden oluşan anahtar
+            uret: Yanıt verisini (Pydantic/ORM nesneleri veya temel tipler) üreten fonksiyon
+        """
+        icerik, surum = self._bul(anahtar)
+        if icerik is None:
+            icerik = _json_bayt(uret())
+            if surum is not None:
+                self._sakla(anahtar, icerik, surum)
+
+        return Response(content=icerik, media_type="application/json")
+
+    async def json_response_async(self, anahtar: Hashable, uret: Callable[[], Awaitable[Any]]) -> Response:
+        """`json_response` ile aynı; yanıt verisi bir coroutine (`await uret()`) ile üretilir."""
+        icerik, surum = self._bul(anahtar)
+        if icerik is None:
+            icerik = _json_bayt(await uret())
+            if surum is not None:
+                self._sakla(anahtar, icerik, surum)
+
+        return Response(content=icerik, media_type="application/json")
+
+    def _bul(self, anahtar: Hashable) -> Tuple[Optional[bytes], Optional[int]]:
+        """Anahtarın önbellekteki içeriğini ve okunduğu veri sürümünü döndürür."""
+        with self._kilit:
+            surum = self._surum
+            icerik = self._kayitlar.get(anahtar) if surum is not None else None
+            if icerik is not None:
+                self._kayitlar.move_to_end(anahtar)
+                self._sayaclar["isabet"] += 1
+            elif surum is not None:
+                self._sayaclar["iskalama"] += 1
+        return icerik, surum
+
+    def _sakla(self, anahtar: Hashable, icerik: bytes, surum: int):
+        """Yanıtı, üretimi sırasında veri sürümü değişmediyse saklar."""
+        with self._kilit:
+            if surum != self._surum:
+                return
+            eski = self._kayitlar.pop(anahtar, None)
+            if eski is not None:
+                self._bellek -= sys.getsizeof(eski)
+            self._kayitlar[anahtar] = icerik
+            self._bellek += sys.getsizeof(icerik)
+
+            while len(self._kayitlar) > self.max_kayit:
+                _, tahliye = self._kayitlar.popitem(last=False)
+                self._bellek -= sys.getsizeof(tahliye)
+                self._sayaclar["tahliye"] += 1
+
+    def istatistik(self) -> Dict[str, Any]:
+        """İsabet oranı, kayıt sayısı, bellek kullanımı ve veri sürümünü döndürür."""
+        with self._kilit:
+            sayaclar = dict(self._sayaclar)
+            toplam = sayaclar["isabet"] + sayaclar["iskalama"]
+            return {
+                **sayaclar,
+                "isabet_orani": round(sayaclar["isabet"] / toplam, 4) if toplam else 0.0,
+                "kayit_sayisi": len(self._kayitlar),
+                "bellek_bayt": self._bellek,
+                "veri_surumu": self._surum,
+                "izleme": self.izleme_yontemi if self._surum is not None else "devre_disi",
+            }
+
+
+@lru_cache()
+def get_response_cache() -> ResponseCache:
+    """Süreç genelinde paylaşılan yanıt önbelleğini döndürür."""
+    return ResponseCache(max_kayit=settings.RESPONSE_CACHE_MAX_ENTRIES)
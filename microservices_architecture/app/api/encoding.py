@@ -0,0 +1,46 @@
+"""
+İçerik kodlaması (Accept-Encoding) pazarlığı.
+
+`Accept-Encoding` başlığı q-değerleriyle birlikte ayrıştırılır (RFC 9110,
+12.5.3): `gzip;q=0` gzip'i açıkça reddeder, listede gzip yoksa `*` kuralı
+geçerlidir. Aynı URL'nin gzip'li ve düz hâlleri farklı temsillerdir; güçlü
+ETag'leri de farklı olmalıdır (`representation_etag`).
+"""
+from typing import Dict
+
+# Gzip ile aynı kodlamayı gösteren adlar
+_GZIP_ADLARI = ("gzip", "x-gzip")
+
+
+def _kodlama_agirliklari(accept_encoding: str) -> Dict[str, float]:
+    """Başlıktaki kodlama adlarını (küçük harfle) q-değerleriyle döndürür; q verilmezse 1."""
+    agirliklar: Dict[str, float] = {}
+    for oge in accept_encoding.split(","):
+        ad, _, parametreler = oge.partition(";")
+        ad = ad.strip().lower()
+        if not ad:
+            continue
+        q = 1.0
+        for parametre in parametreler.split(";"):
+            anahtar, _, deger = parametre.partition("=")
+            if anahtar.strip().lower() == "q":
+                try:
+                    q = float(deger.strip())
+                except ValueError:
+                    q = 0.0
+        agirliklar[ad] = q
+    return agirliklar
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """İstemcinin `Accept-Encoding` başlığı gzip'li yanıtı kabul ediyor mu."""
+    agirliklar = _kodlama_agirliklari(accept_encoding)
+    for ad in _GZIP_ADLARI:
+        if ad in agirliklar:
+            return agirliklar[ad] > 0
+    return agirliklar.get("*", 0) > 0
+
+
+def representation_etag(etag: str, gzip: bool) -> str:
+    """Düz içeriğin güçlü ETag'inden gzip'li temsilin ETag'ini türetir (`"<özet>-gz"`)."""
+    return f'{etag[:-1]}-gz"' if gzip else etag
@@ -1,20 +1,23 @@
 """
 FastAPI app ve ana router.
 """
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
-from app.database.connection import engine, Base
 from app.database import get_db
-from app.api.routes import eczane_router
+from app.database.async_connection import dispose_async_engine
+from app.database.models import create_tables
+from app.api.broadcast import get_duty_broadcaster
+from app.api.cache import get_response_cache
+from app.api.metrics import MetricsMiddleware, metrics_response
+from app.api.profiling import setup_profiling
+from app.api.routes import eczane_router, eczane_async_router, export_router, stream_router, yonetim_router
+from app.scraper.backfill import stop_backfill
 
 settings = get_settings()
 
-# Veritabanı tablolarını oluştur
-Base.metadata.create_all(bind=engine)
-
 # FastAPI uygulamasını oluştur
 app = FastAPI(
     title=settings.API_TITLE,
@@ -31,8 +34,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# İstek süresi ve durum kodu metrikleri
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Alt routerları ekle
 app.include_router(eczane_router, prefix="/api", tags=["eczaneler"])
+app.include_router(eczane_async_router, prefix="/api/async", tags=["eczaneler-async"])
+app.include_router(export_router, prefix="/api", tags=["export"])
+app.include_router(stream_router, prefix="/api", tags=["canli-yayin"])
+app.include_router(yonetim_router, prefix="/api", tags=["yonetim"])
+
+@app.on_event("startup")
+def sema_gecislerini_uygula():
+    """Veritabanı tablolarını oluşturur ve şema geçişlerini uygular (`AUTO_MIGRATE`)."""
+    if settings.AUTO_MIGRATE:
+        create_tables()
+
+@app.on_event("startup")
+def yanit_onbellegini_baslat():
+    """Veri sürümü izlemesini ve yanıt önbelleğini başlatır."""
+    if settings.RESPONSE_CACHE_ENABLED:
+        get_response_cache().start()
+
+@app.on_event("startup")
+async def canli_yayini_baslat():
+    """Nöbet listesi canlı yayıncısını bu sürecin olay döngüsüne bağlar."""
+    get_duty_broadcaster().start()
+
+@app.on_event("shutdown")
+async def canli_yayini_durdur():
+    """Açık canlı yayın akışlarını sonlandırır."""
+    await get_duty_broadcaster().stop()
+
+@app.on_event("shutdown")
+def yanit_onbellegini_durdur():
+    """Veri sürümü izleme thread'ini durdurur."""
+    get_response_cache().stop()
+
+@app.on_event("shutdown")
+def koordinat_tamamlamayi_durdur():
+    """Bu süreçte çalışan koordinat tamamlama işini duraklatır."""
+    stop_backfill()
+
+@app.on_event("shutdown")
+async def asenkron_motoru_kapat():
+    """Asenkron bağlantı havuzunu kapatır."""
+    await dispose_async_engine()
 
 @app.get("/", tags=["root"])
 def ana_sayfa():
@@ -43,6 +91,13 @@ def ana_sayfa():
         "dokumantasyon": "/docs"
     }
 
+@app.get("/metrics", tags=["metrics"], include_in_schema=False)
+def metrikler():
+    """Prometheus metin biçiminde metrikler."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrikler kapalı")
+    return metrics_response()
+
 @app.get("/health", tags=["health"])
 def health_check(db: Session = Depends(get_db)):
     """Sağlık kontrolü."""
@@ -56,4 +111,8 @@ def health_check(db: Session = Depends(get_db)):
     return {
         "status": "çalışıyor",
         "database": db_status
-    }
\ No newline at end of file
+    }
+
+# İstek profilleme (Server-Timing, yavaş sorgu ve N+1 logu); tüm route'lar eklendikten sonra
+if settings.PROFILING_ENABLED:
+    setup_profiling(app)
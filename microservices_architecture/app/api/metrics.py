@@ -0,0 +1,62 @@
+"""
+API istek metrikleri.
+
+`MetricsMiddleware` her isteğin süresini ve durum kodunu, istek yolunun
+kendisi yerine eşleşen route şablonuyla (örn. `/api/eczaneler/{eczane_id}`)
+etiketleyerek kaydeder; böylece etiket sayısı route sayısıyla sınırlı kalır.
+Saf ASGI middleware'i olduğu için akış (streaming) yanıtlarını tamponlamaz.
+"""
+import time
+
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.utils.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS, render_metrics
+
+# Hiçbir route ile eşleşmeyen istekler (404) tek etikette toplanır
+ESLESMEYEN_ROUTE = "eslesmeyen"
+
+
+def _route_etiketi(scope) -> str:
+    """İsteğin eşleştiği route şablonunu döndürür."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # FastAPI dışı route'lar (/docs, /openapi.json) sabit yollardır
+    if scope.get("endpoint") is not None:
+        return scope["path"]
+    return ESLESMEYEN_ROUTE
+
+
+class MetricsMiddleware:
+    """HTTP isteklerinin süresini ve durum kodunu route şablonuna göre kaydeder."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        baslangic = time.perf_counter()
+        durum = 500
+
+        async def send_durum(mesaj):
+            nonlocal durum
+            if mesaj["type"] == "http.response.start":
+                durum = mesaj["status"]
+            await send(mesaj)
+
+        try:
+            await self.app(scope, receive, send_durum)
+        finally:
+            route = _route_etiketi(scope)
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route).observe(time.perf_counter() - baslangic)
+            HTTP_REQUESTS.labels(scope["method"], route, str(durum)).inc()
+
+
+def metrics_response() -> Response:
+    """Metrikleri Prometheus metin biçiminde döndüren yanıt."""
+    # media_type verilirse Starlette charset ekler; CONTENT_TYPE_LATEST zaten charset içerir
+    return Response(render_metrics(), headers={"Content-Type": CONTENT_TYPE_LATEST})
@@ -0,0 +1,58 @@
+"""
+Keyset (cursor) sayfalama yardımcıları.
+
+Liste endpoint'leri `OFFSET` yerine son döndürülen satırın sıralama
+anahtarından devam eder: `WHERE (tarih, id) > (:tarih, :id) ORDER BY tarih, id
+LIMIT n`. Böylece N. sayfa da ilk sayfa kadar ucuzdur ve sayfalar arasında
+satır atlanmaz ya da tekrarlanmaz. İstemciye anahtar, içeriği önemsenmeyen
+(opak) bir `cursor` olarak verilir.
+"""
+import base64
+import datetime
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException
+
+T = TypeVar("T")
+
+
+def encode_cursor(anahtar: Sequence[Any]) -> str:
+    """Sıralama anahtarını URL'de kullanılabilir opak bir cursor'a çevirir."""
+    degerler = [d.isoformat() if isinstance(d, datetime.date) else d for d in anahtar]
+    veri = json.dumps(degerler, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(veri).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, tipler: Sequence[Callable[[Any], Any]]) -> Tuple[Any, ...]:
+    """
+    Cursor'ı sıralama anahtarına çevirir.
+
+    Args:
+        cursor: `encode_cursor` ile üretilmiş değer
+        tipler: Anahtarın her elemanı için dönüştürücü (örn. `int`, `datetime.date.fromisoformat`)
+
+    Raises:
+        HTTPException: Cursor bozuksa veya bu endpoint'e ait değilse (400)
+    """
+    try:
+        veri = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        degerler = json.loads(veri)
+        if not isinstance(degerler, list) or len(degerler) != len(tipler):
+            raise ValueError(cursor)
+        return tuple(tip(deger) for tip, deger in zip(tipler, degerler))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Geçersiz cursor")
+
+
+def sayfala(kayitlar: List[T], limit: int, anahtar: Callable[[T], Sequence[Any]]) -> Tuple[List[T], Optional[str]]:
+    """
+    `limit + 1` satırla yapılmış bir sorgunun sonucunu sayfaya ve sonraki cursor'a ayırır.
+
+    Returns:
+        (sayfadaki kayıtlar, sonraki sayfanın cursor'ı veya son sayfaysa None)
+    """
+    if len(kayitlar) <= limit:
+        return kayitlar, None
+    sayfa = kayitlar[:limit]
+    return sayfa, encode_cursor(anahtar(sayfa[-1]))
@@ -0,0 +1,200 @@
+"""
+İstek profilleme (isteğe bağlı, `PROFILING_ENABLED`).
+
+Her istek için toplam süre, endpoint süresi, veritabanı süresi, SQL ifadesi
+sayısı ve yanıtın serileştirilme süresi ölçülür ve `Server-Timing` başlığı
+olarak döndürülür; tarayıcı geliştirici araçları bu değerleri ağ sekmesinde
+gösterir.
+
+- Veritabanı süresi SQLAlchemy `before/after_cursor_execute` olaylarıyla
+  ölçülür; senkron ve asenkron motorlar aynı olayları tetikler.
+- `PROFILING_SLOW_QUERY_MS` eşiğini aşan ifadeler parametreleri ve route ile
+  birlikte `PROFILING_SLOW_QUERY_LOG` dosyasına yazılır.
+- Aynı istekte aynı SQL ifadesi `PROFILING_N_PLUS_ONE_THRESHOLD` kez veya daha
+  fazla çalıştırılırsa (örn. döngü içinde tembel yüklenen `nobetler`
+  ilişkisi) istek N+1 şüphesiyle loglanır.
+- Serileştirme süresi, endpoint fonksiyonunun dönmesinden yanıt başlığının
+  gönderilmesine kadar geçen süredir (response_model doğrulaması ve JSON'a
+  çevirme).
+"""
+import contextvars
+import functools
+import inspect
+import time
+from collections import Counter
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Aktif isteğin profili; thread havuzuna ve asenkron sürücünün greenlet'lerine kopyalanır
+_profil: contextvars.ContextVar[Optional["IstekProfili"]] = contextvars.ContextVar("istek_profili", default=None)
+
+# Yavaş sorgu ve N+1 kayıtları ayrı bir log dosyasına yazılır
+_profil_logger = logger.bind(profil=True)
+
+
+class IstekProfili:
+    """Tek bir isteğin süre ve SQL ölçümleri."""
+
+    __slots__ = ("scope", "baslangic", "endpoint_sure", "endpoint_bitis", "db_sure", "ifade_sayisi", "ifadeler")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.baslangic = time.perf_counter()
+        self.endpoint_sure = 0.0
+        self.endpoint_bitis: Optional[float] = None
+        self.db_sure = 0.0
+        self.ifade_sayisi = 0
+        self.ifadeler: Counter = Counter()
+
+    @property
+    def route(self) -> str:
+        """İsteğin metodu ve eşleştiği route şablonu (eşleşme öncesinde istek yolu)."""
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {route.path if route is not None else self.scope['path']}"
+
+    def server_timing(self) -> str:
+        """`Server-Timing` başlık değerini döndürür (süreler ms)."""
+        simdi = time.perf_counter()
+        olcumler = [
+            f'db;dur={self.db_sure * 1000:.2f};desc="{self.ifade_sayisi} sorgu"',
+            f"app;dur={self.endpoint_sure * 1000:.2f}",
+        ]
+        if self.endpoint_bitis is not None:
+            olcumler.append(f"ser;dur={(simdi - self.endpoint_bitis) * 1000:.2f}")
+        olcumler.append(f"total;dur={(simdi - self.baslangic) * 1000:.2f}")
+        tekrar = self.en_cok_tekrar()
+        if tekrar >= settings.PROFILING_N_PLUS_ONE_THRESHOLD:
+            olcumler.append(f'nplusone;desc="{tekrar} tekrar"')
+        return ", ".join(olcumler)
+
+    def en_cok_tekrar(self) -> int:
+        """En çok tekrarlanan SQL ifadesinin çalıştırılma sayısı."""
+        return max(self.ifadeler.values(), default=0)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("profil_baslangic", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    baslangiclar = conn.info.get("profil_baslangic")
+    if not baslangiclar:
+        return
+    sure = time.perf_counter() - baslangiclar.pop()
+
+    profil = _profil.get()
+    if profil is not None:
+        profil.db_sure += sure
+        profil.ifade_sayisi += 1
+        profil.ifadeler[statement] += 1
+
+    if sure * 1000 >= settings.PROFILING_SLOW_QUERY_MS:
+        _profil_logger.warning(
+            f"Yavaş sorgu ({sure * 1000:.1f} ms) [{profil.route if profil else '-'}]: "
+            f"{statement} | parametreler: {parameters!r}"
+        )
+
+
+def _n_arti_bir_kontrol(profil: IstekProfili):
+    """Aynı istekte tekrar tekrar çalıştırılan ifadeleri N+1 şüphesi olarak loglar."""
+    for ifade, sayi in profil.ifadeler.items():
+        if sayi >= settings.PROFILING_N_PLUS_ONE_THRESHOLD:
+            _profil_logger.warning(
+                f"N+1 şüphesi [{profil.route}]: aynı ifade {sayi} kez çalıştırıldı "
+                f"(istekte toplam {profil.ifade_sayisi} sorgu): {ifade}"
+            )
+
+
+class ProfilingMiddleware:
+    """İstek süresini, SQL süresi/sayısını ve serileştirme süresini `Server-Timing` başlığıyla döndürür."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profil = IstekProfili(scope)
+        token = _profil.set(profil)
+
+        async def send_zamanlama(mesaj):
+            if mesaj["type"] == "http.response.start":
+                basliklar = list(mesaj.get("headers", []))
+                basliklar.append((b"server-timing", profil.server_timing().encode("latin-1")))
+                mesaj = {**mesaj, "headers": basliklar}
+            await send(mesaj)
+
+        try:
+            await self.app(scope, receive, send_zamanlama)
+        finally:
+            _profil.reset(token)
+            _n_arti_bir_kontrol(profil)
+
+
+def _endpoint_sure_olc(fonksiyon):
+    """Endpoint fonksiyonunun süresini ve bitiş anını aktif profile yazan sarmalayıcı."""
+    def kaydet(baslangic: float):
+        profil = _profil.get()
+        if profil is not None:
+            profil.endpoint_bitis = time.perf_counter()
+            profil.endpoint_sure += profil.endpoint_bitis - baslangic
+
+    if inspect.iscoroutinefunction(fonksiyon):
+        @functools.wraps(fonksiyon)
+        async def sarmalayici(*args, **kwargs):
+            baslangic = time.perf_counter()
+            try:
+                return await fonksiyon(*args, **kwargs)
+            finally:
+                kaydet(baslangic)
+    else:
+        @functools.wraps(fonksiyon)
+        def sarmalayici(*args, **kwargs):
+            baslangic = time.perf_counter()
+            try:
+                return fonksiyon(*args, **kwargs)
+            finally:
+                kaydet(baslangic)
+    return sarmalayici
+
+
+def setup_profiling(app: FastAPI):
+    """
+    Profillemeyi uygulamaya ekler: middleware, endpoint süre ölçümü,
+    SQLAlchemy olay dinleyicileri ve yavaş sorgu log dosyası.
+
+    Tüm router'lar eklendikten sonra çağrılmalıdır.
+    """
+    app.add_middleware(ProfilingMiddleware)
+
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.dependant.call = _endpoint_sure_olc(route.dependant.call)
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    logger.add(
+        settings.PROFILING_SLOW_QUERY_LOG,
+        level="WARNING",
+        filter=lambda kayit: kayit["extra"].get("profil", False),
+        rotation="1 day",
+        retention="7 days",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+    )
+    logger.info(
+        f"İstek profilleme açık (yavaş sorgu eşiği {settings.PROFILING_SLOW_QUERY_MS} ms, "
+        f"N+1 eşiği {settings.PROFILING_N_PLUS_ONE_THRESHOLD})"
+    )
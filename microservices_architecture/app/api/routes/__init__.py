@@ -2,5 +2,9 @@
 API route paket modülü.
 """
 from app.api.routes.eczane import router as eczane_router
+from app.api.routes.eczane_async import router as eczane_async_router
+from app.api.routes.export import router as export_router
+from app.api.routes.stream import router as stream_router
+from app.api.routes.yonetim import router as yonetim_router
 
-__all__ = ["eczane_router"]
\ No newline at end of file
+__all__ = ["eczane_router", "eczane_async_router", "export_router", "stream_router", "yonetim_router"]
\ No newline at end of file
@@ -3,34 +3,84 @@ Eczane ile ilgili endpoint'ler.
 """
 import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
 
+from app.api.cache import get_response_cache
+from app.api.pagination import decode_cursor, sayfala
+from app.api.snapshot import snapshot_response
+from app.api.spatial_index import get_duty_index
+from app.config import get_settings
 from app.database import get_db
-from app.database.models import Eczane as EczaneModel, NobetciEczane as NobetciEczaneModel
-from app.database.schemas import Eczane as EczaneSchema, NobetciEczaneDetay
-from app.utils.geocode import geocode_address
+from app.database.models import Eczane as EczaneModel
+from app.database.queries import (
+    bolge_istatistikleri_sorgusu, bolgeler_sorgusu, eczane_istatistikleri_sorgusu, eczane_sorgusu,
+    eczaneler_sorgusu, harita_sorgusu, nobet_araligi_sorgusu, nobetci_eczaneler_sorgusu, tarihler_sorgusu,
+)
+from app.database.schemas import (
+    Eczane as EczaneSchema, EczaneSayfasi, NobetciEczaneDetay, NobetciEczaneSayfasi, NobetIstatistikleri,
+    YakinNobetciEczane,
+)
+from app.database.version import bump_data_version
+from app.scraper.sources import locate_pharmacy
+
+settings = get_settings()
 
 router = APIRouter()
 
-@router.get("/eczaneler", response_model=List[EczaneSchema])
+@router.get("/eczaneler", response_model=EczaneSayfasi)
 def get_all_eczaneler(
-    skip: int = Query(0, description="Atlanacak öğe sayısı"),
-    limit: int = Query(100, description="Listelenecek öğe sayısı"),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor (ilk sayfa için boş)"),
+    limit: int = Query(100, ge=1, le=settings.API_MAX_PAGE_SIZE, description="Listelenecek öğe sayısı"),
     db: Session = Depends(get_db)
 ):
     """
-    Tüm eczaneleri listeler.
+    Tüm eczaneleri ID sırasıyla, cursor ile sayfalayarak listeler.
+    Sonraki sayfa için yanıttaki `next_cursor` değeri `cursor` olarak gönderilir.
+    """
+    son_id = decode_cursor(cursor, (int,))[0] if cursor else None
+    
+    # Sonraki sayfa olup olmadığını anlamak için bir fazla satır çekilir
+    eczaneler = db.execute(eczaneler_sorgusu(limit + 1, son_id)).scalars().all()
+    eczaneler, next_cursor = sayfala(eczaneler, limit, lambda e: (e.id,))
+    return {"eczaneler": eczaneler, "next_cursor": next_cursor}
+
+# Sabit yol; /eczaneler/{eczane_id} route'undan önce tanımlanmalı, yoksa ona takılır
+@router.get("/eczaneler/harita-bilgileri")
+def get_eczaneler_harita_bilgileri(
+    sadece_nobetci: bool = Query(False, description="Sadece bugünün nöbetçi eczanelerini göster"),
+    db: Session = Depends(get_db)
+):
+    """
+    Haritada gösterilecek eczane koordinat bilgilerini döndürür.
+    Sadece koordinat bilgisi olan eczaneleri içerir.
     """
-    eczaneler = db.query(EczaneModel).offset(skip).limit(limit).all()
-    return eczaneler
+    # Sadece bugünün nöbetçi eczanelerini istiyorsa sorgu nöbet tablosuyla birleştirilir
+    eczaneler = db.execute(harita_sorgusu(sadece_nobetci)).all()
+    
+    # Sonuçları uygun formatta döndür
+    sonuc = []
+    for e in eczaneler:
+        sonuc.append({
+            "id": e.id,
+            "isim": e.isim,
+            "bolge": e.bolge,
+            "adres": e.adres,
+            "telefon": e.telefon,
+            "latitude": e.latitude,
+            "longitude": e.longitude,
+            "nobetci": sadece_nobetci  # Eğer sadece_nobetci=True ise, tüm sonuçlar nöbetçidir
+        })
+    
+    return sonuc
 
 @router.get("/eczaneler/{eczane_id}", response_model=EczaneSchema)
 def get_eczane(eczane_id: int, db: Session = Depends(get_db)):
     """
     Belirtilen ID'ye sahip eczaneyi getirir.
     """
-    eczane = db.query(EczaneModel).filter(EczaneModel.id == eczane_id).first()
+    eczane = db.execute(eczane_sorgusu(eczane_id)).scalar_one_or_none()
     if eczane is None:
         raise HTTPException(status_code=404, detail="Eczane bulunamadı")
     return eczane
@@ -61,41 +111,78 @@ def get_eczane_koordinat(eczane_id: int, db: Session = Depends(get_db)):
 
 @router.get("/nobetci-eczaneler", response_model=List[NobetciEczaneDetay])
 def get_nobetci_eczaneler(
+    request: Request,
     tarih: Optional[datetime.date] = Query(None, description="Nöbet tarihi (YYYY-MM-DD formatında)"),
     bolge: Optional[str] = Query(None, description="Bölge adı"),
+    kaynak: Optional[str] = Query(None, description="Kaynak (belediye) adı, örn. edremit"),
     koordinat: Optional[bool] = Query(False, description="Koordinat bilgisi olan eczaneleri filtrele"),
     db: Session = Depends(get_db)
 ):
     """
     Belirtilen tarihteki nöbetçi eczaneleri listeler.
     Tarih belirtilmezse, bugünün nöbetçi eczaneleri listelenir.
-    İsteğe bağlı olarak bölge filtrelemesi de yapılabilir.
+    İsteğe bağlı olarak bölge ve kaynak filtrelemesi de yapılabilir.
+    Filtresiz istekler günün önceden hazırlanmış anlık görüntüsünden
+    (ETag ve gzip destekli) yanıtlanır.
     """
     # Tarih belirtilmemişse bugünün tarihini kullan
     if tarih is None:
         tarih = datetime.date.today()
     
-    # Nöbetçi eczaneleri sorgula
-    query = db.query(NobetciEczaneModel).filter(NobetciEczaneModel.tarih == tarih)
+    # Filtre yoksa günün anlık görüntüsünü doğrudan bayt olarak döndür
+    if not (bolge or kaynak or koordinat):
+        return snapshot_response(request, db, tarih)
     
-    # Eczane bilgilerini eager loading ile birlikte getir
-    query = query.options(joinedload(NobetciEczaneModel.eczane))
+    def sorgula():
+        # Sorgu asenkron endpoint'lerle ortak oluşturucudan gelir (bkz. app.database.queries)
+        sonuc = db.execute(nobetci_eczaneler_sorgusu(tarih, bolge, kaynak, koordinat))
+        return [NobetciEczaneDetay.from_orm(n) for n in sonuc.scalars().unique()]
     
-    # Join ile eczane tablosunu birleştir
-    query = query.join(EczaneModel)
-    
-    # Bölge filtresi uygulandıysa sorguya ekle
-    if bolge:
-        query = query.filter(EczaneModel.bolge == bolge)
+    # Veri değişene kadar aynı parametreler için önbellekteki yanıtı döndür
+    return get_response_cache().json_response(("nobetci-eczaneler", tarih, bolge, kaynak, koordinat), sorgula)
+
+@router.get("/nobetci-eczaneler/aralik", response_model=NobetciEczaneSayfasi)
+def get_nobet_araligi(
+    baslangic: Optional[datetime.date] = Query(None, description="Başlangıç tarihi (YYYY-MM-DD formatında)"),
+    bitis: Optional[datetime.date] = Query(None, description="Bitiş tarihi (YYYY-MM-DD formatında)"),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor (ilk sayfa için boş)"),
+    limit: int = Query(100, ge=1, le=settings.API_MAX_PAGE_SIZE, description="Listelenecek öğe sayısı"),
+    db: Session = Depends(get_db)
+):
+    """
+    Tarih aralığındaki nöbet kayıtlarını tarih ve ID sırasıyla, cursor ile
+    sayfalayarak listeler. Tarihler belirtilmezse tüm nöbet geçmişi listelenir.
+    """
+    son = decode_cursor(cursor, (datetime.date.fromisoformat, int)) if cursor else None
     
-    # Koordinat filtresi uygulandıysa sorguya ekle
-    if koordinat:
-        query = query.filter(EczaneModel.latitude.isnot(None), EczaneModel.longitude.isnot(None))
+    # Sonraki sayfa olup olmadığını anlamak için bir fazla satır çekilir
+    sonuc = db.execute(nobet_araligi_sorgusu(baslangic, bitis, limit + 1, son))
+    nobetler, next_cursor = sayfala(sonuc.scalars().unique().all(), limit, lambda n: (n.tarih, n.id))
+    return {"nobetler": nobetler, "next_cursor": next_cursor}
+
+@router.get("/nobetci-eczaneler/yakin", response_model=List[YakinNobetciEczane])
+def get_yakin_nobetci_eczaneler(
+    lat: float = Query(..., ge=-90, le=90, description="Enlem"),
+    lon: float = Query(..., ge=-180, le=180, description="Boylam"),
+    k: int = Query(5, ge=1, le=50, description="Döndürülecek eczane sayısı"),
+    tarih: Optional[datetime.date] = Query(None, description="Nöbet tarihi (YYYY-MM-DD formatında)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Verilen konuma en yakın k nöbetçi eczaneyi, yakından uzağa ve
+    kilometre cinsinden (haversine) mesafeleriyle listeler.
+    Tarih belirtilmezse, bugünün nöbetçi eczaneleri aranır.
+    Sadece koordinat bilgisi olan eczaneler dikkate alınır.
+    """
+    # Tarih belirtilmemişse bugünün tarihini kullan
+    if tarih is None:
+        tarih = datetime.date.today()
     
-    # Sorguyu çalıştır
-    nobetci_eczaneler = query.all()
+    # Günün nöbet listesinin mekânsal indeksinde ara (veri değişene kadar bellekte tutulur)
+    indeks = get_duty_index(db, tarih)
+    sonuc = [{**nobet, "mesafe_km": round(mesafe, 3)} for mesafe, nobet in indeks.nearest(lat, lon, k)]
     
-    return nobetci_eczaneler
+    return JSONResponse(sonuc)
 
 @router.get("/tarihler", response_model=List[datetime.date])
 def get_nobetci_tarihler(
@@ -107,42 +194,47 @@ def get_nobetci_tarihler(
     Nöbetçi eczane kayıtlarının bulunduğu tarihleri listeler.
     İsteğe bağlı olarak başlangıç ve bitiş tarihi belirtilebilir.
     """
-    # Tarihleri veritabanından çek
-    query = db.query(NobetciEczaneModel.tarih).distinct()
-    
-    # Başlangıç tarihi belirtilmişse filtrele
-    if baslangic:
-        query = query.filter(NobetciEczaneModel.tarih >= baslangic)
-    
-    # Bitiş tarihi belirtilmişse filtrele
-    if bitis:
-        query = query.filter(NobetciEczaneModel.tarih <= bitis)
+    def sorgula():
+        # Tarihleri veritabanından çek (en yakın tarih en üstte)
+        return db.execute(tarihler_sorgusu(baslangic, bitis)).scalars().all()
     
-    # Tarihleri sırala (en yakın tarih en üstte)
-    query = query.order_by(NobetciEczaneModel.tarih.desc())
-    
-    # Sorguyu çalıştır ve tarihleri liste olarak döndür
-    tarihler = [tarih[0] for tarih in query.all()]
-    
-    return tarihler
+    return get_response_cache().json_response(("tarihler", baslangic, bitis), sorgula)
 
 @router.get("/bolgeler", response_model=List[str])
 def get_bolgeler(db: Session = Depends(get_db)):
     """
     Sistemde kayıtlı tüm bölgeleri listeler.
     """
-    # Bölgeleri veritabanından çek (benzersiz)
-    bolgeler = db.query(EczaneModel.bolge).distinct().all()
+    def sorgula():
+        # Bölgeleri veritabanından çek (benzersiz)
+        return db.execute(bolgeler_sorgusu()).scalars().all()
     
-    # Bölge adlarını liste olarak döndür
-    return [bolge[0] for bolge in bolgeler]
+    return get_response_cache().json_response(("bolgeler",), sorgula)
 
-@router.get("/eczaneler/harita-bilgileri")
-def get_eczaneler_harita_bilgileri(
-    sadece_nobetci: bool = Query(False, description="Sadece bugünün nöbetçi eczanelerini göster"),
+@router.get("/istatistikler", response_model=NobetIstatistikleri)
+def get_istatistikler(
+    yil: Optional[int] = Query(None, ge=1900, le=9999, description="Yıl (varsayılan: bu yıl)"),
+    ay: Optional[int] = Query(None, ge=1, le=12, description="Ay (verilmezse tüm yıl)"),
+    bolge: Optional[str] = Query(None, description="Bölge adı"),
     db: Session = Depends(get_db)
 ):
-    return
+    """
+    Dönemdeki eczane başına ve bölge başına nöbet sayılarını listeler.
+    Sadece aylık özet tablosundan okunur; yanıt süresi nöbet geçmişinin
+    uzunluğundan bağımsızdır.
+    """
+    if yil is None:
+        yil = datetime.date.today().year
+    
+    def sorgula():
+        return {
+            "yil": yil,
+            "ay": ay,
+            "bolgeler": [dict(satir._mapping) for satir in db.execute(bolge_istatistikleri_sorgusu(yil, ay, bolge))],
+            "eczaneler": [dict(satir._mapping) for satir in db.execute(eczane_istatistikleri_sorgusu(yil, ay, bolge))],
+        }
+    
+    return get_response_cache().json_response(("istatistikler", yil, ay, bolge), sorgula)
 
 @router.post("/eczaneler/{eczane_id}/koordinat-guncelle")
 def update_eczane_koordinat(
@@ -163,7 +255,9 @@ def update_eczane_koordinat(
     eczane.longitude = longitude
     
     try:
+        surum = bump_data_version(db)
         db.commit()
+        get_response_cache().set_version(surum)
         return {
             "id": eczane.id,
             "isim": eczane.isim,
@@ -190,14 +284,8 @@ def find_koordinat_by_address(
     if not eczane.adres:
         raise HTTPException(status_code=400, detail="Eczanenin adresi bulunmamaktadır")
     
-    # Koordinatları bul
-    koordinatlar = geocode_address(eczane.adres)
-    
-    if not koordinatlar:
-        # Adres ile bulunamazsa, konum URL'sini dene
-        if eczane.konum_url:
-            from app.utils.geocode import get_coordinates_from_google_maps_url
-            koordinatlar = get_coordinates_from_google_maps_url(eczane.konum_url)
+    # Koordinatları eczanenin kaynağının şehir/ülkesiyle bul; adresle bulunamazsa konum URL'si denenir
+    koordinatlar = locate_pharmacy(eczane)
     
     if not koordinatlar:
         raise HTTPException(status_code=404, detail=f"Adrese ait koordinat bulunamadı: {eczane.adres}")
@@ -206,7 +294,9 @@ def find_koordinat_by_address(
     eczane.latitude, eczane.longitude = koordinatlar
     
     try:
+        surum = bump_data_version(db)
         db.commit()
+        get_response_cache().set_version(surum)
         return {
             "id": eczane.id,
             "isim": eczane.isim,
@@ -218,48 +308,3 @@ def find_koordinat_by_address(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Güncelleme hatası: {str(e)}")
-
-@router.get("/eczaneler/harita-bilgileri")
-def get_eczaneler_harita_bilgileri(
-    sadece_nobetci: bool = Query(False, description="Sadece bugünün nöbetçi eczanelerini göster"),
-    db: Session = Depends(get_db)
-):
-    """
-    Haritada gösterilecek eczane koordinat bilgilerini döndürür.
-    Sadece koordinat bilgisi olan eczaneleri içerir.
-    """
-    query = db.query(
-        EczaneModel.id,
-        EczaneModel.isim,
-        EczaneModel.bolge,
-        EczaneModel.adres,
-        EczaneModel.telefon,
-        EczaneModel.latitude,
-        EczaneModel.longitude
-    ).filter(
-        EczaneModel.latitude.isnot(None),
-        EczaneModel.longitude.isnot(None)
-    )
-    
-    # Sadece bugünün nöbetçi eczanelerini istiyorsa filtrele
-    if sadece_nobetci:
-        bugun = datetime.date.today()
-        query = query.join(NobetciEczaneModel).filter(NobetciEczaneModel.tarih == bugun)
-    
-    eczaneler = query.all()
-    
-    # Sonuçları uygun formatta döndür
-    sonuc = []
-    for e in eczaneler:
-        sonuc.append({
-            "id": e.id,
-            "isim": e.isim,
-            "bolge": e.bolge,
-            "adres": e.adres,
-            "telefon": e.telefon,
-            "latitude": e.latitude,
-            "longitude": e.longitude,
-            "nobetci": sadece_nobetci  # Eğer sadece_nobetci=True ise, tüm sonuçlar nöbetçidir
-        })
-    
-    return sonuc
\ No newline at end of file
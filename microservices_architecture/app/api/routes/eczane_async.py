@@ -0,0 +1,148 @@
+"""
+Eczane okuma endpoint'lerinin asenkron sürümleri.
+
+`/api/async` öneki altında sunulur. Sorgular senkron endpoint'lerle aynı
+oluşturuculardan (`app.database.queries`) gelir ve `AsyncSession` ile
+çalıştırılır; istekler thread havuzunu kullanmadan event loop üzerinde beklenir.
+"""
+import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.cache import get_response_cache
+from app.api.pagination import decode_cursor, sayfala
+from app.config import get_settings
+from app.database.async_connection import get_async_db
+from app.database.queries import (
+    bolgeler_sorgusu, eczane_sorgusu, eczaneler_sorgusu, nobet_araligi_sorgusu, nobetci_eczaneler_sorgusu,
+    tarihler_sorgusu,
+)
+from app.database.schemas import Eczane as EczaneSchema, EczaneSayfasi, NobetciEczaneDetay, NobetciEczaneSayfasi
+
+settings = get_settings()
+
+router = APIRouter()
+
+
+@router.get("/eczaneler", response_model=EczaneSayfasi)
+async def get_all_eczaneler(
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor (ilk sayfa için boş)"),
+    limit: int = Query(100, ge=1, le=settings.API_MAX_PAGE_SIZE, description="Listelenecek öğe sayısı"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Tüm eczaneleri ID sırasıyla, cursor ile sayfalayarak listeler.
+    """
+    son_id = decode_cursor(cursor, (int,))[0] if cursor else None
+    sonuc = await db.execute(eczaneler_sorgusu(limit + 1, son_id))
+    eczaneler, next_cursor = sayfala(sonuc.scalars().all(), limit, lambda e: (e.id,))
+    return {"eczaneler": eczaneler, "next_cursor": next_cursor}
+
+
+@router.get("/eczaneler/{eczane_id}", response_model=EczaneSchema)
+async def get_eczane(eczane_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Belirtilen ID'ye sahip eczaneyi getirir.
+    """
+    eczane = (await db.execute(eczane_sorgusu(eczane_id))).scalar_one_or_none()
+    if eczane is None:
+        raise HTTPException(status_code=404, detail="Eczane bulunamadı")
+    return eczane
+
+
+@router.get("/eczaneler/koordinat/{eczane_id}")
+async def get_eczane_koordinat(eczane_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Belirtilen ID'ye sahip eczanenin koordinat bilgilerini getirir.
+    """
+    eczane = (await db.execute(eczane_sorgusu(eczane_id))).scalar_one_or_none()
+    if eczane is None:
+        raise HTTPException(status_code=404, detail="Eczane bulunamadı")
+
+    if eczane.latitude is None or eczane.longitude is None:
+        return {
+            "id": eczane.id,
+            "isim": eczane.isim,
+            "koordinat_durumu": "bulunamadı"
+        }
+
+    return {
+        "id": eczane.id,
+        "isim": eczane.isim,
+        "latitude": eczane.latitude,
+        "longitude": eczane.longitude,
+        "koordinat_durumu": "başarılı"
+    }
+
+
+@router.get("/nobetci-eczaneler", response_model=List[NobetciEczaneDetay])
+async def get_nobetci_eczaneler(
+    tarih: Optional[datetime.date] = Query(None, description="Nöbet tarihi (YYYY-MM-DD formatında)"),
+    bolge: Optional[str] = Query(None, description="Bölge adı"),
+    kaynak: Optional[str] = Query(None, description="Kaynak (belediye) adı, örn. edremit"),
+    koordinat: Optional[bool] = Query(False, description="Koordinat bilgisi olan eczaneleri filtrele"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Belirtilen tarihteki nöbetçi eczaneleri listeler.
+    Tarih belirtilmezse, bugünün nöbetçi eczaneleri listelenir.
+    İsteğe bağlı olarak bölge ve kaynak filtrelemesi de yapılabilir.
+    """
+    # Tarih belirtilmemişse bugünün tarihini kullan
+    if tarih is None:
+        tarih = datetime.date.today()
+
+    async def sorgula():
+        sonuc = await db.execute(nobetci_eczaneler_sorgusu(tarih, bolge, kaynak, koordinat))
+        return [NobetciEczaneDetay.from_orm(n) for n in sonuc.scalars().unique()]
+
+    # Senkron endpoint ile aynı önbellek anahtarı: iki katman aynı yanıtı paylaşır
+    return await get_response_cache().json_response_async(
+        ("nobetci-eczaneler", tarih, bolge, kaynak, koordinat), sorgula
+    )
+
+
+@router.get("/nobetci-eczaneler/aralik", response_model=NobetciEczaneSayfasi)
+async def get_nobet_araligi(
+    baslangic: Optional[datetime.date] = Query(None, description="Başlangıç tarihi (YYYY-MM-DD formatında)"),
+    bitis: Optional[datetime.date] = Query(None, description="Bitiş tarihi (YYYY-MM-DD formatında)"),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor (ilk sayfa için boş)"),
+    limit: int = Query(100, ge=1, le=settings.API_MAX_PAGE_SIZE, description="Listelenecek öğe sayısı"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Tarih aralığındaki nöbet kayıtlarını tarih ve ID sırasıyla, cursor ile
+    sayfalayarak listeler.
+    """
+    son = decode_cursor(cursor, (datetime.date.fromisoformat, int)) if cursor else None
+    sonuc = await db.execute(nobet_araligi_sorgusu(baslangic, bitis, limit + 1, son))
+    nobetler, next_cursor = sayfala(sonuc.scalars().unique().all(), limit, lambda n: (n.tarih, n.id))
+    return {"nobetler": nobetler, "next_cursor": next_cursor}
+
+
+@router.get("/tarihler", response_model=List[datetime.date])
+async def get_nobetci_tarihler(
+    baslangic: Optional[datetime.date] = Query(None, description="Başlangıç tarihi (YYYY-MM-DD formatında)"),
+    bitis: Optional[datetime.date] = Query(None, description="Bitiş tarihi (YYYY-MM-DD formatında)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Nöbetçi eczane kayıtlarının bulunduğu tarihleri listeler.
+    İsteğe bağlı olarak başlangıç ve bitiş tarihi belirtilebilir.
+    """
+    async def sorgula():
+        return (await db.execute(tarihler_sorgusu(baslangic, bitis))).scalars().all()
+
+    return await get_response_cache().json_response_async(("tarihler", baslangic, bitis), sorgula)
+
+
+@router.get("/bolgeler", response_model=List[str])
+async def get_bolgeler(db: AsyncSession = Depends(get_async_db)):
+    """
+    Sistemde kayıtlı tüm bölgeleri listeler.
+    """
+    async def sorgula():
+        return (await db.execute(bolgeler_sorgusu())).scalars().all()
+
+    return await get_response_cache().json_response_async(("bolgeler",), sorgula)
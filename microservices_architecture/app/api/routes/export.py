@@ -0,0 +1,110 @@
+"""
+Nöbet geçmişinin toplu dışa aktarılması.
+
+Satırlar sunucu taraflı cursor ile (`yield_per`) `EXPORT_BATCH_SIZE`'lık
+parçalar halinde okunur, NDJSON veya CSV'ye çevrilir ve istemci kabul
+ediyorsa gzip ile sıkıştırılarak parça parça gönderilir. Sonuç hiçbir
+aşamada bütünüyle belleğe alınmaz; yıllara yayılan geçmiş de sabit bellekle
+aktarılır.
+"""
+import csv
+import datetime
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.encoding import accepts_gzip
+from app.config import get_settings
+from app.database.connection import SessionLocal
+from app.database.queries import DISA_AKTARMA_ALANLARI, nobet_disa_aktarma_sorgusu
+
+settings = get_settings()
+
+router = APIRouter()
+
+_MEDYA_TURLERI = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_degeri(deger):
+    """Tarihleri ISO biçimine çevirir."""
+    return deger.isoformat() if isinstance(deger, datetime.date) else deger
+
+
+def _ndjson_parcasi(satirlar) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(DISA_AKTARMA_ALANLARI, map(_json_degeri, satir))), ensure_ascii=False) + "\n"
+        for satir in satirlar
+    ).encode("utf-8")
+
+
+def _csv_parcasi(satirlar) -> bytes:
+    tampon = io.StringIO()
+    csv.writer(tampon).writerows(satirlar)
+    return tampon.getvalue().encode("utf-8")
+
+
+def nobet_akisi(baslangic: Optional[datetime.date], bitis: Optional[datetime.date], bicim: str) -> Iterator[bytes]:
+    """
+    Nöbet kayıtlarını `EXPORT_BATCH_SIZE`'lık parçalar halinde kodlanmış bayt olarak üretir.
+
+    Oturum akış süresince açık kalır ve akış bittiğinde (veya istemci
+    bağlantıyı kestiğinde) kapatılır.
+    """
+    if bicim == "csv":
+        kodla = _csv_parcasi
+        yield _csv_parcasi([DISA_AKTARMA_ALANLARI])
+    else:
+        kodla = _ndjson_parcasi
+
+    db = SessionLocal()
+    try:
+        # yield_per: PostgreSQL'de adlandırılmış (sunucu taraflı) cursor, satırlar parça parça okunur
+        sonuc = db.execute(
+            nobet_disa_aktarma_sorgusu(baslangic, bitis).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        for parca in sonuc.partitions():
+            yield kodla(parca)
+    finally:
+        db.close()
+
+
+def gzip_akisi(parcalar: Iterable[bytes], seviye: int) -> Iterator[bytes]:
+    """Parçaları tek bir gzip akışı olarak sıkıştırır; her parçadan sonra o ana kadarki çıktıyı verir."""
+    sikistirici = zlib.compressobj(seviye, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for parca in parcalar:
+        cikti = sikistirici.compress(parca)
+        if cikti:
+            yield cikti
+    yield sikistirici.flush()
+
+
+@router.get("/export/nobetci")
+def export_nobetci(
+    request: Request,
+    baslangic: Optional[datetime.date] = Query(None, description="Başlangıç tarihi (YYYY-MM-DD formatında)"),
+    bitis: Optional[datetime.date] = Query(None, description="Bitiş tarihi (YYYY-MM-DD formatında)"),
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Çıktı biçimi: ndjson veya csv"),
+):
+    """
+    Tarih aralığındaki tüm nöbet kayıtlarını eczane bilgileriyle birlikte
+    (tarih, id) sırasıyla akış olarak döndürür. Tarihler belirtilmezse tüm
+    nöbet geçmişi aktarılır.
+
+    İstemci gzip kabul ediyorsa çıktı akış sırasında sıkıştırılır.
+    """
+    if baslangic and bitis and baslangic > bitis:
+        raise HTTPException(status_code=400, detail="Başlangıç tarihi bitiş tarihinden sonra olamaz")
+
+    dosya_adi = f"nobetler_{baslangic or 'ilk'}_{bitis or 'son'}.{format}"
+    basliklar = {"Content-Disposition": f'attachment; filename="{dosya_adi}"', "Vary": "Accept-Encoding"}
+
+    icerik = nobet_akisi(baslangic, bitis, format)
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        basliklar["Content-Encoding"] = "gzip"
+        icerik = gzip_akisi(icerik, settings.EXPORT_GZIP_LEVEL)
+
+    return StreamingResponse(icerik, media_type=_MEDYA_TURLERI[format], headers=basliklar)
@@ -0,0 +1,47 @@
+"""
+Nöbet listesi değişikliklerinin canlı yayını (Server-Sent Events).
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.broadcast import get_duty_broadcaster
+from app.config import get_settings
+
+settings = get_settings()
+
+router = APIRouter()
+
+
+@router.get("/nobetci-eczaneler/stream")
+async def stream_nobetci_eczaneler(
+    request: Request,
+    liste: bool = Query(False, description="Olaylara günün nöbet listesini de ekle"),
+    last_event_id: Optional[str] = Header(None, description="EventSource'un yeniden bağlanırken gönderdiği son olay ID'si"),
+):
+    """
+    Nöbet listesi her değiştiğinde (scraper yeni veri yazdığında) `nobet-listesi`
+    olayı gönderen Server-Sent Events akışı.
+
+    Olay verisi günün listesinin veri sürümünü, ETag'ini ve eczane sayısını
+    içerir; `liste=true` ile listenin kendisi de eklenir. Bağlanınca önce
+    güncel durum gönderilir. İstemciler listeyi yoklamak yerine bu akışı
+    dinleyip sadece olay geldiğinde `GET /api/nobetci-eczaneler` isteği
+    yapabilir.
+    """
+    yayinci = get_duty_broadcaster()
+    if yayinci.baglanti_sayisi >= settings.STREAM_MAX_CONNECTIONS:
+        yayinci.reject()
+        raise HTTPException(
+            status_code=503,
+            detail="Canlı yayın bağlantı sınırına ulaşıldı",
+            headers={"Retry-After": str(max(1, settings.STREAM_RETRY_MS // 1000))},
+        )
+
+    return StreamingResponse(
+        yayinci.stream(request, liste, last_event_id),
+        media_type="text/event-stream",
+        # Ara sunucular (ör. nginx) akışı tamponlamasın
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,104 @@
+"""
+Yönetim ve izleme endpoint'leri.
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.broadcast import get_duty_broadcaster
+from app.api.cache import get_response_cache
+from app.api.spatial_index import get_spatial_index_stats
+from app.database import get_db
+from app.database.pool import get_pool_stats
+from app.database.queries import kilitler_sorgusu, scrape_farklari_sorgusu
+from app.database.schemas import KilitDurumu, KoordinatTamamlamaDurumu, ScrapeFarkiKaydi
+from app.scraper.backfill import get_backfill_job, start_backfill
+from app.utils.geocode import get_geocode_cache_stats
+
+router = APIRouter()
+
+@router.get("/yonetim/geocode-onbellek")
+def get_geocode_onbellek_istatistikleri():
+    """
+    Geocoding önbelleğinin isabet/ıskalama sayaçlarını ve sağlayıcıya
+    yapılan gerçek istek sayılarını döndürür (bu API süreci için).
+    """
+    return get_geocode_cache_stats()
+
+@router.get("/yonetim/yanit-onbellegi")
+def get_yanit_onbellegi_istatistikleri():
+    """
+    API yanıt önbelleğinin isabet oranını, kayıt sayısını, yaklaşık bellek
+    kullanımını ve izlenen veri sürümünü döndürür (bu API süreci için).
+    """
+    return get_response_cache().istatistik()
+
+@router.get("/yonetim/canli-yayin")
+def get_canli_yayin_istatistikleri():
+    """
+    Nöbet listesi canlı yayınının açık bağlantı sayısını, yayınlanan ve
+    teslim edilen olay sayılarını, yavaş istemcilerde üzerine yazılan ve
+    bağlantı sınırı nedeniyle reddedilen istekleri döndürür (bu API süreci için).
+    """
+    return get_duty_broadcaster().istatistik()
+
+@router.get("/yonetim/mekansal-indeks")
+def get_mekansal_indeks_istatistikleri():
+    """
+    Bellekteki günlük mekânsal indeksleri (tarih, veri sürümü, eczane sayısı)
+    döndürür (bu API süreci için).
+    """
+    return get_spatial_index_stats()
+
+@router.get("/yonetim/havuz")
+def get_havuz_istatistikleri():
+    """
+    Senkron ve (kullanıldıysa) asenkron veritabanı bağlantı havuzlarının
+    ayarlarını, anlık doluluğunu, bağlantı alma/taşma/zaman aşımı/geçersiz
+    kılma sayaçlarını ve bekleme sürelerini döndürür (bu API süreci için).
+    """
+    return get_pool_stats()
+
+@router.post("/yonetim/koordinat-tamamlama", response_model=KoordinatTamamlamaDurumu, status_code=202)
+def start_koordinat_tamamlama():
+    """
+    Koordinatı eksik eczaneleri arka planda geocode eden işi başlatır ve
+    hemen döner. Açık (çalışan, duraklatılmış veya yarım kalmış) bir iş
+    varsa yeni iş oluşturulmaz, o iş devam ettirilir ve döndürülür.
+    """
+    is_, _ = start_backfill("api")
+    return is_
+
+@router.get("/yonetim/koordinat-tamamlama/{is_id}", response_model=KoordinatTamamlamaDurumu)
+def get_koordinat_tamamlama(is_id: int, db: Session = Depends(get_db)):
+    """
+    Koordinat tamamlama işinin durumunu ve ilerlemesini (işlenen, bulunan,
+    kalan eczane sayısı, harcanan sağlayıcı isteği) döndürür.
+    """
+    is_ = get_backfill_job(db, is_id)
+    if is_ is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return is_
+
+@router.get("/yonetim/scrape-farklari", response_model=List[ScrapeFarkiKaydi])
+def get_scrape_farklari(
+    kaynak: Optional[str] = Query(None, description="Kaynak adı"),
+    limit: int = Query(20, ge=1, le=200, description="Getirilecek en fazla kayıt"),
+    db: Session = Depends(get_db),
+):
+    """
+    Scraper çalışmalarının veritabanına uyguladığı değişiklikleri (eklenen,
+    güncellenen alanların eski/yeni değerleri, silinen nöbetler) en yeniden
+    eskiye döndürür. Değişiklik yapmayan çalışmalar kayıt bırakmaz.
+    """
+    return db.execute(scrape_farklari_sorgusu(kaynak, limit)).scalars().all()
+
+@router.get("/yonetim/kilitler", response_model=List[KilitDurumu])
+def get_kilitler(db: Session = Depends(get_db)):
+    """
+    Süreçler arası kilitleri döndürür. `scraper_lider` kilidinin sahibi
+    zamanlayıcıyı çalıştıran scraper kopyasıdır (host:pid); `yenileme`
+    liderin son kalp atışı, `tutulma_sn` liderliğin ne zamandır sürdüğüdür.
+    """
+    return db.execute(kilitler_sorgusu()).scalars().all()
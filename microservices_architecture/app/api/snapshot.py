@@ -0,0 +1,118 @@
+"""
+Günlük nöbet listesi anlık görüntülerinin HTTP üzerinden sunulması.
+
+Filtresiz `GET /api/nobetci-eczaneler` istekleri, `nobet_anliklari`
+tablosundaki önceden JSON'a çevrilmiş ve gzip'lenmiş içerikle doğrudan bayt
+olarak yanıtlanır. Görüntüler süreç belleğinde de tutulur; veri sürümü
+izleniyorsa (bkz. `app.api.cache`) güncel bir görüntü için veritabanına hiç
+gidilmez. Yanıtlar güçlü ETag ve `Cache-Control: no-cache` taşır: veri sürümü
+gün içinde her an değişebildiği için (koordinat güncellemesi, toplu koordinat
+tamamlama, yeniden denemeler, ek pencereler) istemciler her kullanımda
+doğrular ve içerik değişmediyse `If-None-Match` ile 304 alır.
+"""
+import datetime
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from app.api.cache import get_response_cache
+from app.api.encoding import accepts_gzip, representation_etag
+from app.database.models import NobetAnligi
+from app.database.snapshots import get_snapshot
+from app.database.version import get_data_version
+
+# Bellekte tutulan en fazla günlük görüntü sayısı
+_EN_FAZLA_GORUNTU = 7
+
+_anliklar: "OrderedDict[datetime.date, NobetAnligi]" = OrderedDict()
+# Görüntüsü şu anda oluşturulan tarihler; aynı tarihi isteyenler bu olayı bekler
+_hazirlananlar: Dict[datetime.date, threading.Event] = {}
+# Sadece sözlükleri korur; görüntü oluşturulurken tutulmaz
+_kilit = threading.Lock()
+
+
+def current_snapshot(db: Session, tarih: datetime.date) -> NobetAnligi:
+    """
+    Tarihin güncel veri sürümüne ait anlık görüntüsünü bellekten veya veritabanından döndürür.
+
+    Bellekteki görüntü eskiyse aynı tarih için tek bir istek görüntüyü
+    veritabanından okur veya oluşturur (single-flight); aynı tarihi isteyen
+    diğer istekler onu bekler, başka tarihlerin istekleri beklemez.
+    """
+    surum = get_response_cache().surum
+    if surum is None:
+        surum = get_data_version(db)
+
+    while True:
+        with _kilit:
+            anlik = _anliklar.get(tarih)
+            # Sürüm sadece artar: daha yeni sürümlü bir görüntü de güncel sayılır
+            if anlik is not None and anlik.veri_surumu >= surum:
+                _anliklar.move_to_end(tarih)
+                return anlik
+            hazirlaniyor = _hazirlananlar.get(tarih)
+            if hazirlaniyor is None:
+                hazirlaniyor = _hazirlananlar[tarih] = threading.Event()
+                break
+        # Beklerken bağlantı havuza geri verilir (oturumda sadece okuma yapıldı);
+        # oluşturan istek bitince (hata verdiyse de) yeniden bakılır
+        db.rollback()
+        hazirlaniyor.wait()
+
+    try:
+        anlik = get_snapshot(db, tarih, surum)
+        with _kilit:
+            mevcut = _anliklar.get(tarih)
+            if mevcut is None or mevcut.veri_surumu <= anlik.veri_surumu:
+                _anliklar[tarih] = anlik
+            _anliklar.move_to_end(tarih)
+            while len(_anliklar) > _EN_FAZLA_GORUNTU:
+                _anliklar.popitem(last=False)
+        return anlik
+    finally:
+        with _kilit:
+            del _hazirlananlar[tarih]
+        hazirlaniyor.set()
+
+
+def _etag_eslesiyor(if_none_match: str, etag: str) -> bool:
+    """If-None-Match başlığındaki etiketlerden biri ETag ile eşleşiyor mu (zayıf karşılaştırma)."""
+    for etiket in if_none_match.split(","):
+        etiket = etiket.strip()
+        if etiket.startswith("W/"):
+            etiket = etiket[2:]
+        if etiket == "*" or etiket == etag:
+            return True
+    return False
+
+
+def snapshot_response(request: Request, db: Session, tarih: datetime.date) -> Response:
+    """
+    Tarihin nöbet listesini anlık görüntüden yanıtlar.
+
+    İstemci gzip kabul ediyorsa sıkıştırılmış içerik, etmiyorsa düz JSON döner.
+    İki temsilin ETag'i farklıdır (gzip'li olan `-gz` ekiyle); `If-None-Match`
+    gönderilecek temsilin ETag'iyle karşılaştırılır.
+    """
+    anlik = current_snapshot(db, tarih)
+    gzip = accepts_gzip(request.headers.get("accept-encoding", ""))
+    etag = representation_etag(anlik.etag, gzip)
+
+    basliklar: Dict[str, str] = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    if _etag_eslesiyor(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=basliklar)
+
+    if gzip:
+        basliklar["Content-Encoding"] = "gzip"
+        return Response(content=anlik.gzip_icerik, media_type="application/json", headers=basliklar)
+
+    return Response(content=anlik.json_icerik, media_type="application/json", headers=basliklar)
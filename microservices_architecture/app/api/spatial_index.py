@@ -0,0 +1,117 @@
+"""
+Günlük nöbet listeleri için mekânsal indeksler.
+
+Her nöbet tarihi için koordinatlı nöbetçi eczanelerden bir ızgara indeksi
+oluşturulur ve veri sürümü değişene kadar (scraper yeni veri yazana veya
+koordinatlar güncellenene kadar) yeniden kullanılır. İndeksteki her nokta,
+yanıtta döndürülecek JSON uyumlu nöbet bilgisini (`NobetciEczaneDetay`
+biçiminde) taşır; böylece sorgu sırasında ne veritabanına gidilir ne de
+ORM nesnesi oluşturulur.
+"""
+import datetime
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.api.cache import get_response_cache
+from app.database.queries import koordinatli_nobetler_sorgusu
+from app.database.schemas import Eczane as EczaneSchema
+from app.database.version import get_data_version
+from app.utils.spatial import GridIndex
+
+# Bellekte tutulan en fazla günlük indeks sayısı
+_EN_FAZLA_INDEKS = 7
+
+_indeksler: "OrderedDict[datetime.date, Tuple[int, GridIndex]]" = OrderedDict()
+# Tarih başına oluşturulmakta olan indeks (single-flight); bitince olay ayarlanır
+_hazirlananlar: Dict[datetime.date, threading.Event] = {}
+_kilit = threading.Lock()
+
+
+def _json_uyumlu(deger):
+    """Tarih/zaman değerlerini FastAPI'nin JSON çıktısıyla aynı ISO biçimine çevirir."""
+    return deger.isoformat() if isinstance(deger, (datetime.date, datetime.datetime)) else deger
+
+
+def _indeks_olustur(db: Session, tarih: datetime.date) -> GridIndex:
+    """
+    Tarihin koordinatlı nöbetçi eczanelerinden ızgara indeksi oluşturur.
+
+    Satırlar ORM nesnesi ve Pydantic modeli oluşturmadan doğrudan sütun
+    olarak okunur ve `NobetciEczaneDetay` şemasının JSON biçimine çevrilir.
+    """
+    baslangic = time.perf_counter()
+    eczane_alanlari = list(EczaneSchema.__fields__)
+    satirlar = db.execute(koordinatli_nobetler_sorgusu(tarih, eczane_alanlari))
+
+    noktalar = []
+    for satir in satirlar:
+        eczane = {alan: _json_uyumlu(deger) for alan, deger in zip(eczane_alanlari, satir[3:])}
+        nobet = {"id": satir[0], "tarih": satir[1].isoformat(), "not_bilgisi": satir[2], "eczane": eczane}
+        noktalar.append((eczane["latitude"], eczane["longitude"], nobet))
+
+    indeks = GridIndex(noktalar)
+    logger.info(
+        f"{tarih} için mekânsal indeks oluşturuldu: {indeks.nokta_sayisi} eczane "
+        f"({time.perf_counter() - baslangic:.3f} sn)"
+    )
+    return indeks
+
+
+def get_duty_index(db: Session, tarih: datetime.date) -> GridIndex:
+    """
+    Tarihin nöbet listesi için güncel mekânsal indeksi döndürür.
+
+    Veri sürümü yanıt önbelleğinin izleme thread'inden alınır; izleme
+    çalışmıyorsa sürüm veritabanından okunur. Bellekteki indeks eskiyse aynı
+    tarih için tek bir istek indeksi kilit dışında oluşturur (single-flight);
+    aynı tarihi isteyen diğer istekler onu bekler, başka tarihlerin
+    istekleri beklemez.
+    """
+    surum = get_response_cache().surum
+    if surum is None:
+        surum = get_data_version(db)
+
+    while True:
+        with _kilit:
+            kayit = _indeksler.get(tarih)
+            # Sürüm sadece artar: daha yeni sürümle oluşturulmuş bir indeks de güncel sayılır
+            if kayit is not None and kayit[0] >= surum:
+                _indeksler.move_to_end(tarih)
+                return kayit[1]
+            hazirlaniyor = _hazirlananlar.get(tarih)
+            if hazirlaniyor is None:
+                hazirlaniyor = _hazirlananlar[tarih] = threading.Event()
+                break
+        # Beklerken bağlantı havuza geri verilir (oturumda sadece okuma yapıldı);
+        # oluşturan istek bitince (hata verdiyse de) yeniden bakılır
+        db.rollback()
+        hazirlaniyor.wait()
+
+    try:
+        indeks = _indeks_olustur(db, tarih)
+        with _kilit:
+            mevcut = _indeksler.get(tarih)
+            if mevcut is None or mevcut[0] <= surum:
+                _indeksler[tarih] = (surum, indeks)
+            _indeksler.move_to_end(tarih)
+            while len(_indeksler) > _EN_FAZLA_INDEKS:
+                _indeksler.popitem(last=False)
+        return indeks
+    finally:
+        with _kilit:
+            del _hazirlananlar[tarih]
+        hazirlaniyor.set()
+
+
+def get_spatial_index_stats() -> Dict[str, Dict[str, int]]:
+    """Bellekteki indekslerin sürüm ve eczane sayılarını döndürür."""
+    with _kilit:
+        return {
+            str(tarih): {"veri_surumu": surum, "eczane_sayisi": indeks.nokta_sayisi}
+            for tarih, (surum, indeks) in _indeksler.items()
+        }
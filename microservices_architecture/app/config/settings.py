@@ -10,17 +10,103 @@ class Settings(BaseSettings):
     
     # Veritabanı
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: str = ""  # Boş: DATABASE_URL'den türetilir (asyncpg / aiosqlite)
+    AUTO_MIGRATE: bool = True  # False: şema sadece `python -m app.database.migrations` ile güncellenir
+    
+    # Veritabanı Bağlantı Havuzu
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_MAX_CONNECTIONS: int = 0  # >0: tüm API süreçlerinin toplam bağlantı bütçesi (WEB_CONCURRENCY'ye bölünür)
+    DB_POOL_TIMEOUT: float = 30.0  # Havuzdan bağlantı için en fazla bekleme (saniye)
+    DB_POOL_RECYCLE: int = 1800  # Bu süreden (saniye) eski bağlantılar yenilenir, -1: kapalı
+    DB_POOL_PRE_PING: bool = True  # Bağlantı verilmeden önce canlılık kontrolü (PostgreSQL yeniden başlatmaları için)
+    WEB_CONCURRENCY: int = 1  # uvicorn/gunicorn süreç (worker) sayısı
     
     # Scraper Ayarları
     SCRAPER_URL: str = "https://www.edremit.bel.tr/Guncel/NobetciE/"
     SCRAPE_HOUR: int = 15
     SCRAPE_MINUTE: int = 0
+    SCRAPER_TIMEOUT: float = 30.0
+    PARSER_BACKEND: str = "bs4"  # "bs4" veya "lxml"
+    SOURCES_FILE: str = ""  # Boş: sadece SCRAPER_URL (Edremit) kaynağı kullanılır
+    SCRAPER_MAX_CONCURRENCY: int = 20  # Aynı anda indirilen en fazla sayfa
+    SCRAPER_MAX_PER_HOST: int = 2  # Aynı sunucuya aynı anda açılan en fazla bağlantı
+    SCRAPER_PROCESS_WORKERS: int = 2  # Sayfaları aynı anda ayrıştırıp yazan en fazla thread
+    
+    # Zamanlayıcı (run_scraper.py)
+    SCHEDULER_JOBSTORE: str = "veritabani"  # "veritabani": job'lar DATABASE_URL'de (apscheduler_jobs) saklanır, "bellek": saklanmaz
+    SCRAPE_EXTRA_WINDOWS: str = ""  # Ana çalışma saatine göre ek çalışmalar (dakika, virgülle), ör. "-30,30,90"
+    SCRAPE_RETRY_ATTEMPTS: int = 5  # Veri çekilemeyen (veri_yok/hata) kaynaklar için en fazla yeniden deneme
+    SCRAPE_RETRY_BASE_SECONDS: float = 60.0  # İlk yeniden denemeden önceki bekleme; her denemede iki katına çıkar
+    SCRAPE_RETRY_MAX_SECONDS: float = 1800.0  # Yeniden denemeler arasındaki en uzun bekleme
+    SCRAPE_MISFIRE_GRACE_SECONDS: int = 3600  # Zamanı kaçan job bu süre içindeyse yine çalıştırılır
+    
+    # Lider Seçimi (birden fazla scraper kopyası; sadece lider zamanlayıcıyı çalıştırır)
+    LEADER_RETRY_SECONDS: float = 10.0  # Yedek kopyaların lider kilidini deneme aralığı
+    LEADER_HEARTBEAT_SECONDS: float = 15.0  # Liderin kilidi yenileme ve kontrol etme aralığı
+    LEADER_LEASE_SECONDS: float = 60.0  # SQLite: bu süre yenilenmeyen kilit devralınır (PostgreSQL'de advisory lock kullanılır)
+    
+    # Veritabanı Yazma Ayarları
+    BULK_WRITE: bool = True  # False: eski satır satır yazma yolu
+    BULK_BATCH_SIZE: int = 1000
+    
+    # Geocoding Sağlayıcısı
+    GEOCODER_URL: str = "https://nominatim.openstreetmap.org"
+    GEOCODER_TIMEOUT: int = 10
+    GEOCODE_RATE_PER_SECOND: float = 1.0  # Nominatim kullanım politikası: saniyede en fazla 1 istek
+    GEOCODE_RATE_BURST: int = 1
+    GEOCODE_RATE_STATE_FILE: str = "data/geocode_rate.state"  # Boş: sınır sadece süreç içinde
+    
+    # Toplu Koordinat Tamamlama (koordinatı eksik eczanelerin arka planda geocode edilmesi)
+    GEOCODE_BACKFILL_HOURLY_BUDGET: int = 600  # Saatte en fazla sağlayıcı isteği
+    GEOCODE_BACKFILL_BATCH_SIZE: int = 20  # Bu kadar eczanede bir ilerleme ve koordinatlar kaydedilir
+    GEOCODE_BACKFILL_SCHEDULED: bool = True  # Scraper zamanlayıcısı işi her gece başlatsın mı
+    GEOCODE_BACKFILL_HOUR: int = 3  # Yoğun olmayan saat
+    GEOCODE_BACKFILL_MINUTE: int = 30
+    
+    # Kısaltılmış Google Maps Bağlantıları
+    SHORTLINK_MAX_WORKERS: int = 8
+    SHORTLINK_TIMEOUT: float = 5.0
+    
+    # Geocoding Önbelleği
+    GEOCODE_CACHE_PATH: str = "data/geocode_cache.sqlite3"
+    GEOCODE_CACHE_TTL_DAYS: int = 90
+    GEOCODE_CACHE_NEGATIVE_TTL_HOURS: int = 24
+    GEOCODE_CACHE_MAX_ENTRIES: int = 10000
+    
+    # API Yanıt Önbelleği
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    DATA_VERSION_POLL_SECONDS: float = 2.0  # Veri sürümü yoklama aralığı (PostgreSQL'de NOTIFY beklenirken üst sınır)
     
     # API Ayarları
     API_TITLE: str = "Edremit Nöbetçi Eczane API"
     API_VERSION: str = "1.0.0"
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
+    API_MAX_PAGE_SIZE: int = 500  # Sayfalı listelerde izin verilen en büyük limit
+    API_GRACEFUL_SHUTDOWN_SECONDS: int = 5  # run_api.py: kapanırken açık bağlantılar için en uzun bekleme (uvicorn --timeout-graceful-shutdown)
+    
+    # Toplu Dışa Aktarma (GET /api/export/nobetci)
+    EXPORT_BATCH_SIZE: int = 2000  # Sunucu taraflı cursor'dan bir seferde okunan satır (yield_per)
+    EXPORT_GZIP_LEVEL: int = 6
+    
+    # Canlı Yayın (GET /api/nobetci-eczaneler/stream, Server-Sent Events)
+    STREAM_HEARTBEAT_SECONDS: float = 15.0  # Boştaki bağlantılara yorum satırı gönderme aralığı (proxy zaman aşımları için)
+    STREAM_RETRY_MS: int = 5000  # Bağlantı koparsa istemcinin yeniden bağlanmadan önce bekleyeceği süre
+    STREAM_MAX_CONNECTIONS: int = 10000  # Süreç başına en fazla açık akış; aşılırsa 503 döner
+    
+    # Metrikler (Prometheus)
+    METRICS_ENABLED: bool = True  # API'de GET /metrics ve istek metrikleri
+    METRICS_TEXTFILE: str = ""  # Scraper: node_exporter textfile dosyası (örn. /var/lib/node_exporter/eczane.prom)
+    METRICS_PUSHGATEWAY_URL: str = ""  # Scraper: Pushgateway adresi (örn. localhost:9091)
+    METRICS_PUSHGATEWAY_JOB: str = "eczane_scraper"
+    
+    # İstek Profilleme (Server-Timing, yavaş sorgu ve N+1 logu)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SLOW_QUERY_MS: float = 100.0  # Bu süreyi aşan SQL ifadeleri yavaş sorgu loguna yazılır
+    PROFILING_SLOW_QUERY_LOG: str = "logs/yavas_sorgular.log"
+    PROFILING_N_PLUS_ONE_THRESHOLD: int = 5  # Bir istekte aynı ifade bu kadar tekrarlanırsa N+1 şüphesi
     
     # Loglama
     LOG_LEVEL: str = "INFO"
@@ -1,7 +1,14 @@
 """
 Veritabanı paket modülü
 """
-from app.database.connection import engine, SessionLocal, get_db
-from app.database.models import Base, Eczane, NobetciEczane
+from app.database.connection import get_engine, SessionLocal, get_db
+from app.database.models import Base, Eczane, NobetciEczane, NobetIstatistigi, ScrapeCalismasi, ScrapeFarki, VeriSurumu, NobetAnligi, Kilit
 
-__all__ = ["engine", "SessionLocal", "get_db", "Base", "Eczane", "NobetciEczane"]
\ No newline at end of file
+__all__ = ["get_engine", "SessionLocal", "get_db", "Base", "Eczane", "NobetciEczane", "NobetIstatistigi", "ScrapeCalismasi", "ScrapeFarki", "VeriSurumu", "NobetAnligi", "Kilit"]
+
+
+def __getattr__(ad: str):
+    # Motor ilk erişimde oluşturulur (bkz. `app.database.connection`)
+    if ad == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {ad!r}")
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Asenkron veritabanı bağlantı yönetimi.
+
+API'nin `async def` endpoint'leri bu modüldeki motoru kullanır; scraper ve
+senkron endpoint'ler `app.database.connection` üzerinden çalışmaya devam eder.
+Sürücü (asyncpg / aiosqlite) ilk kullanımda yüklenir, böylece asenkron
+katman kullanılmadığında kurulu olması gerekmez.
+"""
+from functools import lru_cache
+from typing import AsyncIterator
+
+from loguru import logger
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import get_settings
+from app.database.pool import engine_pool_kwargs, instrument_pool
+
+settings = get_settings()
+
+# Senkron sürücü adlarının asenkron karşılıkları
+_ASENKRON_SURUCULER = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(database_url: str) -> str:
+    """
+    Senkron veritabanı URL'sini asenkron sürücülü karşılığına çevirir.
+
+    Örn. `postgresql://...` -> `postgresql+asyncpg://...`,
+    `sqlite:///x.db` -> `sqlite+aiosqlite:///x.db`. Zaten asenkron bir
+    sürücü belirtilmişse URL olduğu gibi döndürülür.
+    """
+    url = make_url(database_url)
+    surucu = _ASENKRON_SURUCULER.get(url.drivername)
+    if surucu is None:
+        return database_url
+    return url.set(drivername=surucu).render_as_string(hide_password=False)
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """Asenkron SQLAlchemy motorunu oluşturur (önbellek ile)."""
+    url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    motor = create_async_engine(url, **engine_pool_kwargs(url, asenkron=True))
+    instrument_pool("asenkron", motor.sync_engine)
+    logger.info(f"Asenkron veritabanı motoru oluşturuldu: {motor.url.drivername}")
+    return motor
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Asenkron oturum fabrikasını döndürür (önbellek ile)."""
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Asenkron veritabanı oturumu oluştur ve kapat."""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """Motor oluşturulduysa bağlantı havuzunu kapatır."""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
@@ -1,43 +1,66 @@
 """
 Veritabanı bağlantı yönetimi.
+
+Motor ve oturum fabrikası ilk kullanımda oluşturulur; bu modülü içe aktarmak
+veritabanına bağlanmaz. Tabloların oluşturulması ve şema geçişleri açık bir
+komutla yapılır (`python -m app.database.migrations`).
 """
-import os
+from functools import lru_cache
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import get_settings
+from app.database.pool import engine_pool_kwargs, instrument_pool
 from loguru import logger
-import psycopg2
 from urllib.parse import urlparse
 
 settings = get_settings()
 
-# Database URL'ini log'la (hassas bilgileri maskeleyerek)
-db_url = settings.DATABASE_URL
-masked_db_url = db_url
-if "://" in db_url:
-    parts = db_url.split("://")
-    if "@" in parts[1]:
-        user_pass_host = parts[1].split("@")
-        if ":" in user_pass_host[0]:
-            user_pass = user_pass_host[0].split(":")
-            masked_db_url = f"{parts[0]}://{user_pass[0]}:****@{user_pass_host[1]}"
+# Temel model sınıfı
+Base = declarative_base()
 
-logger.info(f"Veritabanına bağlanılıyor: {masked_db_url}")
+def mask_database_url(db_url: str) -> str:
+    """Veritabanı URL'indeki parolayı maskeler."""
+    masked_db_url = db_url
+    if "://" in db_url:
+        parts = db_url.split("://")
+        if "@" in parts[1]:
+            user_pass_host = parts[1].split("@")
+            if ":" in user_pass_host[0]:
+                user_pass = user_pass_host[0].split(":")
+                masked_db_url = f"{parts[0]}://{user_pass[0]}:****@{user_pass_host[1]}"
+    return masked_db_url
 
-# SQLAlchemy engine oluştur
-try:
-    engine = create_engine(settings.DATABASE_URL)
-    logger.info("Veritabanı bağlantısı başarılı")
-except Exception as e:
-    logger.error(f"Veritabanı bağlantı hatası: {str(e)}")
-    raise
+@lru_cache()
+def get_engine() -> Engine:
+    """SQLAlchemy motorunu ilk çağrıda oluşturur (önbellek ile)."""
+    # Database URL'ini log'la (hassas bilgileri maskeleyerek)
+    logger.info(f"Veritabanına bağlanılıyor: {mask_database_url(settings.DATABASE_URL)}")
 
-# SessionLocal sınıfı oluştur
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        engine = create_engine(settings.DATABASE_URL, **engine_pool_kwargs(settings.DATABASE_URL))
+        instrument_pool("senkron", engine)
+        logger.info("Veritabanı bağlantısı başarılı")
+    except Exception as e:
+        logger.error(f"Veritabanı bağlantı hatası: {str(e)}")
+        raise
+    return engine
 
-# Temel model sınıfı
-Base = declarative_base()
+@lru_cache()
+def get_sessionmaker() -> sessionmaker:
+    """Oturum fabrikasını döndürür (önbellek ile)."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+def SessionLocal(**kwargs) -> Session:
+    """Yeni bir veritabanı oturumu açar; motor ilk çağrıda oluşturulur."""
+    return get_sessionmaker()(**kwargs)
+
+def __getattr__(ad: str):
+    # `from app.database.connection import engine` kullanımları motoru ilk erişimde oluşturur
+    if ad == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {ad!r}")
 
 def get_db():
     """Veritabanı oturumu oluştur ve kapat."""
@@ -51,6 +74,8 @@ def check_database_connection():
     """
     Veritabanı bağlantısını test eder ve tablo bilgilerini gösterir.
     """
+    import psycopg2
+
     try:
         # URL'den bağlantı bilgilerini ayıkla
         parsed = urlparse(settings.DATABASE_URL)
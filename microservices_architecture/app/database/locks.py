@@ -0,0 +1,233 @@
+"""
+Veritabanı üzerinden süreçler arası kilit (scraper lider seçimi).
+
+Birden fazla scraper kopyası çalıştığında sadece kilidi tutan kopya (lider)
+zamanlayıcıyı çalıştırır; diğerleri kilidi `LEADER_RETRY_SECONDS` aralıklarla
+dener ve lider durunca devralır (sıcak yedek).
+
+- PostgreSQL: kilit, ayrılmış bir bağlantıda tutulan oturum düzeyinde
+  advisory lock'tur (`pg_try_advisory_lock`). Süreç çökerse veya bağlantı
+  koparsa kilidi sunucu kendisi bırakır.
+- Diğer veritabanları (SQLite): kilit `kilitler` tablosundaki satırdır. Sahip
+  satırı `LEADER_HEARTBEAT_SECONDS` aralıklarla yeniler; `LEADER_LEASE_SECONDS`
+  boyunca yenilenmeyen kilit başka bir süreç tarafından devralınır.
+
+Her iki durumda da `kilitler` satırı kilidin sahibini, alınma ve son
+yenileme zamanını gösterir (`GET /api/yonetim/kilitler`); bekleme ve tutulma
+süreleri Prometheus metriklerine işlenir.
+"""
+import datetime
+import hashlib
+import os
+import socket
+import threading
+import time
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import insert, or_, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+
+from app.config import get_settings
+from app.database.connection import get_engine
+from app.database.models import Kilit
+from app.utils.metrics import LOCK_ATTEMPTS, LOCK_HELD, LOCK_HOLD_SECONDS, LOCK_WAIT_SECONDS
+
+settings = get_settings()
+
+
+def lock_owner_id() -> str:
+    """Bu sürecin kilit sahibi kimliği (host:pid; Docker'da host konteyner kimliğidir)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _advisory_anahtari(ad: str) -> int:
+    """Kilit adından PostgreSQL advisory lock anahtarını (işaretli 64 bit) türetir."""
+    return int.from_bytes(hashlib.sha256(f"eczane:{ad}".encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+class DatabaseLock:
+    """Adıyla tanımlanan, veritabanı üzerinden süreçler arası kilit."""
+
+    def __init__(self, ad: str):
+        self.ad = ad
+        self.sahip = lock_owner_id()
+        self._baglanti: Optional[Connection] = None  # PostgreSQL: advisory lock'u tutan bağlantı
+        self._alinma: Optional[float] = None
+
+    @property
+    def alindi(self) -> bool:
+        """Kilit bu süreçte tutuluyor mu."""
+        return self._alinma is not None
+
+    def try_acquire(self) -> bool:
+        """Kilidi beklemeden almayı dener; alınırsa True döner."""
+        if self.alindi:
+            return True
+        try:
+            if get_engine().dialect.name == "postgresql":
+                alindi = self._advisory_al()
+            else:
+                alindi = self._kira_al()
+        except Exception as e:
+            LOCK_ATTEMPTS.labels(self.ad, "hata").inc()
+            logger.error(f"'{self.ad}' kilidi alınamadı: {str(e)}")
+            return False
+
+        LOCK_ATTEMPTS.labels(self.ad, "alindi" if alindi else "mesgul").inc()
+        if alindi:
+            self._alinma = time.perf_counter()
+            LOCK_HELD.labels(self.ad).set(1)
+        return alindi
+
+    def acquire(self, aralik: float, durdur: Optional[threading.Event] = None) -> bool:
+        """
+        Kilit alınana kadar `aralik` saniyede bir dener.
+
+        Returns:
+            bool: Kilit alındıysa True, `durdur` ayarlandığı için vazgeçildiyse False
+        """
+        baslangic = time.perf_counter()
+        while not self.try_acquire():
+            if durdur is not None:
+                if durdur.wait(aralik):
+                    return False
+            else:
+                time.sleep(aralik)
+        LOCK_WAIT_SECONDS.labels(self.ad).observe(time.perf_counter() - baslangic)
+        return True
+
+    def renew(self) -> bool:
+        """
+        Kilidin hâlâ bu süreçte olduğunu doğrular ve yenileme zamanını yazar.
+
+        Returns:
+            bool: Kilit tutulmaya devam ediyorsa True; kaybedildiyse False (kilit bırakılmış sayılır)
+        """
+        if not self.alindi:
+            return False
+        try:
+            if self._baglanti is not None:
+                # Bağlantı canlıysa oturum kilidi de tutuluyordur
+                guncellenen = self._yenile(self._baglanti)
+                self._baglanti.commit()
+            else:
+                with get_engine().begin() as baglanti:
+                    guncellenen = self._yenile(baglanti)
+        except Exception as e:
+            logger.error(f"'{self.ad}' kilidi yenilenemedi: {str(e)}")
+            guncellenen = 0
+
+        if guncellenen != 1:
+            self._birak_say()
+            self._baglantiyi_kapat()
+            return False
+        return True
+
+    def release(self):
+        """Kilidi bırakır; kilit tutulmuyorsa bir şey yapmaz."""
+        if not self.alindi:
+            return
+        try:
+            if self._baglanti is not None:
+                self._baglanti.execute(text("SELECT pg_advisory_unlock(:anahtar)"), {"anahtar": _advisory_anahtari(self.ad)})
+                self._serbest_birak(self._baglanti)
+                self._baglanti.commit()
+            else:
+                with get_engine().begin() as baglanti:
+                    self._serbest_birak(baglanti)
+        except Exception as e:
+            # PostgreSQL'de bağlantı kapanınca kilit zaten bırakılır; SQLite'ta kira süresi dolunca devralınır
+            logger.warning(f"'{self.ad}' kilidi bırakılırken hata: {str(e)}")
+        finally:
+            self._birak_say()
+            self._baglantiyi_kapat()
+
+    # PostgreSQL
+
+    def _advisory_al(self) -> bool:
+        baglanti = get_engine().connect()
+        try:
+            alindi = baglanti.execute(
+                text("SELECT pg_try_advisory_lock(:anahtar)"), {"anahtar": _advisory_anahtari(self.ad)}
+            ).scalar()
+            if alindi:
+                self._bilgi_yaz(baglanti)
+            baglanti.commit()
+        except Exception:
+            baglanti.invalidate()
+            baglanti.close()
+            raise
+        if not alindi:
+            baglanti.close()
+            return False
+        self._baglanti = baglanti
+        return True
+
+    # SQLite ve diğerleri
+
+    def _kira_al(self) -> bool:
+        simdi = datetime.datetime.now()
+        try:
+            with get_engine().begin() as baglanti:
+                guncellenen = baglanti.execute(
+                    update(Kilit)
+                    .where(
+                        Kilit.ad == self.ad,
+                        or_(
+                            Kilit.sahip.is_(None),
+                            Kilit.sahip == self.sahip,
+                            Kilit.yenileme < simdi - datetime.timedelta(seconds=settings.LEADER_LEASE_SECONDS),
+                        ),
+                    )
+                    .values(sahip=self.sahip, alinma=simdi, yenileme=simdi)
+                ).rowcount
+                if guncellenen:
+                    return True
+                if baglanti.execute(select(Kilit.ad).where(Kilit.ad == self.ad)).first() is not None:
+                    return False
+                baglanti.execute(insert(Kilit).values(ad=self.ad, sahip=self.sahip, alinma=simdi, yenileme=simdi))
+        except IntegrityError:
+            # Başka bir süreç satırı aynı anda ekledi
+            return False
+        return True
+
+    # Ortak
+
+    def _bilgi_yaz(self, baglanti: Connection):
+        """Kilidin sahibini ve alınma zamanını `kilitler` tablosuna yazar."""
+        simdi = datetime.datetime.now()
+        degerler = {"sahip": self.sahip, "alinma": simdi, "yenileme": simdi}
+        if not baglanti.execute(update(Kilit).where(Kilit.ad == self.ad).values(**degerler)).rowcount:
+            baglanti.execute(insert(Kilit).values(ad=self.ad, **degerler))
+
+    def _yenile(self, baglanti: Connection) -> int:
+        return baglanti.execute(
+            update(Kilit)
+            .where(Kilit.ad == self.ad, Kilit.sahip == self.sahip)
+            .values(yenileme=datetime.datetime.now())
+        ).rowcount
+
+    def _serbest_birak(self, baglanti: Connection):
+        baglanti.execute(
+            update(Kilit)
+            .where(Kilit.ad == self.ad, Kilit.sahip == self.sahip)
+            .values(sahip=None, alinma=None, yenileme=None)
+        )
+
+    def _birak_say(self):
+        if self._alinma is not None:
+            LOCK_HOLD_SECONDS.labels(self.ad).observe(time.perf_counter() - self._alinma)
+            self._alinma = None
+        LOCK_HELD.labels(self.ad).set(0)
+
+    def _baglantiyi_kapat(self):
+        # Bağlantı havuza geri verilmez; kapatılınca advisory lock her durumda sunucuda bırakılır
+        if self._baglanti is not None:
+            try:
+                self._baglanti.invalidate()
+                self._baglanti.close()
+            except Exception:
+                pass
+            self._baglanti = None
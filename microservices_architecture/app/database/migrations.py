@@ -0,0 +1,135 @@
+"""
+Veritabanı şema geçişleri (migration).
+
+`Base.metadata.create_all` yeni tabloları oluşturur ama var olan tablolara
+sütun veya indeks eklemez. Var olan veritabanlarını güncel modellere getiren
+adımlar burada sırayla tanımlanır ve uygulananlar `sema_gecmisi` tablosuna
+yazılır. Her adım, tablolar `create_all` ile yeni oluşturulmuş olsa bile
+güvenle çalışacak şekilde (idempotent) yazılmalıdır.
+
+Kullanım:
+    python -m app.database.migrations
+"""
+import datetime
+import sys
+from typing import Callable, List, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from loguru import logger
+
+
+def _sutun_var_mi(conn: Connection, tablo: str, sutun: str) -> bool:
+    """Tabloda sütunun olup olmadığını döndürür."""
+    return any(s["name"] == sutun for s in inspect(conn).get_columns(tablo))
+
+
+def _eczaneler_kaynak(conn: Connection):
+    """eczaneler tablosuna kaynak sütununu ve indeksini ekler."""
+    if not _sutun_var_mi(conn, "eczaneler", "kaynak"):
+        conn.execute(text("ALTER TABLE eczaneler ADD COLUMN kaynak VARCHAR(100)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_eczaneler_kaynak ON eczaneler (kaynak)"))
+
+
+def _veri_surumu_satiri(conn: Connection):
+    """veri_surumu tablosuna tek sayaç satırını ekler."""
+    if conn.execute(text("SELECT COUNT(*) FROM veri_surumu WHERE id = 1")).scalar() == 0:
+        conn.execute(text("INSERT INTO veri_surumu (id, surum) VALUES (1, 0)"))
+
+
+def _nobet_tarih_id_indeksi(conn: Connection):
+    """nobetci_eczaneler tablosuna (tarih, id) keyset sayfalama indeksini ekler."""
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_nobetci_eczaneler_tarih_id ON nobetci_eczaneler (tarih, id)"
+    ))
+
+
+def _eczaneler_indeksleri(conn: Connection):
+    """eczaneler tablosuna bölge ve kısmi koordinat indekslerini ekler."""
+    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_eczaneler_bolge ON eczaneler (bolge)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_eczaneler_coordinates ON eczaneler (latitude, longitude) "
+        "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    ))
+
+
+def _nobet_istatistikleri(conn: Connection):
+    """nobet_istatistikleri özetini mevcut nöbet geçmişinden doldurur."""
+    from app.database.statistics import rebuild_duty_stats
+
+    rebuild_duty_stats(conn)
+
+
+def _eczaneler_icerik_ozeti(conn: Connection):
+    """eczaneler tablosuna icerik_ozeti sütununu ekler ve mevcut satırlardan doldurur."""
+    from app.scraper.writer import pharmacy_fingerprint
+
+    if not _sutun_var_mi(conn, "eczaneler", "icerik_ozeti"):
+        conn.execute(text("ALTER TABLE eczaneler ADD COLUMN icerik_ozeti VARCHAR(64)"))
+
+    # updated_at değişmesin diye doğrudan SQL ile yazılır
+    satirlar = conn.execute(text(
+        "SELECT id, bolge, konum_url, adres, telefon, latitude, longitude FROM eczaneler WHERE icerik_ozeti IS NULL"
+    )).all()
+    if satirlar:
+        conn.execute(
+            text("UPDATE eczaneler SET icerik_ozeti = :ozet WHERE id = :id"),
+            [{"id": satir.id, "ozet": pharmacy_fingerprint(satir)} for satir in satirlar],
+        )
+
+
+# (sürüm, açıklama, fonksiyon) - yeni adımlar listenin sonuna eklenir
+MIGRATIONS: List[Tuple[str, str, Callable[[Connection], None]]] = [
+    ("0001", "eczaneler.kaynak sütunu", _eczaneler_kaynak),
+    ("0002", "veri_surumu sayaç satırı", _veri_surumu_satiri),
+    ("0003", "nobetci_eczaneler (tarih, id) indeksi", _nobet_tarih_id_indeksi),
+    ("0004", "eczaneler bölge ve koordinat indeksleri", _eczaneler_indeksleri),
+    ("0005", "nobet_istatistikleri özetinin doldurulması", _nobet_istatistikleri),
+    ("0006", "eczaneler.icerik_ozeti sütunu", _eczaneler_icerik_ozeti),
+]
+
+
+def run_migrations(engine=None) -> List[str]:
+    """
+    Tabloları oluşturur ve uygulanmamış geçiş adımlarını sırayla uygular.
+
+    Returns:
+        List[str]: Bu çağrıda uygulanan adımların sürümleri
+    """
+    from app.database.connection import Base, get_engine
+    import app.database.models  # noqa: F401 - modellerin metadata'ya kaydı için
+
+    engine = engine or get_engine()
+    Base.metadata.create_all(bind=engine)
+
+    uygulanan = []
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS sema_gecmisi ("
+            "surum VARCHAR(20) PRIMARY KEY, aciklama TEXT, uygulanma TIMESTAMP)"
+        ))
+        mevcut = {satir[0] for satir in conn.execute(text("SELECT surum FROM sema_gecmisi"))}
+
+    for surum, aciklama, fonksiyon in MIGRATIONS:
+        if surum in mevcut:
+            continue
+        logger.info(f"Şema geçişi uygulanıyor: {surum} - {aciklama}")
+        with engine.begin() as conn:
+            fonksiyon(conn)
+            conn.execute(
+                text("INSERT INTO sema_gecmisi (surum, aciklama, uygulanma) VALUES (:surum, :aciklama, :uygulanma)"),
+                {"surum": surum, "aciklama": aciklama, "uygulanma": datetime.datetime.now()},
+            )
+        uygulanan.append(surum)
+
+    return uygulanan
+
+
+# Bu modül doğrudan çalıştırıldığında geçişleri uygula
+if __name__ == "__main__":
+    try:
+        adimlar = run_migrations()
+        logger.info(f"Şema güncel. Uygulanan adımlar: {adimlar or 'yok'}")
+    except Exception as e:
+        logger.error(f"Şema geçişi sırasında hata: {str(e)}")
+        sys.exit(1)
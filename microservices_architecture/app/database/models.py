@@ -3,9 +3,9 @@ Veritabanı modelleri.
 """
 import datetime
 import sys
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Date, Float, UniqueConstraint, create_engine
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, ForeignKey, Date, Float, Index, LargeBinary, UniqueConstraint, create_engine, text
 from sqlalchemy.orm import relationship
-from app.database.connection import Base, engine
+from app.database.connection import Base
 from loguru import logger
 
 class Eczane(Base):
@@ -21,12 +21,24 @@ class Eczane(Base):
     telefon = Column(String(20))
     latitude = Column(Float, nullable=True)  # Koordinat (enlem)
     longitude = Column(Float, nullable=True)  # Koordinat (boylam)
+    kaynak = Column(String(100), index=True)  # Eczaneyi son yazan scraper kaynağı (örn. "edremit")
+    icerik_ozeti = Column(String(64))  # Son yazılan scraper içeriğinin parmak izi (bkz. app.scraper.writer)
     created_at = Column(DateTime, default=datetime.datetime.now)
     updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
     
     # İlişki
     nobetler = relationship("NobetciEczane", back_populates="eczane")
     
+    __table_args__ = (
+        Index('idx_eczaneler_bolge', 'bolge'),
+        # Sadece koordinatı olan eczaneler (harita, yakın eczane ve koordinat filtreli sorgular)
+        Index(
+            'idx_eczaneler_coordinates', 'latitude', 'longitude',
+            postgresql_where=text("latitude IS NOT NULL AND longitude IS NOT NULL"),
+            sqlite_where=text("latitude IS NOT NULL AND longitude IS NOT NULL"),
+        ),
+    )
+    
     def __repr__(self):
         return f"<Eczane(id={self.id}, isim='{self.isim}')>"
 
@@ -47,20 +59,168 @@ class NobetciEczane(Base):
     
     __table_args__ = (
         UniqueConstraint('eczane_id', 'tarih', name='unique_eczane_tarih'),
+        # Tarih ile başlayan indeks: günlük liste (tarih = ?), tarih aralıkları, keyset sayfalaması
+        Index('ix_nobetci_eczaneler_tarih_id', 'tarih', 'id'),
     )
     
     def __repr__(self):
         return f"<NobetciEczane(id={self.id}, tarih='{self.tarih}', eczane_id={self.eczane_id})>"
 
 
+class NobetIstatistigi(Base):
+    """Eczane başına aylık nöbet sayıları (nobetci_eczaneler tablosunun özeti)."""
+    
+    __tablename__ = "nobet_istatistikleri"
+    
+    eczane_id = Column(Integer, ForeignKey("eczaneler.id"), primary_key=True)
+    yil = Column(Integer, primary_key=True)
+    ay = Column(Integer, primary_key=True)
+    nobet_sayisi = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        # Bir ayın / yılın tüm eczaneleri (GET /api/istatistikler)
+        Index('ix_nobet_istatistikleri_yil_ay', 'yil', 'ay'),
+    )
+    
+    def __repr__(self):
+        return f"<NobetIstatistigi(eczane_id={self.eczane_id}, yil={self.yil}, ay={self.ay}, nobet_sayisi={self.nobet_sayisi})>"
+
+
+class ScrapeCalismasi(Base):
+    """Scraper çalışmaları tablosu (koşullu istek ve içerik özeti bilgileri dahil)."""
+    
+    __tablename__ = "scrape_calismalari"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kaynak = Column(String(500), nullable=False, index=True)  # Kaynak adı (sources.json'daki "ad")
+    tarih = Column(Date, nullable=False)  # Çalışmanın yazdığı nöbet tarihi
+    durum = Column(String(20), nullable=False)  # basarili, degisiklik_yok, veri_yok, hata
+    icerik_hash = Column(String(64))  # Normalleştirilmiş nöbet listesi HTML'inin SHA-256 özeti
+    etag = Column(String(200))
+    last_modified = Column(String(100))
+    eczane_sayisi = Column(Integer)
+    mesaj = Column(Text)
+    baslangic = Column(DateTime, default=datetime.datetime.now)
+    bitis = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<ScrapeCalismasi(id={self.id}, kaynak='{self.kaynak}', durum='{self.durum}')>"
+
+
+class ScrapeFarki(Base):
+    """Bir scraper çalışmasının veritabanına uyguladığı değişiklikler (sadece değişiklik varsa yazılır)."""
+    
+    __tablename__ = "scrape_farklari"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kaynak = Column(String(500), index=True)  # Kaynak adı (scrape_calismalari.kaynak ile aynı)
+    tarih = Column(Date, nullable=False)  # Çalışmanın yazdığı nöbet tarihi
+    eczane_eklenen = Column(Integer, nullable=False, default=0)
+    eczane_guncellenen = Column(Integer, nullable=False, default=0)
+    nobet_eklenen = Column(Integer, nullable=False, default=0)
+    nobet_guncellenen = Column(Integer, nullable=False, default=0)
+    nobet_silinen = Column(Integer, nullable=False, default=0)
+    farklar = Column(Text, nullable=False)  # JSON: [{"islem", "isim", "alanlar": {alan: [eski, yeni]}}]
+    olusturma = Column(DateTime, default=datetime.datetime.now)
+    
+    def __repr__(self):
+        return f"<ScrapeFarki(id={self.id}, kaynak='{self.kaynak}', tarih='{self.tarih}')>"
+
+
+class VeriSurumu(Base):
+    """Veri sürümü tablosu (tek satır); eczane/nöbet verisi her değiştiğinde artırılır."""
+    
+    __tablename__ = "veri_surumu"
+    
+    id = Column(Integer, primary_key=True)
+    surum = Column(BigInteger, nullable=False, default=0)
+    guncelleme = Column(DateTime, default=datetime.datetime.now)
+    
+    def __repr__(self):
+        return f"<VeriSurumu(surum={self.surum})>"
+
+
+class NobetAnligi(Base):
+    """Günlük nöbet listesinin önceden JSON'a çevrilmiş (ve gzip'lenmiş) anlık görüntüsü."""
+    
+    __tablename__ = "nobet_anliklari"
+    
+    tarih = Column(Date, primary_key=True)
+    veri_surumu = Column(BigInteger, nullable=False)  # Görüntünün oluşturulduğu veri sürümü
+    json_icerik = Column(LargeBinary, nullable=False)
+    gzip_icerik = Column(LargeBinary, nullable=False)
+    etag = Column(String(80), nullable=False)
+    eczane_sayisi = Column(Integer, nullable=False)
+    olusturma = Column(DateTime, default=datetime.datetime.now)
+    
+    def __repr__(self):
+        return f"<NobetAnligi(tarih='{self.tarih}', veri_surumu={self.veri_surumu})>"
+
+
+class KoordinatTamamlamaIsi(Base):
+    """Koordinatı eksik eczaneleri toplu geocode eden arka plan işleri tablosu."""
+    
+    __tablename__ = "koordinat_tamamlama_isleri"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    durum = Column(String(20), nullable=False)  # beklemede, calisiyor, duraklatildi, tamamlandi, hata
+    tetikleyen = Column(String(20))  # api, zamanlayici
+    toplam = Column(Integer, nullable=False, default=0)  # Koordinatı eksik eczane sayısı
+    islenen = Column(Integer, nullable=False, default=0)
+    bulunan = Column(Integer, nullable=False, default=0)
+    bulunamayan = Column(Integer, nullable=False, default=0)
+    son_eczane_id = Column(Integer, nullable=False, default=0)  # Kaldığı yer: bu ID'ye kadar işlendi
+    saatlik_butce = Column(Integer, nullable=False)  # Saatte en fazla sağlayıcı isteği
+    pencere_baslangic = Column(DateTime)  # İçinde bulunulan bir saatlik bütçe penceresi
+    penceredeki_istek = Column(Integer, nullable=False, default=0)
+    saglayici_istekleri = Column(Integer, nullable=False, default=0)  # Toplam sağlayıcı isteği
+    mesaj = Column(Text)
+    olusturma = Column(DateTime, default=datetime.datetime.now)
+    baslangic = Column(DateTime)
+    guncelleme = Column(DateTime)  # Çalışan işin kalp atışı; eskiyse iş yarım kalmış sayılır
+    bitis = Column(DateTime)
+    
+    @property
+    def kalan(self) -> int:
+        """İşlenmeyi bekleyen eczane sayısı."""
+        return max((self.toplam or 0) - (self.islenen or 0), 0)
+    
+    def __repr__(self):
+        return f"<KoordinatTamamlamaIsi(id={self.id}, durum='{self.durum}', islenen={self.islenen}/{self.toplam})>"
+
+
+class Kilit(Base):
+    """Süreçler arası kilitler (scraper lider seçimi); sahibi boş olan kilit serbesttir."""
+    
+    __tablename__ = "kilitler"
+    
+    ad = Column(String(100), primary_key=True)
+    sahip = Column(String(200))  # Kilidi tutan süreç (host:pid)
+    alinma = Column(DateTime)  # Sahibin kilidi aldığı zaman
+    yenileme = Column(DateTime)  # Sahibin son kalp atışı; SQLite'ta eskiyse kilit devralınabilir
+    
+    @property
+    def tutulma_sn(self):
+        """Kilit tutuluyorsa alınmasından bu yana geçen süre (saniye)."""
+        if self.sahip is None or self.alinma is None:
+            return None
+        return (datetime.datetime.now() - self.alinma).total_seconds()
+    
+    def __repr__(self):
+        return f"<Kilit(ad='{self.ad}', sahip='{self.sahip}')>"
+
+
 def create_tables():
     """
     Veritabanı tablolarını oluşturan fonksiyon.
-    Bu fonksiyon, veritabanında tanımlanan tüm modeller için tablolar oluşturur.
+    Bu fonksiyon, veritabanında tanımlanan tüm modeller için tablolar oluşturur
+    ve var olan tablolara uygulanmamış şema geçişlerini uygular.
     """
+    from app.database.migrations import run_migrations
+    
     try:
         logger.info("Veritabanı tabloları oluşturuluyor...")
-        Base.metadata.create_all(bind=engine)
+        run_migrations()
         logger.info("Veritabanı tabloları başarıyla oluşturuldu.")
     except Exception as e:
         logger.error(f"Veritabanı tabloları oluşturulurken hata: {str(e)}")
@@ -0,0 +1,195 @@
+"""
+Veritabanı bağlantı havuzu ayarları ve ölçümleri.
+
+Havuz boyutu `DB_POOL_SIZE` / `DB_MAX_OVERFLOW` ile verilir. `DB_MAX_CONNECTIONS`
+tanımlıysa bu, tüm uvicorn/gunicorn süreçlerinin birlikte açabileceği bağlantı
+bütçesidir ve `WEB_CONCURRENCY` (süreç sayısı) ile bölünerek süreç başına
+havuz boyutu hesaplanır. Her motorun havuzu olaylarla izlenir (bağlantı alma,
+taşma bağlantıları, bekleme süresi, zaman aşımı, geçersiz kılınan
+bağlantılar); sayaçlar `GET /api/yonetim/havuz` ile okunur.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from loguru import logger
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class HavuzIstatistikleri:
+    """Bir bağlantı havuzunun süreç içi sayaçları."""
+
+    def __init__(self):
+        self._kilit = threading.Lock()
+        self._sayaclar = {
+            "alma": 0,
+            "iade": 0,
+            "yeni_baglanti": 0,
+            "tasma_baglantisi": 0,
+            "zaman_asimi": 0,
+            "gecersiz_kilma": 0,
+            "kapanan_baglanti": 0,
+        }
+        self._bekleyen = 0
+        self._toplam_bekleme = 0.0
+        self._en_uzun_bekleme = 0.0
+
+    def artir(self, sayac: str):
+        with self._kilit:
+            self._sayaclar[sayac] += 1
+
+    def bekleme_basladi(self):
+        with self._kilit:
+            self._bekleyen += 1
+
+    def bekleme_bitti(self, sure: float, tasma: bool, zaman_asimi: bool):
+        """Havuzdan bağlantı bekleme süresini (saniye) kaydeder."""
+        with self._kilit:
+            self._bekleyen -= 1
+            self._toplam_bekleme += sure
+            self._en_uzun_bekleme = max(self._en_uzun_bekleme, sure)
+            if tasma:
+                self._sayaclar["tasma_baglantisi"] += 1
+            if zaman_asimi:
+                self._sayaclar["zaman_asimi"] += 1
+
+    def sozluk(self) -> Dict[str, Any]:
+        with self._kilit:
+            alma = self._sayaclar["alma"]
+            return {
+                **self._sayaclar,
+                "bekleyen": self._bekleyen,
+                "toplam_bekleme_ms": round(self._toplam_bekleme * 1000, 3),
+                "ortalama_bekleme_ms": round(self._toplam_bekleme * 1000 / alma, 3) if alma else 0.0,
+                "en_uzun_bekleme_ms": round(self._en_uzun_bekleme * 1000, 3),
+            }
+
+
+class _OlculenHavuz:
+    """QueuePool'un bağlantı verme adımını süre ve taşma için ölçen karışım sınıfı."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.istatistik = HavuzIstatistikleri()
+
+    def recreate(self):
+        # engine.dispose() havuzu yeniden oluşturur; sayaçlar yeni havuza taşınır
+        yeni = super().recreate()
+        yeni.istatistik = self.istatistik
+        return yeni
+
+    def _do_get(self):
+        onceki_tasma = self._overflow
+        self.istatistik.bekleme_basladi()
+        baslangic = time.perf_counter()
+        zaman_asimi = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            zaman_asimi = True
+            raise
+        finally:
+            self.istatistik.bekleme_bitti(
+                time.perf_counter() - baslangic,
+                tasma=self._overflow > onceki_tasma and self._overflow > 0,
+                zaman_asimi=zaman_asimi,
+            )
+
+
+class OlculenQueuePool(_OlculenHavuz, QueuePool):
+    """Ölçümlü senkron bağlantı havuzu."""
+
+
+class OlculenAsyncAdaptedQueuePool(_OlculenHavuz, AsyncAdaptedQueuePool):
+    """Ölçümlü asenkron (asyncpg/aiosqlite) bağlantı havuzu."""
+
+
+# Motor adı ("senkron", "asenkron") -> izlenen motor
+_motorlar: Dict[str, Engine] = {}
+
+
+def havuz_boyutu() -> Dict[str, int]:
+    """
+    Bu süreç için `pool_size` ve `max_overflow` değerlerini hesaplar.
+
+    `DB_MAX_CONNECTIONS` > 0 ise bütçe `WEB_CONCURRENCY` sürece bölünür;
+    süreç payı önce kalıcı havuza (en fazla `DB_POOL_SIZE`), kalanı taşmaya verilir.
+    """
+    if settings.DB_MAX_CONNECTIONS <= 0:
+        return {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW}
+
+    surec_payi = max(1, settings.DB_MAX_CONNECTIONS // max(1, settings.WEB_CONCURRENCY))
+    pool_size = min(settings.DB_POOL_SIZE, surec_payi)
+    return {"pool_size": pool_size, "max_overflow": surec_payi - pool_size}
+
+
+def engine_pool_kwargs(database_url: str, asenkron: bool = False) -> Dict[str, Any]:
+    """
+    `create_engine` / `create_async_engine` için havuz argümanlarını döndürür.
+
+    Bellek içi SQLite tek bağlantılık özel havuzunu kullandığı için ayarlanmaz.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+
+    return {
+        "poolclass": OlculenAsyncAdaptedQueuePool if asenkron else OlculenQueuePool,
+        **havuz_boyutu(),
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_pool(ad: str, engine: Engine):
+    """
+    Motorun havuzunu bağlantı olaylarıyla izlemeye başlar.
+
+    Args:
+        ad: İstatistiklerde kullanılacak ad ("senkron", "asenkron")
+        engine: Senkron motor (asenkron motorlar için `AsyncEngine.sync_engine`)
+    """
+    havuz = engine.pool
+    istatistik = getattr(havuz, "istatistik", None)
+    if istatistik is None:
+        istatistik = havuz.istatistik = HavuzIstatistikleri()
+
+    event.listen(havuz, "connect", lambda *_: istatistik.artir("yeni_baglanti"))
+    event.listen(havuz, "checkout", lambda *_: istatistik.artir("alma"))
+    event.listen(havuz, "checkin", lambda *_: istatistik.artir("iade"))
+    event.listen(havuz, "close", lambda *_: istatistik.artir("kapanan_baglanti"))
+    event.listen(havuz, "invalidate", lambda *_: istatistik.artir("gecersiz_kilma"))
+    event.listen(havuz, "soft_invalidate", lambda *_: istatistik.artir("gecersiz_kilma"))
+
+    _motorlar[ad] = engine
+    logger.info(f"{ad} bağlantı havuzu: {havuz.status()}")
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """İzlenen her havuzun ayarlarını, anlık durumunu ve sayaçlarını döndürür (bu süreç için)."""
+    sonuc: Dict[str, Any] = {"surec": os.getpid(), "web_concurrency": settings.WEB_CONCURRENCY}
+    for ad, engine in _motorlar.items():
+        havuz = engine.pool
+        durum: Dict[str, Any] = {"havuz_sinifi": type(havuz).__name__, "durum": havuz.status()}
+        if isinstance(havuz, QueuePool):
+            durum.update({
+                "pool_size": havuz.size(),
+                "max_overflow": havuz._max_overflow,
+                "kullanimda": havuz.checkedout(),
+                "bosta": havuz.checkedin(),
+                "tasma": max(0, havuz.overflow()),
+                "pool_timeout": havuz._timeout,
+                "pool_recycle": havuz._recycle,
+                "pool_pre_ping": havuz._pre_ping,
+            })
+        durum.update(havuz.istatistik.sozluk() if hasattr(havuz, "istatistik") else {})
+        sonuc[ad] = durum
+    return sonuc
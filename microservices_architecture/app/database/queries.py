@@ -0,0 +1,282 @@
+"""
+Senkron ve asenkron API katmanlarının ortak kullandığı sorgu (select) oluşturucuları.
+
+Fonksiyonlar sadece SQLAlchemy `Select` ifadesi döndürür; çalıştırma
+`Session.execute` veya `AsyncSession.execute` ile çağıran tarafta yapılır.
+"""
+import datetime
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.orm import aliased, joinedload
+
+from app.database.models import Eczane as EczaneModel, NobetciEczane as NobetciEczaneModel, Kilit, NobetIstatistigi, ScrapeFarki
+
+
+def eczaneler_sorgusu(limit: int = 100, son_id: Optional[int] = None) -> Select:
+    """
+    Eczaneleri ID sırasıyla listeleyen keyset sayfalama sorgusu.
+
+    Args:
+        limit: Getirilecek en fazla satır
+        son_id: Önceki sayfanın son eczanesinin ID'si (ilk sayfa için None)
+    """
+    sorgu = select(EczaneModel).order_by(EczaneModel.id).limit(limit)
+    if son_id is not None:
+        sorgu = sorgu.where(EczaneModel.id > son_id)
+    return sorgu
+
+
+def eczane_sorgusu(eczane_id: int) -> Select:
+    """ID'si verilen eczaneyi getiren sorgu."""
+    return select(EczaneModel).where(EczaneModel.id == eczane_id)
+
+
+def nobetci_eczaneler_sorgusu(tarih: datetime.date, bolge: Optional[str] = None, kaynak: Optional[str] = None,
+                              koordinat: bool = False) -> Select:
+    """
+    Tarihteki nöbetçi eczaneleri eczane bilgileriyle birlikte getiren sorgu.
+
+    Sonuçlar `joinedload` içerdiği için `.scalars().unique()` ile okunmalıdır.
+    """
+    # Nöbetçi eczaneleri sorgula, eczane bilgilerini eager loading ile birlikte getir
+    sorgu = (
+        select(NobetciEczaneModel)
+        .join(EczaneModel, NobetciEczaneModel.eczane_id == EczaneModel.id)
+        .options(joinedload(NobetciEczaneModel.eczane))
+        .where(NobetciEczaneModel.tarih == tarih)
+    )
+
+    # Bölge filtresi uygulandıysa sorguya ekle
+    if bolge:
+        sorgu = sorgu.where(EczaneModel.bolge == bolge)
+
+    # Kaynak filtresi uygulandıysa sorguya ekle
+    if kaynak:
+        sorgu = sorgu.where(EczaneModel.kaynak == kaynak)
+
+    # Koordinat filtresi uygulandıysa sorguya ekle
+    if koordinat:
+        sorgu = sorgu.where(EczaneModel.latitude.isnot(None), EczaneModel.longitude.isnot(None))
+
+    return sorgu
+
+
+def nobet_araligi_sorgusu(baslangic: Optional[datetime.date] = None, bitis: Optional[datetime.date] = None,
+                          limit: int = 100, son: Optional[Tuple[datetime.date, int]] = None) -> Select:
+    """
+    Tarih aralığındaki nöbet kayıtlarını (tarih, id) sırasıyla listeleyen keyset sayfalama sorgusu.
+
+    Args:
+        baslangic: İlk tarih (dahil)
+        bitis: Son tarih (dahil)
+        limit: Getirilecek en fazla satır
+        son: Önceki sayfanın son kaydının (tarih, id) anahtarı (ilk sayfa için None)
+    """
+    sorgu = (
+        select(NobetciEczaneModel)
+        .options(joinedload(NobetciEczaneModel.eczane))
+        .order_by(NobetciEczaneModel.tarih, NobetciEczaneModel.id)
+        .limit(limit)
+    )
+
+    # Başlangıç tarihi belirtilmişse filtrele
+    if baslangic:
+        sorgu = sorgu.where(NobetciEczaneModel.tarih >= baslangic)
+
+    # Bitiş tarihi belirtilmişse filtrele
+    if bitis:
+        sorgu = sorgu.where(NobetciEczaneModel.tarih <= bitis)
+
+    # Önceki sayfanın son kaydından sonra devam et ((tarih, id) indeksi ile)
+    if son is not None:
+        sorgu = sorgu.where(tuple_(NobetciEczaneModel.tarih, NobetciEczaneModel.id) > tuple_(*son))
+
+    return sorgu
+
+
+def nobet_disa_aktarma_sorgusu(baslangic: Optional[datetime.date] = None,
+                               bitis: Optional[datetime.date] = None) -> Select:
+    """
+    Tarih aralığındaki nöbet kayıtlarını eczane bilgileriyle, ORM nesnesi
+    oluşturmadan sütun olarak (tarih, id) sırasıyla getiren sorgu.
+
+    Satırlar `DISA_AKTARMA_ALANLARI` sırasındadır.
+    """
+    sorgu = (
+        select(
+            NobetciEczaneModel.id,
+            NobetciEczaneModel.tarih,
+            NobetciEczaneModel.eczane_id,
+            EczaneModel.isim,
+            EczaneModel.bolge,
+            EczaneModel.kaynak,
+            EczaneModel.adres,
+            EczaneModel.telefon,
+            EczaneModel.latitude,
+            EczaneModel.longitude,
+            NobetciEczaneModel.not_bilgisi,
+        )
+        .join(EczaneModel, NobetciEczaneModel.eczane_id == EczaneModel.id)
+        .order_by(NobetciEczaneModel.tarih, NobetciEczaneModel.id)
+    )
+
+    if baslangic:
+        sorgu = sorgu.where(NobetciEczaneModel.tarih >= baslangic)
+    if bitis:
+        sorgu = sorgu.where(NobetciEczaneModel.tarih <= bitis)
+
+    return sorgu
+
+
+# `nobet_disa_aktarma_sorgusu` satırlarının alan adları
+DISA_AKTARMA_ALANLARI = (
+    "nobet_id", "tarih", "eczane_id", "isim", "bolge", "kaynak", "adres", "telefon", "latitude", "longitude",
+    "not_bilgisi",
+)
+
+
+def _istatistik_kosullari(sorgu: Select, yil: int, ay: Optional[int], bolge: Optional[str]) -> Select:
+    sorgu = sorgu.join(EczaneModel, NobetIstatistigi.eczane_id == EczaneModel.id).where(NobetIstatistigi.yil == yil)
+    if ay is not None:
+        sorgu = sorgu.where(NobetIstatistigi.ay == ay)
+    if bolge:
+        sorgu = sorgu.where(EczaneModel.bolge == bolge)
+    return sorgu
+
+
+def eczane_istatistikleri_sorgusu(yil: int, ay: Optional[int] = None, bolge: Optional[str] = None) -> Select:
+    """
+    Dönemdeki eczane başına nöbet sayılarını, sadece `nobet_istatistikleri`
+    özetinden, çoktan aza getiren sorgu. Ay verilmezse tüm yıl toplanır.
+    """
+    nobet_sayisi = func.sum(NobetIstatistigi.nobet_sayisi).label("nobet_sayisi")
+    sorgu = select(EczaneModel.id.label("eczane_id"), EczaneModel.isim, EczaneModel.bolge, nobet_sayisi)
+    return (
+        _istatistik_kosullari(sorgu, yil, ay, bolge)
+        .group_by(EczaneModel.id, EczaneModel.isim, EczaneModel.bolge)
+        .order_by(nobet_sayisi.desc(), EczaneModel.isim)
+    )
+
+
+def bolge_istatistikleri_sorgusu(yil: int, ay: Optional[int] = None, bolge: Optional[str] = None) -> Select:
+    """Dönemdeki bölge başına nöbet ve eczane sayılarını `nobet_istatistikleri` özetinden getiren sorgu."""
+    sorgu = select(
+        EczaneModel.bolge,
+        func.count(func.distinct(NobetIstatistigi.eczane_id)).label("eczane_sayisi"),
+        func.sum(NobetIstatistigi.nobet_sayisi).label("nobet_sayisi"),
+    )
+    return _istatistik_kosullari(sorgu, yil, ay, bolge).group_by(EczaneModel.bolge).order_by(EczaneModel.bolge)
+
+
+def scrape_farklari_sorgusu(kaynak: Optional[str] = None, limit: int = 20) -> Select:
+    """Scraper çalışmalarının değişiklik kayıtlarını en yeniden eskiye getiren sorgu."""
+    sorgu = select(ScrapeFarki).order_by(ScrapeFarki.id.desc()).limit(limit)
+    if kaynak:
+        sorgu = sorgu.where(ScrapeFarki.kaynak == kaynak)
+    return sorgu
+
+
+def kilitler_sorgusu() -> Select:
+    """Süreçler arası kilitleri ada göre getiren sorgu."""
+    return select(Kilit).order_by(Kilit.ad)
+
+
+def tarihler_sorgusu(baslangic: Optional[datetime.date] = None, bitis: Optional[datetime.date] = None) -> Select:
+    """
+    Nöbet kaydı bulunan tarihleri yeniden eskiye listeleyen sorgu.
+
+    `SELECT DISTINCT tarih` tüm tabloyu (veya tüm indeksi) okur. Bunun yerine
+    özyinelemeli bir CTE ile indekste tarihten tarihe atlanır (loose index
+    scan): her adım `max(tarih) WHERE tarih < önceki` ile tek bir indeks
+    araması yapar, böylece maliyet satır sayısına değil farklı tarih sayısına bağlıdır.
+    """
+    def kosullar(tablo):
+        # Başlangıç ve bitiş tarihi belirtilmişse filtrele
+        sonuc = []
+        if baslangic:
+            sonuc.append(tablo.tarih >= baslangic)
+        if bitis:
+            sonuc.append(tablo.tarih <= bitis)
+        return sonuc
+
+    tarihler = (
+        select(func.max(NobetciEczaneModel.tarih).label("tarih"))
+        .where(*kosullar(NobetciEczaneModel))
+        .cte("tarihler", recursive=True)
+    )
+    onceki = aliased(NobetciEczaneModel)
+    bir_onceki_tarih = (
+        select(func.max(onceki.tarih))
+        .where(onceki.tarih < tarihler.c.tarih, *kosullar(onceki))
+        .scalar_subquery()
+    )
+    tarihler = tarihler.union_all(select(bir_onceki_tarih).where(tarihler.c.tarih.isnot(None)))
+
+    # Tarihleri sırala (en yakın tarih en üstte)
+    return select(tarihler.c.tarih).where(tarihler.c.tarih.isnot(None)).order_by(tarihler.c.tarih.desc())
+
+
+def bolgeler_sorgusu() -> Select:
+    """Kayıtlı benzersiz bölgeleri listeleyen sorgu."""
+    return select(EczaneModel.bolge).distinct()
+
+
+def harita_sorgusu(sadece_nobetci: bool = False, tarih: Optional[datetime.date] = None) -> Select:
+    """
+    Koordinatı olan eczanelerin harita bilgilerini getiren sorgu.
+
+    Args:
+        sadece_nobetci: Sadece `tarih` günü nöbetçi olanlar
+        tarih: Nöbet tarihi (verilmezse bugün)
+    """
+    sorgu = select(
+        EczaneModel.id,
+        EczaneModel.isim,
+        EczaneModel.bolge,
+        EczaneModel.adres,
+        EczaneModel.telefon,
+        EczaneModel.latitude,
+        EczaneModel.longitude
+    ).where(
+        EczaneModel.latitude.isnot(None),
+        EczaneModel.longitude.isnot(None)
+    )
+
+    # Sadece nöbetçi eczaneler isteniyorsa filtrele
+    if sadece_nobetci:
+        sorgu = sorgu.join(NobetciEczaneModel).where(NobetciEczaneModel.tarih == (tarih or datetime.date.today()))
+
+    return sorgu
+
+
+def anlik_goruntu_sorgusu(tarih: datetime.date) -> Select:
+    """Günlük anlık görüntüye yazılacak nöbet kayıtlarını eczane bilgileriyle getiren sorgu."""
+    return (
+        select(NobetciEczaneModel)
+        .options(joinedload(NobetciEczaneModel.eczane))
+        .where(NobetciEczaneModel.tarih == tarih)
+        .order_by(NobetciEczaneModel.id)
+    )
+
+
+def koordinatli_nobetler_sorgusu(tarih: datetime.date, eczane_alanlari: Sequence[str]) -> Select:
+    """
+    Tarihin koordinatlı nöbetçi eczanelerini ORM nesnesi oluşturmadan sütun olarak getiren sorgu.
+
+    Satırlar (nöbet id, tarih, not_bilgisi, *eczane_alanlari) biçimindedir.
+    """
+    return (
+        select(
+            NobetciEczaneModel.id,
+            NobetciEczaneModel.tarih,
+            NobetciEczaneModel.not_bilgisi,
+            *(getattr(EczaneModel, alan) for alan in eczane_alanlari),
+        )
+        .join(EczaneModel, NobetciEczaneModel.eczane_id == EczaneModel.id)
+        .where(
+            NobetciEczaneModel.tarih == tarih,
+            EczaneModel.latitude.isnot(None),
+            EczaneModel.longitude.isnot(None),
+        )
+    )
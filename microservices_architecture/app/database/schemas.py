@@ -2,8 +2,9 @@
 Pydantic modelleri (API şemaları).
 """
 import datetime
-from typing import List, Optional
-from pydantic import BaseModel
+import json
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, validator
 
 # Eczane şemaları
 class EczaneBase(BaseModel):
@@ -15,6 +16,7 @@ class EczaneBase(BaseModel):
     telefon: Optional[str] = None
     latitude: Optional[float] = None
     longitude: Optional[float] = None
+    kaynak: Optional[str] = None
 
 
 class EczaneCreate(EczaneBase):
@@ -72,6 +74,109 @@ class NobetciEczaneDetay(BaseModel):
         orm_mode = True
 
 
+class YakinNobetciEczane(NobetciEczaneDetay):
+    """Konuma uzaklığıyla birlikte nöbetçi eczane bilgisi."""
+    mesafe_km: float
+
+
+# Keyset (cursor) sayfalı liste şemaları
+class EczaneSayfasi(BaseModel):
+    """Eczane listesinin bir sayfası."""
+    eczaneler: List[Eczane]
+    next_cursor: Optional[str] = None  # Son sayfada None
+
+
+class NobetciEczaneSayfasi(BaseModel):
+    """Nöbet kayıtları listesinin bir sayfası."""
+    nobetler: List[NobetciEczaneDetay]
+    next_cursor: Optional[str] = None  # Son sayfada None
+
+
+# Nöbet istatistikleri (nobet_istatistikleri özetinden)
+class EczaneNobetSayisi(BaseModel):
+    """Bir eczanenin dönemdeki nöbet sayısı."""
+    eczane_id: int
+    isim: str
+    bolge: str
+    nobet_sayisi: int
+
+
+class BolgeNobetSayisi(BaseModel):
+    """Bir bölgenin dönemdeki nöbet sayısı."""
+    bolge: str
+    eczane_sayisi: int  # Dönemde en az bir nöbeti olan eczane sayısı
+    nobet_sayisi: int
+
+
+class NobetIstatistikleri(BaseModel):
+    """Yıl veya ay bazında eczane ve bölge nöbet sayıları."""
+    yil: int
+    ay: Optional[int] = None  # None: tüm yıl
+    bolgeler: List[BolgeNobetSayisi]
+    eczaneler: List[EczaneNobetSayisi]
+
+
+# Toplu koordinat tamamlama işi durumu
+class KoordinatTamamlamaDurumu(BaseModel):
+    """Koordinat tamamlama işinin ilerleme bilgisi."""
+    id: int
+    durum: str
+    tetikleyen: Optional[str] = None
+    toplam: int
+    islenen: int
+    kalan: int
+    bulunan: int
+    bulunamayan: int
+    son_eczane_id: int
+    saatlik_butce: int
+    penceredeki_istek: int
+    saglayici_istekleri: int
+    mesaj: Optional[str] = None
+    olusturma: Optional[datetime.datetime] = None
+    baslangic: Optional[datetime.datetime] = None
+    guncelleme: Optional[datetime.datetime] = None
+    bitis: Optional[datetime.datetime] = None
+    
+    class Config:
+        orm_mode = True
+
+
+# Scraper çalışması değişiklik kaydı
+class ScrapeFarkiKaydi(BaseModel):
+    """Bir scraper çalışmasının veritabanına uyguladığı değişiklikler."""
+    id: int
+    kaynak: Optional[str] = None
+    tarih: datetime.date
+    eczane_eklenen: int
+    eczane_guncellenen: int
+    nobet_eklenen: int
+    nobet_guncellenen: int
+    nobet_silinen: int
+    farklar: List[Dict[str, Any]]
+    olusturma: Optional[datetime.datetime] = None
+    
+    @validator("farklar", pre=True)
+    def farklari_coz(cls, deger):
+        # Veritabanında JSON metni olarak tutulur
+        return json.loads(deger) if isinstance(deger, str) else deger
+    
+    class Config:
+        orm_mode = True
+
+
+# Süreçler arası kilit
+class KilitDurumu(BaseModel):
+    """Bir kilidin (ör. scraper lider kilidi) sahibi ve zamanları."""
+    ad: str
+    sahip: Optional[str] = None
+    alinma: Optional[datetime.datetime] = None
+    yenileme: Optional[datetime.datetime] = None
+    tutulma_sn: Optional[float] = None  # Sahip varsa kilidin ne zamandır tutulduğu
+    
+    class Config:
+        orm_mode = True
+
+
 # Web scraper için şema
 class ScraperEczane(BaseModel):
     """Web scraper'dan gelen eczane bilgisi şeması."""
@@ -82,4 +187,17 @@ class ScraperEczane(BaseModel):
     telefon: str
     not_bilgisi: Optional[str] = ""
     latitude: Optional[float] = None
-    longitude: Optional[float] = None
\ No newline at end of file
+    longitude: Optional[float] = None
+
+
+# Scraper kaynakları (belediye sayfaları) için şema
+class ScraperKaynagi(BaseModel):
+    """Nöbetçi eczane listesi çekilen bir belediye sayfası."""
+    ad: str  # Benzersiz kısa ad; eczaneler ve scrape_calismalari tablolarında kaynak etiketi
+    url: str
+    parser: Optional[str] = None  # Ayrıştırıcı arka ucu ("bs4", "lxml"); boşsa PARSER_BACKEND
+    sehir: str = "Edremit"  # Geocoding'de adrese eklenen şehir/ilçe
+    ulke: str = "Turkey"
+    saat: Optional[int] = None  # Günlük çalışma saati; boşsa SCRAPE_HOUR
+    dakika: Optional[int] = None  # Boşsa SCRAPE_MINUTE
+    aktif: bool = True
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Günlük nöbet listesi anlık görüntüleri.
+
+Bir tarihin nöbet listesi, `GET /api/nobetci-eczaneler` yanıtıyla aynı JSON
+biçiminde bir kez oluşturulur, gzip ile sıkıştırılır ve güçlü bir ETag ile
+`nobet_anliklari` tablosuna yazılır. Görüntü, oluşturulduğu veri sürümüyle
+etiketlenir; sürüm değiştiyse (yeni scrape, koordinat güncellemesi) bir
+sonraki istekte yeniden oluşturulur.
+"""
+import datetime
+import gzip
+import hashlib
+import json
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database.models import NobetAnligi
+from app.database.queries import anlik_goruntu_sorgusu
+from app.database.schemas import NobetciEczaneDetay
+from app.database.version import get_data_version
+
+
+def _json_varsayilan(deger):
+    """Tarih/zaman değerlerini ISO biçiminde yazar (FastAPI çıktısıyla aynı)."""
+    if isinstance(deger, (datetime.date, datetime.datetime)):
+        return deger.isoformat()
+    raise TypeError(f"JSON'a çevrilemeyen tip: {type(deger).__name__}")
+
+
+def build_snapshot(db: Session, tarih: datetime.date, veri_surumu: Optional[int] = None) -> NobetAnligi:
+    """
+    Tarihin nöbet listesinin anlık görüntüsünü oluşturur ve kaydeder.
+
+    Args:
+        db: Veritabanı oturumu (commit bu fonksiyonda yapılır)
+        tarih: Nöbet tarihi
+        veri_surumu: Görüntünün etiketleneceği sürüm (verilmezse veriler okunmadan önce okunur)
+
+    Returns:
+        NobetAnligi: Kaydedilen anlık görüntü
+    """
+    # Sürüm veriden önce okunur: arada bir yazma olursa görüntü eski sürümle
+    # etiketlenir ve bir sonraki istekte yeniden oluşturulur
+    if veri_surumu is None:
+        veri_surumu = get_data_version(db)
+
+    nobetler = db.execute(anlik_goruntu_sorgusu(tarih)).scalars().unique().all()
+    json_icerik = json.dumps(
+        [NobetciEczaneDetay.from_orm(n).dict() for n in nobetler],
+        ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_json_varsayilan,
+    ).encode("utf-8")
+
+    anlik = NobetAnligi(
+        tarih=tarih,
+        veri_surumu=veri_surumu,
+        json_icerik=json_icerik,
+        gzip_icerik=gzip.compress(json_icerik, compresslevel=9, mtime=0),
+        etag=f'"{hashlib.sha256(json_icerik).hexdigest()[:32]}"',
+        eczane_sayisi=len(nobetler),
+        olusturma=datetime.datetime.now(),
+    )
+
+    # Nöbet kaydı olmayan tarihler (gelecek/eski tarihler) için tabloya satır yazılmaz
+    if not nobetler:
+        return anlik
+
+    try:
+        # Kopyası yazılır; döndürülen nesne commit sonrası yeniden yüklenmez
+        db.merge(anlik)
+        db.commit()
+    except IntegrityError:
+        # Başka bir süreç aynı anda aynı tarihin görüntüsünü yazdı
+        db.rollback()
+        logger.debug(f"{tarih} anlık görüntüsü başka bir süreç tarafından yazıldı")
+
+    logger.info(
+        f"{tarih} nöbet listesi anlık görüntüsü oluşturuldu: {len(nobetler)} eczane, "
+        f"{len(json_icerik)} bayt JSON, {len(anlik.gzip_icerik)} bayt gzip (veri sürümü {veri_surumu})"
+    )
+    return anlik
+
+
+def get_snapshot(db: Session, tarih: datetime.date, veri_surumu: int) -> NobetAnligi:
+    """
+    Tarihin verilen veri sürümüne ait anlık görüntüsünü döndürür; yoksa veya
+    eskiyse yeniden oluşturur.
+    """
+    anlik = db.get(NobetAnligi, tarih)
+    if anlik is not None and anlik.veri_surumu == veri_surumu:
+        return anlik
+    return build_snapshot(db, tarih, veri_surumu)
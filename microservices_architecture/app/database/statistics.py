@@ -0,0 +1,139 @@
+"""
+Nöbet istatistikleri özeti (rollup).
+
+`nobet_istatistikleri` tablosu her eczanenin aylık nöbet sayısını tutar.
+Scraper yeni nöbet kayıtlarını yazdığı transaction içinde ilgili satırları
+artırır (`increment_duty_stats`), listeden çıkan nöbetleri sildiğinde azaltır
+(`decrement_duty_stats`); böylece `GET /api/istatistikler` nöbet
+geçmişini taramadan, sadece bu tablodan okur ve yanıt süresi geçmiş
+büyüdükçe artmaz. Özet bozulursa veya geçmiş dışarıdan yüklenirse tamamen
+yeniden hesaplanabilir:
+
+    python -m app.database.statistics
+"""
+import datetime
+import sys
+from collections import Counter
+from typing import Iterable
+
+from loguru import logger
+from sqlalchemy import Integer, bindparam, cast, delete, extract, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database.models import NobetciEczane as NobetciEczaneModel, NobetIstatistigi
+
+settings = get_settings()
+
+
+def increment_duty_stats(db: Session, tarih: datetime.date, eczane_idleri: Iterable[int]):
+    """
+    Tarihe yeni eklenen nöbet kayıtları için eczanelerin aylık sayaçlarını artırır.
+
+    Sadece yeni eklenen (güncellenmeyen) nöbetlerin eczaneleri verilmelidir.
+    Commit işlemi çağırana bırakılır.
+    """
+    artislar = Counter(eczane_idleri)
+    if not artislar:
+        return
+
+    tablo = NobetIstatistigi.__table__
+    satirlar = [
+        {"eczane_id": eczane_id, "yil": tarih.year, "ay": tarih.month, "nobet_sayisi": artis}
+        for eczane_id, artis in artislar.items()
+    ]
+
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        for i in range(0, len(satirlar), settings.BULK_BATCH_SIZE):
+            stmt = pg_insert(tablo).values(satirlar[i:i + settings.BULK_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[tablo.c.eczane_id, tablo.c.yil, tablo.c.ay],
+                set_={"nobet_sayisi": tablo.c.nobet_sayisi + stmt.excluded.nobet_sayisi},
+            )
+            db.execute(stmt)
+        return
+
+    # Ayın mevcut satırları bir kez yüklenir (en fazla eczane sayısı kadar)
+    mevcut = set(db.execute(
+        select(tablo.c.eczane_id).where(tablo.c.yil == tarih.year, tablo.c.ay == tarih.month)
+    ).scalars())
+    yeni = [s for s in satirlar if s["eczane_id"] not in mevcut]
+    guncel = [{"b_eczane_id": s["eczane_id"], "b_artis": s["nobet_sayisi"]} for s in satirlar if s["eczane_id"] in mevcut]
+
+    if yeni:
+        db.execute(insert(tablo), yeni)
+    if guncel:
+        db.execute(
+            update(tablo)
+            .where(tablo.c.eczane_id == bindparam("b_eczane_id"), tablo.c.yil == tarih.year, tablo.c.ay == tarih.month)
+            .values(nobet_sayisi=tablo.c.nobet_sayisi + bindparam("b_artis")),
+            guncel,
+        )
+
+
+def decrement_duty_stats(db: Session, tarih: datetime.date, eczane_idleri: Iterable[int]):
+    """
+    Tarihten silinen nöbet kayıtları için eczanelerin aylık sayaçlarını azaltır.
+
+    Sıfıra inen satırlar silinir (yeniden hesaplanan özette de yer almazlar).
+    Commit işlemi çağırana bırakılır.
+    """
+    azalislar = Counter(eczane_idleri)
+    if not azalislar:
+        return
+
+    tablo = NobetIstatistigi.__table__
+    donem = (tablo.c.yil == tarih.year, tablo.c.ay == tarih.month)
+    db.execute(
+        update(tablo)
+        .where(tablo.c.eczane_id == bindparam("b_eczane_id"), *donem)
+        .values(nobet_sayisi=tablo.c.nobet_sayisi - bindparam("b_azalis")),
+        [{"b_eczane_id": eczane_id, "b_azalis": azalis} for eczane_id, azalis in azalislar.items()],
+    )
+    db.execute(delete(tablo).where(*donem, tablo.c.nobet_sayisi <= 0))
+
+
+def rebuild_duty_stats(baglanti) -> int:
+    """
+    Özeti `nobetci_eczaneler` tablosundan yeniden hesaplar.
+
+    Args:
+        baglanti: Oturum veya bağlantı; commit işlemi çağırana bırakılır
+
+    Returns:
+        int: Yazılan (eczane, yıl, ay) satırı sayısı
+    """
+    tablo = NobetIstatistigi.__table__
+    yil = cast(extract("year", NobetciEczaneModel.tarih), Integer)
+    ay = cast(extract("month", NobetciEczaneModel.tarih), Integer)
+
+    baglanti.execute(delete(tablo))
+    baglanti.execute(
+        insert(tablo).from_select(
+            ["eczane_id", "yil", "ay", "nobet_sayisi"],
+            select(NobetciEczaneModel.eczane_id, yil, ay, func.count()).group_by(NobetciEczaneModel.eczane_id, yil, ay),
+        )
+    )
+    return baglanti.execute(select(func.count()).select_from(tablo)).scalar()
+
+
+# Bu modül doğrudan çalıştırıldığında özeti yeniden hesapla
+if __name__ == "__main__":
+    from app.database.connection import SessionLocal
+    from app.database.version import bump_data_version
+
+    db = SessionLocal()
+    try:
+        satir = rebuild_duty_stats(db)
+        # Önbellekteki istatistik yanıtları geçersiz kılınsın
+        bump_data_version(db)
+        db.commit()
+        logger.info(f"Nöbet istatistikleri yeniden hesaplandı: {satir} satır")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Nöbet istatistikleri yeniden hesaplanamadı: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
@@ -0,0 +1,57 @@
+"""
+Veri sürümü sayacı.
+
+Eczane ve nöbet verisini değiştiren her işlem, aynı transaction içinde
+`veri_surumu` tablosundaki tek satırlık sayacı artırır. API süreçleri bu
+sayacı izleyerek yanıt önbelleklerini geçersiz kılar. PostgreSQL'de artış
+ayrıca `veri_surumu` kanalına NOTIFY olarak yayınlanır; bildirim transaction
+commit edildiğinde teslim edilir.
+"""
+import datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.database.models import VeriSurumu
+
+# LISTEN/NOTIFY kanal adı
+VERI_SURUMU_KANALI = "veri_surumu"
+
+
+def bump_data_version(db: Session) -> int:
+    """
+    Veri sürümünü bir artırır. Commit işlemi çağırana bırakılır.
+
+    Returns:
+        int: Yeni sürüm numarası
+    """
+    guncellenen = db.execute(
+        update(VeriSurumu)
+        .where(VeriSurumu.id == 1)
+        .values(surum=VeriSurumu.surum + 1, guncelleme=datetime.datetime.now())
+    ).rowcount
+
+    if not guncellenen:
+        # Sayaç satırı henüz yok (yeni veritabanı)
+        db.add(VeriSurumu(id=1, surum=1, guncelleme=datetime.datetime.now()))
+        db.flush()
+
+    yeni = get_data_version(db)
+
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_notify(VERI_SURUMU_KANALI, str(yeni))))
+
+    return yeni
+
+
+def get_data_version(baglanti) -> int:
+    """
+    Güncel veri sürümünü döndürür.
+
+    Args:
+        baglanti: SQLAlchemy oturumu veya bağlantısı
+
+    Returns:
+        int: Sürüm numarası (sayaç satırı yoksa 0)
+    """
+    return baglanti.execute(select(VeriSurumu.surum).where(VeriSurumu.id == 1)).scalar() or 0
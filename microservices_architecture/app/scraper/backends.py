@@ -0,0 +1,163 @@
+"""
+HTML ayrıştırıcı arka uçları.
+
+Her arka uç aynı üç işlemi sağlar: sayfadaki görünür eczane öğelerini bulmak,
+öğenin HTML'ini döndürmek ve öğeden ham alanları çıkarmak. ScraperEczane
+nesnesinin oluşturulması `app.scraper.parser` modülündedir.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from loguru import logger
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class BeautifulSoupBackend:
+    """BeautifulSoup (html.parser) ve CSS seçicileri ile çalışan arka uç."""
+
+    name = "bs4"
+
+    def iter_items(self, content: bytes) -> List[Any]:
+        """Sayfadaki görünür eczane div'lerini döndürür."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, 'html.parser')
+        return soup.select('div.itemwrap[style*="display: block"]')
+
+    def item_html(self, item: Any) -> str:
+        """Öğenin HTML metnini döndürür."""
+        return str(item)
+
+    def parse_item(self, div: Any) -> Dict[str, str]:
+        """Eczane div'inden ham alanları çıkarır."""
+        # Bölge bilgisini al
+        bolge_div = div.select_one('div.tag.discount')
+        bolge = bolge_div.text.strip() if bolge_div else "Bilinmiyor"
+
+        # Eczane adını al
+        isim_div = div.select_one('div.itemwrap_title')
+        isim = isim_div.text.strip() if isim_div else "Bilinmiyor"
+
+        # Konum URL'sini al
+        konum_a = div.select_one('a[href*="maps"]')
+        konum_url = konum_a['href'] if konum_a else ""
+
+        # Adres bilgisini al
+        adres = ""
+        for element in div.find_all('div', class_='itemwrap_position'):
+            fa_marker = element.find('i', class_='fa-map-marker')
+            if fa_marker and fa_marker.parent:
+                # i elementinin parent elementinin text içeriğini al
+                adres = fa_marker.parent.get_text().strip()
+                adres = adres.replace('\n', ' ').strip()
+                break
+
+        # Telefon bilgisini al
+        telefon_a = div.select_one('div.itemwrap_position a[href*="tel:"]')
+        telefon = telefon_a.text.strip() if telefon_a else "Bilinmiyor"
+
+        # Ek not bilgisi var mı kontrol et (örn: "Saat 20.00'a kadar nöbetçidir.")
+        not_div = div.select_one('div[style*="font-size: smaller"]')
+        not_bilgisi = not_div.text.strip() if not_div else ""
+
+        return {
+            "bolge": bolge,
+            "isim": isim,
+            "konum_url": konum_url,
+            "adres": adres,
+            "telefon": telefon,
+            "not_bilgisi": not_bilgisi,
+        }
+
+
+def _sinif(ad: str) -> str:
+    """XPath için "class listesinde `ad` var" koşulunu üretir."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {ad} ')"
+
+
+class LxmlBackend:
+    """lxml ve önceden derlenmiş XPath ifadeleri ile çalışan hızlı arka uç."""
+
+    name = "lxml"
+
+    def __init__(self):
+        from lxml import etree
+
+        self._ogeler = etree.XPath(f"//div[{_sinif('itemwrap')} and contains(@style, 'display: block')]")
+        self._bolge = etree.XPath(f".//div[{_sinif('tag')} and {_sinif('discount')}]")
+        self._isim = etree.XPath(f".//div[{_sinif('itemwrap_title')}]")
+        self._konum = etree.XPath(".//a[contains(@href, 'maps')]")
+        self._adres_marker = etree.XPath(f".//div[{_sinif('itemwrap_position')}]//i[{_sinif('fa-map-marker')}]")
+        self._telefon = etree.XPath(f".//div[{_sinif('itemwrap_position')}]//a[contains(@href, 'tel:')]")
+        self._not = etree.XPath(".//div[contains(@style, 'font-size: smaller')]")
+
+    def iter_items(self, content: bytes) -> List[Any]:
+        """Sayfadaki görünür eczane div'lerini döndürür."""
+        import lxml.html
+        from bs4.dammit import UnicodeDammit
+
+        # Karakter kodlamasını BeautifulSoup ile aynı şekilde çöz
+        metin = UnicodeDammit(content, is_html=True).unicode_markup if isinstance(content, bytes) else content
+        return self._ogeler(lxml.html.document_fromstring(metin))
+
+    def item_html(self, item: Any) -> str:
+        """Öğenin HTML metnini döndürür."""
+        import lxml.html
+
+        return lxml.html.tostring(item, encoding="unicode", with_tail=False)
+
+    @staticmethod
+    def _ilk_metin(sonuclar: List[Any], varsayilan: str) -> str:
+        return sonuclar[0].text_content().strip() if sonuclar else varsayilan
+
+    def parse_item(self, div: Any) -> Dict[str, str]:
+        """Eczane div'inden ham alanları çıkarır."""
+        konum = self._konum(div)
+
+        # Adres: fa-map-marker ikonunu içeren elementin metni
+        adres = ""
+        for marker in self._adres_marker(div):
+            ebeveyn = marker.getparent()
+            if ebeveyn is not None:
+                adres = ebeveyn.text_content().strip().replace('\n', ' ').strip()
+                break
+
+        return {
+            "bolge": self._ilk_metin(self._bolge(div), "Bilinmiyor"),
+            "isim": self._ilk_metin(self._isim(div), "Bilinmiyor"),
+            "konum_url": konum[0].get("href", "") if konum else "",
+            "adres": adres,
+            "telefon": self._ilk_metin(self._telefon(div), "Bilinmiyor"),
+            "not_bilgisi": self._ilk_metin(self._not(div), ""),
+        }
+
+
+BACKENDS = {
+    BeautifulSoupBackend.name: BeautifulSoupBackend,
+    LxmlBackend.name: LxmlBackend,
+}
+
+
+@lru_cache()
+def get_backend(name: str = None):
+    """
+    Ayrıştırıcı arka ucunu döndürür.
+
+    Args:
+        name: Arka uç adı ("bs4" veya "lxml"); verilmezse PARSER_BACKEND ayarı kullanılır
+
+    Returns:
+        Arka uç nesnesi. lxml kurulu değilse BeautifulSoup arka ucuna düşer.
+    """
+    name = name or settings.PARSER_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Bilinmeyen ayrıştırıcı arka ucu: {name}")
+
+    try:
+        return BACKENDS[name]()
+    except ImportError as e:
+        logger.warning(f"{name} arka ucu yüklenemedi ({str(e)}), BeautifulSoup kullanılacak")
+        return BeautifulSoupBackend()
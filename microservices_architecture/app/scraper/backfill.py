@@ -0,0 +1,314 @@
+"""
+Koordinatı eksik eczanelerin arka planda toplu geocode edilmesi (koordinat tamamlama).
+
+İş, `koordinat_tamamlama_isleri` tablosunda bir satır olarak tutulur ve bir
+arka plan thread'inde çalışır. Koordinatı olmayan eczaneler ID sırasıyla
+işlenir; kaldığı yer (`son_eczane_id`) ve sayaçlar her partide, bulunan
+koordinatlarla aynı transaction içinde kaydedilir. Süreç yeniden başlarsa iş
+aynı yerden devam ettirilir.
+
+Sağlayıcıya yapılan istekler bir saatlik pencerelerde sayılır; pencere
+bütçesi (`GEOCODE_BACKFILL_HOURLY_BUDGET`) dolduğunda iş bir sonraki pencereyi
+bekler. Bir eczane en kötü durumda `ECZANE_BASINA_EN_FAZLA_ISTEK` istek
+yaptığı için eczaneye ancak pencerede bu kadar bütçe kaldıysa başlanır. Sadece
+işin kendi isteklerinin sağlayıcı çağrıları sayılır (`count_provider_calls`);
+süreçteki diğer geocoding (ör. scraper) işin bütçesinden düşmez. Önbellekten
+dönen adresler de bütçeden düşmez. Tek tek istekler yine paylaşılan hız
+sınırlayıcıdan geçer.
+"""
+import datetime
+import threading
+from typing import Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database.connection import SessionLocal
+from app.database.models import Eczane as EczaneModel, KoordinatTamamlamaIsi
+from app.database.version import bump_data_version
+from app.scraper.sources import get_sources, locate_pharmacy
+from app.utils.geocode import count_provider_calls
+
+settings = get_settings()
+
+# Bütçe penceresi uzunluğu
+PENCERE = datetime.timedelta(hours=1)
+
+# Bir eczanenin en kötü durumda yaptığı sağlayıcı isteği (geopy + doğrudan Nominatim API yedeği)
+ECZANE_BASINA_EN_FAZLA_ISTEK = 2
+
+# Çalışan iş bu aralıkla kalp atışı yazar (bütçe beklerken de)
+KALP_ATISI_SN = 60
+
+# Kalp atışı bundan eskiyse çalışan süreç durmuş sayılır ve iş devralınabilir
+KALP_ATISI_ZAMAN_ASIMI = datetime.timedelta(seconds=KALP_ATISI_SN * 3)
+
+# Bitmemiş iş durumları
+ACIK_DURUMLAR = ("beklemede", "calisiyor", "duraklatildi")
+
+_kilit = threading.Lock()
+_durdur = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _eksik_koordinat():
+    """Koordinatı eksik eczaneleri seçen koşul."""
+    return or_(EczaneModel.latitude.is_(None), EczaneModel.longitude.is_(None))
+
+
+def _kalan_sayisi(db: Session, son_eczane_id: int) -> int:
+    """Kaldığı yerden sonra koordinatı eksik eczane sayısını döndürür."""
+    return db.execute(
+        select(func.count()).select_from(EczaneModel).where(_eksik_koordinat(), EczaneModel.id > son_eczane_id)
+    ).scalar()
+
+
+def _sahiplen(db: Session, is_id: int, simdi: datetime.datetime) -> bool:
+    """
+    İşi bu süreç adına çalışır duruma getirir.
+
+    Başka bir süreç işi çalıştırıyorsa (kalp atışı taze) hiçbir satır
+    güncellenmez ve False döner.
+    """
+    guncellenen = db.execute(
+        update(KoordinatTamamlamaIsi)
+        .where(
+            KoordinatTamamlamaIsi.id == is_id,
+            KoordinatTamamlamaIsi.durum.in_(ACIK_DURUMLAR),
+            or_(
+                KoordinatTamamlamaIsi.durum != "calisiyor",
+                KoordinatTamamlamaIsi.guncelleme.is_(None),
+                KoordinatTamamlamaIsi.guncelleme < simdi - KALP_ATISI_ZAMAN_ASIMI,
+            ),
+        )
+        .values(durum="calisiyor", guncelleme=simdi)
+    ).rowcount
+    db.commit()
+    return guncellenen == 1
+
+
+def start_backfill(tetikleyen: str = "api") -> Tuple[KoordinatTamamlamaIsi, bool]:
+    """
+    Koordinat tamamlama işini başlatır veya yarım kalmış işi devam ettirir.
+
+    Açık bir iş varsa yeni iş oluşturulmaz: iş bu süreçte ya da başka bir
+    süreçte çalışıyorsa olduğu gibi döndürülür, duraklatılmış veya kalp
+    atışı kesilmişse kaldığı yerden devam ettirilir. İş arka plan thread'inde
+    çalışır; fonksiyon hemen döner.
+
+    Args:
+        tetikleyen: İşi başlatan ("api" veya "zamanlayici")
+
+    Returns:
+        Tuple: (iş kaydı, bu çağrıda thread başlatıldı mı)
+    """
+    global _thread
+
+    with _kilit:
+        db = SessionLocal()
+        try:
+            is_ = db.execute(
+                select(KoordinatTamamlamaIsi)
+                .where(KoordinatTamamlamaIsi.durum.in_(ACIK_DURUMLAR))
+                .order_by(KoordinatTamamlamaIsi.id.desc())
+                .limit(1)
+            ).scalar_one_or_none()
+
+            if _thread is not None and _thread.is_alive():
+                return is_, False
+
+            simdi = datetime.datetime.now()
+            if is_ is None:
+                is_ = KoordinatTamamlamaIsi(
+                    durum="beklemede",
+                    tetikleyen=tetikleyen,
+                    toplam=_kalan_sayisi(db, 0),
+                    saatlik_butce=settings.GEOCODE_BACKFILL_HOURLY_BUDGET,
+                    olusturma=simdi,
+                )
+                db.add(is_)
+                db.commit()
+                logger.info(f"Koordinat tamamlama işi oluşturuldu: #{is_.id}, {is_.toplam} eczane ({tetikleyen})")
+            else:
+                # Kaldığı yerden sonra eklenen eksik eczaneler de işe dahil edilir
+                is_.toplam = is_.islenen + _kalan_sayisi(db, is_.son_eczane_id)
+                is_.saatlik_butce = settings.GEOCODE_BACKFILL_HOURLY_BUDGET
+                db.commit()
+
+            if not _sahiplen(db, is_.id, simdi):
+                db.refresh(is_)
+                logger.info(f"Koordinat tamamlama işi #{is_.id} başka bir süreçte çalışıyor")
+                return is_, False
+
+            db.refresh(is_)
+            logger.info(f"Koordinat tamamlama işi #{is_.id} başlatılıyor (kaldığı yer: eczane #{is_.son_eczane_id})")
+            _durdur.clear()
+            _thread = threading.Thread(
+                target=_calistir, args=(is_.id,), name=f"koordinat-tamamlama-{is_.id}", daemon=True
+            )
+            _thread.start()
+            return is_, True
+        finally:
+            db.close()
+
+
+def resume_backfill() -> Optional[KoordinatTamamlamaIsi]:
+    """
+    Süreç yeniden başladığında yarım kalmış (duraklatılmış veya kalp atışı
+    kesilmiş) işi devam ettirir. Açık iş yoksa hiçbir şey yapmaz.
+
+    Returns:
+        Optional[KoordinatTamamlamaIsi]: Devam ettirilen iş (yoksa None)
+    """
+    db = SessionLocal()
+    try:
+        acik = db.execute(
+            select(func.count()).select_from(KoordinatTamamlamaIsi)
+            .where(KoordinatTamamlamaIsi.durum.in_(ACIK_DURUMLAR))
+        ).scalar()
+    finally:
+        db.close()
+
+    if not acik:
+        return None
+    is_, baslatildi = start_backfill("devam")
+    return is_ if baslatildi else None
+
+
+def stop_backfill(zaman_asimi: float = 10.0):
+    """
+    Bu süreçte çalışan işi durdurur. İş "duraklatildi" durumunda kaydedilir
+    ve bir sonraki başlatmada kaldığı yerden devam eder.
+    """
+    _durdur.set()
+    if _thread is not None and _thread.is_alive():
+        _thread.join(zaman_asimi)
+
+
+def get_backfill_job(db: Session, is_id: int) -> Optional[KoordinatTamamlamaIsi]:
+    """İş kaydını döndürür (yoksa None)."""
+    return db.get(KoordinatTamamlamaIsi, is_id)
+
+
+class _IsCalistirici:
+    """Tek bir koordinat tamamlama işini çalıştırır (arka plan thread'inde)."""
+
+    def __init__(self, db: Session, is_: KoordinatTamamlamaIsi):
+        self.db = db
+        self.is_ = is_
+        self.degisen = 0  # Son kayıttan beri koordinatı bulunan eczane sayısı
+
+    def kaydet(self):
+        """İlerlemeyi ve bulunan koordinatları tek transaction'da yazar."""
+        self.is_.guncelleme = datetime.datetime.now()
+        if self.degisen:
+            bump_data_version(self.db)
+            self.degisen = 0
+        self.db.commit()
+
+    def butce_bekle(self) -> bool:
+        """
+        Pencerede bir eczanenin en kötü durumdaki istek sayısı kadar bütçe
+        kalmadıysa bir sonraki pencereyi bekler.
+
+        Returns:
+            bool: Devam edilebilir mi (iş durdurulduysa False)
+        """
+        is_ = self.is_
+        simdi = datetime.datetime.now()
+        if is_.pencere_baslangic is None or simdi - is_.pencere_baslangic >= PENCERE:
+            is_.pencere_baslangic = simdi
+            is_.penceredeki_istek = 0
+        # Bütçe bir eczanenin en kötü durumundan küçük ayarlandıysa iş yine ilerler
+        gereken = min(ECZANE_BASINA_EN_FAZLA_ISTEK, max(is_.saatlik_butce, 1))
+        if is_.penceredeki_istek + gereken <= is_.saatlik_butce:
+            return True
+
+        bitis = is_.pencere_baslangic + PENCERE
+        logger.info(f"Koordinat tamamlama işi #{is_.id}: saatlik bütçe doldu, {bitis:%H:%M:%S}'e kadar bekleniyor")
+        self.kaydet()
+        while datetime.datetime.now() < bitis:
+            kalan = (bitis - datetime.datetime.now()).total_seconds()
+            if _durdur.wait(max(min(kalan, KALP_ATISI_SN), 0)):
+                return False
+            self.kaydet()
+
+        is_.pencere_baslangic = datetime.datetime.now()
+        is_.penceredeki_istek = 0
+        return True
+
+    def calistir(self) -> str:
+        """
+        Koordinatı eksik eczaneleri kaldığı yerden itibaren işler.
+
+        Returns:
+            str: İşin son durumu (tamamlandi veya duraklatildi)
+        """
+        is_ = self.is_
+        kaynaklar = {k.ad: k for k in get_sources()}
+        if is_.baslangic is None:
+            is_.baslangic = datetime.datetime.now()
+
+        while True:
+            eczaneler = self.db.execute(
+                select(EczaneModel)
+                .where(_eksik_koordinat(), EczaneModel.id > is_.son_eczane_id)
+                .order_by(EczaneModel.id)
+                .limit(settings.GEOCODE_BACKFILL_BATCH_SIZE)
+            ).scalars().all()
+            if not eczaneler:
+                return "tamamlandi"
+
+            for eczane in eczaneler:
+                if _durdur.is_set() or not self.butce_bekle():
+                    return "duraklatildi"
+
+                with count_provider_calls() as sayac:
+                    koordinatlar = locate_pharmacy(eczane, kaynaklar)
+                is_.penceredeki_istek += sayac.sayi
+                is_.saglayici_istekleri += sayac.sayi
+
+                is_.islenen += 1
+                is_.son_eczane_id = eczane.id
+                if koordinatlar:
+                    eczane.latitude, eczane.longitude = koordinatlar
+                    is_.bulunan += 1
+                    self.degisen += 1
+                else:
+                    is_.bulunamayan += 1
+
+            self.kaydet()
+            logger.info(
+                f"Koordinat tamamlama işi #{is_.id}: {is_.islenen}/{is_.toplam} işlendi, "
+                f"{is_.bulunan} bulundu, {is_.saglayici_istekleri} sağlayıcı isteği"
+            )
+
+
+def _calistir(is_id: int):
+    """İşi çalıştırır ve son durumunu kaydeder."""
+    db = SessionLocal()
+    try:
+        calistirici = _IsCalistirici(db, db.get(KoordinatTamamlamaIsi, is_id))
+        durum = calistirici.calistir()
+        is_ = calistirici.is_
+        is_.durum = durum
+        if durum == "tamamlandi":
+            is_.bitis = datetime.datetime.now()
+            is_.toplam = is_.islenen
+        calistirici.kaydet()
+        logger.info(
+            f"Koordinat tamamlama işi #{is_id} {durum}: {is_.bulunan} bulundu, {is_.bulunamayan} bulunamadı"
+        )
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Koordinat tamamlama işi #{is_id} hatası: {str(e)}")
+        db.execute(
+            update(KoordinatTamamlamaIsi)
+            .where(KoordinatTamamlamaIsi.id == is_id)
+            .values(durum="hata", mesaj=str(e), guncelleme=datetime.datetime.now(), bitis=datetime.datetime.now())
+        )
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,132 @@
+"""
+Eşzamanlı (asyncio) scraper motoru.
+
+Tüm kaynakların sayfaları tek bir `httpx.AsyncClient` üzerinden aynı anda
+indirilir. Aynı anda açık istek sayısı genelde `SCRAPER_MAX_CONCURRENCY`,
+sunucu başına `SCRAPER_MAX_PER_HOST` ile sınırlanır. İndirilen sayfaların
+ayrıştırılması ve veritabanına yazılması engelleyici (senkron) kod olduğu için
+`SCRAPER_PROCESS_WORKERS` thread'lik bir havuzda yapılır; böylece yavaş bir
+kaynağın işlenmesi diğer sayfaların indirilmesini bekletmez.
+
+Bir durdurma olayı (`durdur`) verilirse her kaynak, sayfası indirilmeden ve
+işlenmeden önce bu olayı kontrol eder; olay ayarlandıysa kaynak atlanır ve
+çalışması "durduruldu" mesajıyla kaydedilir. İşlenmekte olan sayfa yarıda
+kesilmez, yazması bitince çalışma sona erer.
+"""
+import asyncio
+import datetime
+import threading
+import time
+import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+
+from app.config import get_settings
+from app.database.schemas import ScraperKaynagi
+from app.scraper.parser import fetch_page_async
+from app.scraper.service import calisma_kaydet, process_page, son_basarili_calismalar, yeni_calisma
+from app.utils.metrics import SCRAPE_DURATION_SECONDS, SCRAPE_RUNS, SCRAPE_STAGE_SECONDS
+
+settings = get_settings()
+
+
+async def scrape_sources(kaynaklar: List[ScraperKaynagi],
+                         durdur: Optional[threading.Event] = None) -> Dict[str, str]:
+    """
+    Verilen kaynakları eşzamanlı olarak çeker, işler ve çalışmalarını kaydeder.
+
+    Args:
+        kaynaklar: Çalıştırılacak kaynaklar
+        durdur: Ayarlandığında henüz indirilmemiş veya işlenmemiş kaynakların atlanacağı olay
+
+    Returns:
+        Dict[str, str]: Kaynak adı -> çalışma durumu
+    """
+    loop = asyncio.get_running_loop()
+    baslangic = time.perf_counter()
+
+    # Son başarılı çalışmalar (koşullu istek başlıkları ve içerik özetleri) tek sorguda alınır
+    onceki_calismalar = await loop.run_in_executor(None, son_basarili_calismalar, [k.ad for k in kaynaklar])
+
+    genel_sinir = asyncio.Semaphore(settings.SCRAPER_MAX_CONCURRENCY)
+    sunucu_sinirlari = defaultdict(lambda: asyncio.Semaphore(settings.SCRAPER_MAX_PER_HOST))
+    limits = httpx.Limits(
+        max_connections=settings.SCRAPER_MAX_CONCURRENCY,
+        max_keepalive_connections=settings.SCRAPER_MAX_CONCURRENCY,
+    )
+
+    with ThreadPoolExecutor(max_workers=settings.SCRAPER_PROCESS_WORKERS, thread_name_prefix="scraper") as havuz:
+        async with httpx.AsyncClient(timeout=settings.SCRAPER_TIMEOUT, limits=limits, follow_redirects=True) as client:
+            durumlar = await asyncio.gather(*(
+                _kaynak_calistir(
+                    kaynak, client, havuz, genel_sinir, sunucu_sinirlari[urlparse(kaynak.url).netloc],
+                    onceki_calismalar.get(kaynak.ad), durdur,
+                )
+                for kaynak in kaynaklar
+            ))
+
+    logger.info(f"{len(kaynaklar)} kaynak {time.perf_counter() - baslangic:.2f} sn'de işlendi")
+    return {kaynak.ad: durum for kaynak, durum in zip(kaynaklar, durumlar)}
+
+
+def _durduruldu(durdur: Optional[threading.Event], kaynak: ScraperKaynagi, calisma) -> bool:
+    """Durdurma olayı ayarlandıysa çalışmayı "durduruldu" mesajıyla işaretler."""
+    if durdur is None or not durdur.is_set():
+        return False
+    logger.warning(f"[{kaynak.ad}] Çalışma durduruldu, kaynak atlanıyor.")
+    calisma.mesaj = "durduruldu"
+    return True
+
+
+async def _kaynak_calistir(kaynak, client, havuz, genel_sinir, sunucu_siniri, onceki, durdur=None) -> str:
+    """Tek bir kaynağın sayfasını indirir, thread havuzunda işler ve çalışmayı kaydeder."""
+    loop = asyncio.get_running_loop()
+    calisma = yeni_calisma(kaynak)
+    baslangic = time.perf_counter()
+
+    # Koşullu istek sadece aynı gün için kullanılır: yeni günde sayfa
+    # değişmemiş olsa da o günün nöbet kayıtlarının yazılması gerekir
+    ayni_gun = onceki is not None and onceki.tarih == calisma.tarih
+
+    try:
+        async with genel_sinir, sunucu_siniri:
+            if _durduruldu(durdur, kaynak, calisma):
+                return calisma.durum
+            with SCRAPE_STAGE_SECONDS.labels(kaynak.ad, "indirme").time():
+                sayfa = await fetch_page_async(
+                    client,
+                    kaynak.url,
+                    etag=onceki.etag if ayni_gun else None,
+                    last_modified=onceki.last_modified if ayni_gun else None,
+                )
+
+        if _durduruldu(durdur, kaynak, calisma):
+            return calisma.durum
+        return await loop.run_in_executor(havuz, process_page, kaynak, sayfa, calisma, onceki)
+
+    except httpx.HTTPError as e:
+        logger.error(f"[{kaynak.ad}] Web sayfasına erişilemiyor: {str(e)}")
+        calisma.mesaj = str(e) or type(e).__name__
+        return calisma.durum
+
+    except Exception as e:
+        logger.error(f"[{kaynak.ad}] Veri çekme ve kaydetme sırasında hata oluştu: {str(e)}")
+        logger.error(traceback.format_exc())
+        calisma.mesaj = str(e)
+        return calisma.durum
+
+    finally:
+        calisma.bitis = datetime.datetime.now()
+        await loop.run_in_executor(havuz, calisma_kaydet, calisma)
+        SCRAPE_DURATION_SECONDS.labels(kaynak.ad, calisma.durum).observe(time.perf_counter() - baslangic)
+        SCRAPE_RUNS.labels(kaynak.ad, calisma.durum).inc()
+
+
+def run_sources(kaynaklar: List[ScraperKaynagi], durdur: Optional[threading.Event] = None) -> Dict[str, str]:
+    """`scrape_sources` fonksiyonunu yeni bir event loop'ta çalıştırır (senkron kod için)."""
+    return asyncio.run(scrape_sources(kaynaklar, durdur))
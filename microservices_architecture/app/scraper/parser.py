@@ -1,109 +1,169 @@
 """
 HTML parsing işlemleri.
 """
-import requests
-from typing import List, Optional
-from bs4 import BeautifulSoup
+import hashlib
+import re
+from typing import Any, List, NamedTuple, Optional
 from loguru import logger
 
+from app.config import get_settings
 from app.database.schemas import ScraperEczane
+from app.scraper.backends import get_backend
+from app.utils.geocode import is_short_maps_url, parse_coordinates_from_url
+
+settings = get_settings()
+
+class SayfaYaniti(NamedTuple):
+    """İndirilen sayfa ve koşullu istek başlıkları."""
+    durum_kodu: int  # 200 veya 304 (Not Modified)
+    icerik: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+def fetch_page(url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> SayfaYaniti:
+    """
+    Web sayfasını koşullu istekle indirir.
+
+    Args:
+        url: Çekilecek web sayfasının URL'i
+        etag: Önceki yanıtın ETag başlığı (If-None-Match olarak gönderilir)
+        last_modified: Önceki yanıtın Last-Modified başlığı (If-Modified-Since olarak gönderilir)
+
+    Returns:
+        SayfaYaniti: Sayfa değişmediyse durum kodu 304 ve içerik boştur
+    """
+    # Zamanlanmış scraper httpx ile indirir (`fetch_page_async`); requests sadece burada gerekir
+    import requests
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    response = requests.get(url, headers=headers, timeout=settings.SCRAPER_TIMEOUT)
+    if response.status_code == 304:
+        return SayfaYaniti(304, b"", etag, last_modified)
+
+    response.raise_for_status()
+    return SayfaYaniti(
+        response.status_code,
+        response.content,
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified"),
+    )
+
+async def fetch_page_async(client: Any, url: str, etag: Optional[str] = None,
+                           last_modified: Optional[str] = None) -> SayfaYaniti:
+    """
+    Web sayfasını paylaşılan bir `httpx.AsyncClient` ile koşullu istekle indirir.
+
+    `fetch_page` ile aynı şekilde davranır; eşzamanlı scraper motoru tarafından kullanılır.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    response = await client.get(url, headers=headers)
+    if response.status_code == 304:
+        return SayfaYaniti(304, b"", etag, last_modified)
+
+    response.raise_for_status()
+    return SayfaYaniti(
+        response.status_code,
+        response.content,
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified"),
+    )
+
+def duty_list_hash(eczane_divleri: List[Any], backend: Any) -> str:
+    """
+    Sayfadaki görünür nöbet listesinin normalleştirilmiş HTML'inin SHA-256 özetini döndürür.
+
+    Sadece eczane öğeleri özetlenir; sayfanın geri kalanındaki (menü, duyurular,
+    zaman damgaları) değişiklikler özeti etkilemez.
+    """
+    ozet = hashlib.sha256()
+    for div in eczane_divleri:
+        ozet.update(re.sub(r"\s+", " ", backend.item_html(div)).strip().encode("utf-8"))
+        ozet.update(b"\n")
+    return ozet.hexdigest()
 
 def parse_eczane_data(url: str) -> List[ScraperEczane]:
     """
     Web sayfasından eczane verilerini çeker ve analiz eder.
-    
+
     Args:
         url: Çekilecek web sayfasının URL'i
-        
+
     Returns:
         List[ScraperEczane]: Çekilen eczane verilerinin listesi
     """
+    import requests
+
     try:
         # Web sayfasını indir
-        response = requests.get(url)
-        response.raise_for_status()
-        
+        sayfa = fetch_page(url)
+
         # HTML içeriğini analiz et
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Eczane bilgilerini içeren div'leri bul
-        eczane_divleri = soup.select('div.itemwrap[style*="display: block"]')
-        
-        eczaneler = []
-        
-        for div in eczane_divleri:
-            try:
-                # Bölge bilgisini al
-                bolge_div = div.select_one('div.tag.discount')
-                bolge = bolge_div.text.strip() if bolge_div else "Bilinmiyor"
-                
-                # Eczane adını al
-                isim_div = div.select_one('div.itemwrap_title')
-                isim = isim_div.text.strip() if isim_div else "Bilinmiyor"
-                
-                # Konum URL'sini al
-                konum_a = div.select_one('a[href*="maps"]')
-                konum_url = konum_a['href'] if konum_a else ""
-                
-                # Adres bilgisini al
-                adres_element = div.find_all('div', class_='itemwrap_position')
-                adres = ""
-                if adres_element and len(adres_element) > 0:
-                    for element in adres_element:
-                        fa_marker = element.find('i', class_='fa-map-marker')
-                        if fa_marker and fa_marker.parent:
-                            # i elementinin parent elementinin text içeriğini al
-                            adres = fa_marker.parent.get_text().strip()
-                            # fa-map-marker icon'unu içermeyecek şekilde metni düzenle
-                            adres = adres.replace('\n', ' ').strip()
-                            break
-                
-                # Telefon bilgisini al
-                telefon_a = div.select_one('div.itemwrap_position a[href*="tel:"]')
-                telefon = telefon_a.text.strip() if telefon_a else "Bilinmiyor"
-                
-                # Ek not bilgisi var mı kontrol et (örn: "Saat 20.00'a kadar nöbetçidir.")
-                not_div = div.select_one('div[style*="font-size: smaller"]')
-                not_bilgisi = not_div.text.strip() if not_div else ""
-                
-                # Google Maps URL'sinden koordinatları çıkarmaya çalış
-                lat, lon = None, None
-                if konum_url and "maps" in konum_url:
-                    try:
-                        from app.utils.geocode import get_coordinates_from_google_maps_url
-                        
-                        coords = get_coordinates_from_google_maps_url(konum_url)
-                        if coords:
-                            lat, lon = coords
-                            logger.debug(f"URL'den koordinatlar çıkarıldı: ({lat}, {lon})")
-                        else:
-                            logger.debug(f"URL'den koordinat çıkarılamadı: {konum_url}")
-                    except Exception as e:
-                        logger.warning(f"URL'den koordinat çıkarma hatası: {str(e)}")
-                
-                eczane = ScraperEczane(
-                    bolge=bolge,
-                    isim=isim,
-                    konum_url=konum_url,
-                    adres=adres,
-                    telefon=telefon,
-                    not_bilgisi=not_bilgisi,
-                    latitude=lat,
-                    longitude=lon
-                )
-                
-                eczaneler.append(eczane)
-                logger.debug(f"Eczane bilgisi çekildi: {isim}")
-                
-            except Exception as e:
-                logger.error(f"Eczane bilgisi çekilirken hata: {str(e)}")
-        
-        return eczaneler
-    
+        return parse_eczane_html(sayfa.icerik)
+
     except requests.exceptions.RequestException as e:
         logger.error(f"Web sayfasına erişilemiyor: {str(e)}")
         return []
-    
+
     except Exception as e:
         logger.error(f"Veri çekme sırasında hata oluştu: {str(e)}")
-        return []
\ No newline at end of file
+        return []
+
+def parse_eczane_html(content: bytes, backend: Optional[Any] = None) -> List[ScraperEczane]:
+    """
+    İndirilmiş HTML içeriğinden eczane verilerini çıkarır.
+
+    Args:
+        content: Sayfanın HTML içeriği
+        backend: Ayrıştırıcı arka ucu (verilmezse PARSER_BACKEND ayarındaki kullanılır)
+
+    Returns:
+        List[ScraperEczane]: Çekilen eczane verilerinin listesi
+    """
+    backend = backend or get_backend()
+
+    # Eczane bilgilerini içeren div'leri bul
+    eczane_divleri = backend.iter_items(content)
+
+    return parse_items(eczane_divleri, backend)
+
+def parse_items(eczane_divleri: List[Any], backend: Any) -> List[ScraperEczane]:
+    """
+    Arka ucun bulduğu eczane öğelerini ScraperEczane nesnelerine çevirir.
+    """
+    eczaneler = []
+
+    for div in eczane_divleri:
+        try:
+            alanlar = backend.parse_item(div)
+            konum_url = alanlar["konum_url"]
+
+            # Google Maps URL'sinden koordinatları çıkarmaya çalış
+            # (kısaltılmış bağlantılar burada değil, ayrı bir aşamada toplu çözülür)
+            lat, lon = None, None
+            if konum_url and "maps" in konum_url and not is_short_maps_url(konum_url):
+                coords = parse_coordinates_from_url(konum_url)
+                if coords:
+                    lat, lon = coords
+                    logger.debug(f"URL'den koordinatlar çıkarıldı: ({lat}, {lon})")
+                else:
+                    logger.debug(f"URL'den koordinat çıkarılamadı: {konum_url}")
+
+            eczane = ScraperEczane(**alanlar, latitude=lat, longitude=lon)
+
+            eczaneler.append(eczane)
+            logger.debug(f"Eczane bilgisi çekildi: {eczane.isim}")
+
+        except Exception as e:
+            logger.error(f"Eczane bilgisi çekilirken hata: {str(e)}")
+
+    return eczaneler
@@ -1,35 +1,313 @@
 """
 Zamanlama işlemleri.
+
+Günlük çalışmalar (ana saat ve `SCRAPE_EXTRA_WINDOWS` ek pencereleri) her
+başlangıçta ayarlardan yeniden oluşturulur. Veri çekilemeyen kaynaklar için
+üstel artan ve rastgele dağıtılan (jitter) aralıklarla yeniden deneme job'ları
+kurulur; bu job'lar `SCHEDULER_JOBSTORE=veritabani` ise veritabanında
+(`apscheduler_jobs`) saklanır ve süreç yeniden başlasa da çalışır. Süreç
+kapalıyken kaçırılan çalışmalar başlangıçta `scrape_calismalari` kayıtlarına
+bakılarak telafi edilir.
+
+Birden fazla scraper kopyası çalışıyorsa zamanlayıcıyı sadece lider kilidini
+tutan kopya çalıştırır (`run_leader_scheduler`, bkz. `app.database.locks`);
+diğerleri yedekte bekler ve lider durunca devralır. Liderlik kaybedilince
+süren scrape kaynak ve sayfa aralarında durdurulur ve kilit, zamanlayıcının
+çalışan job'ları bitene kadar beklendikten sonra bırakılır.
 """
+import datetime
+import random
+import threading
+from typing import Dict, List, Optional
+
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import BaseScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
 from loguru import logger
 
-from app.scraper.service import scrape_and_save
+from app.config import get_settings
+from app.database.locks import DatabaseLock
+from app.scraper.backfill import resume_backfill, start_backfill, stop_backfill
+from app.scraper.service import scrape_and_save, son_basarili_calismalar
+from app.scraper.sources import get_active_sources, last_scheduled_scrape, scrape_times
+from app.utils.metrics import export_metrics
+
+settings = get_settings()
+
+# Yeniden denenecek çalışma durumları
+YENIDEN_DENENECEK = ("veri_yok", "hata")
+
+# Yeniden deneme job'larının saklandığı jobstore
+KALICI_JOBSTORE = "kalici"
+
+# Zamanlayıcıyı sadece bu kilidi tutan scraper kopyası çalıştırır
+LIDER_KILIDI = "scraper_lider"
+
+# Farklı job'lardan gelen çalışmalar üst üste binmesin
+_calisma_kilidi = threading.Lock()
+
+# Liderlik kaybedilince veya süreç kapanırken ayarlanır: süren scrape durur, ana döngü uyanır
+_durdur = threading.Event()
+
+_scheduler: Optional[BaseScheduler] = None
 
-def setup_scheduler(hour: int, minute: int) -> BackgroundScheduler:
+
+def retry_delay(deneme: int) -> float:
     """
-    Belirtilen saat ve dakikada çalışacak bir scheduler oluşturur.
-    
+    Yeniden denemeden önceki bekleme süresini (saniye) döndürür.
+
+    Süre her denemede iki katına çıkar (`SCRAPE_RETRY_MAX_SECONDS` ile
+    sınırlı) ve üst sınırın yarısı ile tamamı arasında rastgele seçilir;
+    böylece aynı anda düşen kaynaklar siteye aynı anda dönmez.
+
     Args:
-        hour: Çalışma saati (24 saat formatında)
-        minute: Çalışma dakikası
-        
+        deneme: Kaçıncı yeniden deneme (0'dan başlar)
+    """
+    ust_sinir = min(settings.SCRAPE_RETRY_MAX_SECONDS, settings.SCRAPE_RETRY_BASE_SECONDS * 2 ** deneme)
+    return random.uniform(ust_sinir / 2, ust_sinir)
+
+
+def _tekrar_job_id(kaynak_adi: str) -> str:
+    return f"scrape_tekrar_{kaynak_adi}"
+
+
+def scheduled_scrape(kaynak_adlari: List[str], deneme: int = 0) -> Dict[str, str]:
+    """
+    Zamanlayıcı job'larının çalıştırdığı scrape.
+
+    Çalışmalar sırayla yürütülür. Veri çekilemeyen (veri_yok, hata)
+    kaynaklar için bir sonraki yeniden deneme kurulur, başarılı kaynakların
+    bekleyen yeniden denemeleri iptal edilir. Zamanlayıcı durdurulurken
+    çalışma yarıda kesildiyse yeniden denemelere dokunulmaz; kaçırılan
+    kaynakları bir sonraki lider telafi eder.
+
+    Args:
+        kaynak_adlari: Çalıştırılacak kaynakların adları
+        deneme: Bu çalışmanın kaçıncı yeniden deneme olduğu (ilk çalışma 0)
+
     Returns:
-        BackgroundScheduler: Ayarlanmış scheduler nesnesi
-    """
-    scheduler = BackgroundScheduler()
-    
-    # Her gün belirtilen saatte çalışacak job ekle
-    scheduler.add_job(
-        scrape_and_save,
-        'cron',
-        hour=hour,
-        minute=minute,
-        id='daily_scrape',
+        Dict[str, str]: Kaynak adı -> çalışma durumu
+    """
+    with _calisma_kilidi:
+        try:
+            durumlar = scrape_and_save(kaynak_adlari, _durdur)
+        except Exception as e:
+            logger.error(f"Zamanlanmış veri çekme işlemi başarısız: {str(e)}")
+            durumlar = {ad: "hata" for ad in kaynak_adlari}
+
+    if _durdur.is_set():
+        return durumlar
+
+    for ad, durum in sorted(durumlar.items()):
+        if durum in YENIDEN_DENENECEK:
+            _yeniden_dene(ad, deneme)
+        else:
+            _yeniden_denemeyi_iptal_et(ad)
+    return durumlar
+
+
+def _yeniden_dene(kaynak_adi: str, deneme: int):
+    """Kaynak için `deneme + 1`. yeniden denemeyi kurar; deneme hakkı bittiyse sadece loglar."""
+    if _scheduler is None:
+        return
+    if deneme >= settings.SCRAPE_RETRY_ATTEMPTS:
+        logger.error(f"[{kaynak_adi}] {deneme} yeniden denemeden sonra da veri çekilemedi, bir sonraki planlı çalışma beklenecek.")
+        return
+
+    gecikme = retry_delay(deneme)
+    _scheduler.add_job(
+        scheduled_scrape,
+        'date',
+        args=[[kaynak_adi], deneme + 1],
+        run_date=datetime.datetime.now() + datetime.timedelta(seconds=gecikme),
+        id=_tekrar_job_id(kaynak_adi),
+        jobstore=KALICI_JOBSTORE,
         replace_existing=True,
-        misfire_grace_time=60  # 1 dakikalık gecikme toleransı
     )
-    
-    logger.info(f"Scheduler ayarlandı. Her gün saat {hour}:{minute:02d}'de çalışacak.")
-    
-    return scheduler
\ No newline at end of file
+    logger.warning(f"[{kaynak_adi}] Veri çekilemedi, {deneme + 1}. yeniden deneme {gecikme:.0f} sn sonra.")
+
+
+def _yeniden_denemeyi_iptal_et(kaynak_adi: str):
+    """Kaynağın bekleyen yeniden denemesini (varsa) kaldırır."""
+    if _scheduler is None:
+        return
+    try:
+        _scheduler.remove_job(_tekrar_job_id(kaynak_adi), jobstore=KALICI_JOBSTORE)
+    except JobLookupError:
+        return
+    logger.info(f"[{kaynak_adi}] Bekleyen yeniden deneme iptal edildi.")
+
+
+def catch_up_missed_scrapes(simdi: Optional[datetime.datetime] = None) -> Dict[str, str]:
+    """
+    Son planlı çalışmasından beri başarılı çalışması olmayan kaynakları çalıştırır.
+
+    Süreç planlı saatte kapalıysa veya site o saatte yanıt vermediyse günün
+    listesi bir sonraki güne kadar kaçırılmaz. Hiç çalışması olmayan
+    kaynaklar da (ilk kurulum) çalıştırılır.
+
+    Returns:
+        Dict[str, str]: Kaynak adı -> çalışma durumu (telafi gerekmediyse boş)
+    """
+    simdi = simdi or datetime.datetime.now()
+    kaynaklar = get_active_sources()
+    son_calismalar = son_basarili_calismalar([k.ad for k in kaynaklar])
+
+    kacirilan = [
+        k.ad for k in kaynaklar
+        if k.ad not in son_calismalar or son_calismalar[k.ad].baslangic < last_scheduled_scrape(k, simdi)
+    ]
+    if not kacirilan:
+        logger.info("Kaçırılan planlı çalışma yok.")
+        return {}
+
+    logger.info(f"Kaçırılan planlı çalışmalar telafi ediliyor: {', '.join(kacirilan)}")
+    return scheduled_scrape(kacirilan)
+
+
+def _jobstorelar() -> dict:
+    """Günlük job'lar her başlangıçta ayarlardan kurulduğu için bellekte, yeniden denemeler ayara göre veritabanında."""
+    from apscheduler.jobstores.memory import MemoryJobStore
+
+    if settings.SCHEDULER_JOBSTORE != "veritabani":
+        return {"default": MemoryJobStore(), KALICI_JOBSTORE: MemoryJobStore()}
+
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+    from app.database.connection import get_engine
+
+    return {"default": MemoryJobStore(), KALICI_JOBSTORE: SQLAlchemyJobStore(engine=get_engine())}
+
+
+def setup_scheduler(hour: int, minute: int, blocking: bool = False) -> BaseScheduler:
+    """
+    Aktif kaynaklar için günlük çalışacak bir scheduler oluşturur.
+
+    Aynı saatte çalışacak kaynaklar tek bir job'da toplanır ve eşzamanlı
+    scraper motoruyla birlikte çekilir. Her job'un aynı anda tek örneği
+    çalışır; yavaş bir çalışma sürerken zamanı gelen çalışma atlanır.
+
+    Args:
+        hour: Kendi saati tanımlanmamış kaynaklar için çalışma saati (24 saat formatında)
+        minute: Kendi dakikası tanımlanmamış kaynaklar için çalışma dakikası
+        blocking: True ise `start()` çağıran thread'i bloklayan scheduler döner
+
+    Returns:
+        BaseScheduler: Ayarlanmış scheduler nesnesi
+    """
+    global _scheduler
+
+    sinif = BlockingScheduler if blocking else BackgroundScheduler
+    scheduler = sinif(
+        jobstores=_jobstorelar(),
+        job_defaults={
+            "coalesce": True,  # Kaçırılan birden fazla çalışma tek çalışmaya indirgenir
+            "max_instances": 1,
+            "misfire_grace_time": settings.SCRAPE_MISFIRE_GRACE_SECONDS,
+        },
+    )
+    _scheduler = scheduler
+
+    # Kaynakları çalışma saatlerine (ek pencereler dahil) göre grupla
+    gruplar = {}
+    for kaynak in get_active_sources():
+        for saat, dakika in scrape_times(kaynak, hour, minute):
+            gruplar.setdefault((saat, dakika), []).append(kaynak.ad)
+
+    # Her saat grubu için her gün çalışacak job ekle
+    for (saat, dakika), adlar in sorted(gruplar.items()):
+        scheduler.add_job(
+            scheduled_scrape,
+            'cron',
+            args=[adlar],
+            hour=saat,
+            minute=dakika,
+            id=f'daily_scrape_{saat:02d}{dakika:02d}',
+            replace_existing=True,
+        )
+        logger.info(f"Scheduler ayarlandı. Her gün saat {saat}:{dakika:02d}'de çalışacak: {', '.join(adlar)}")
+
+    # Koordinatı eksik eczaneleri yoğun olmayan saatte geocode et
+    if settings.GEOCODE_BACKFILL_SCHEDULED:
+        scheduler.add_job(
+            start_backfill,
+            'cron',
+            args=["zamanlayici"],
+            hour=settings.GEOCODE_BACKFILL_HOUR,
+            minute=settings.GEOCODE_BACKFILL_MINUTE,
+            id='geocode_backfill',
+            replace_existing=True,
+            misfire_grace_time=3600
+        )
+        logger.info(
+            f"Koordinat tamamlama işi her gün saat "
+            f"{settings.GEOCODE_BACKFILL_HOUR}:{settings.GEOCODE_BACKFILL_MINUTE:02d}'de başlatılacak."
+        )
+
+    return scheduler
+
+
+def _liderligi_yenile(kilit: DatabaseLock):
+    """
+    Lider kilidini yeniler; kilit kaybedildiyse süren scrape'i durdurur ve ana döngüyü uyandırır.
+
+    Zamanlayıcı burada (job thread'inde) kapatılmaz: çalışan job'ların
+    bitmesini `run_leader_scheduler` bekler.
+    """
+    if kilit.renew():
+        return
+    logger.error("Lider kilidi kaybedildi, zamanlayıcı durduruluyor.")
+    export_metrics()
+    _durdur.set()
+
+
+def run_leader_scheduler(hour: int, minute: int):
+    """
+    Lider kilidini bekler, alınca zamanlayıcıyı çalıştırır; çağıran thread'i bloklar.
+
+    Lider kilidi `LEADER_HEARTBEAT_SECONDS` aralıklarla yenilenir. Kilit
+    kaybedilirse (ör. veritabanı bağlantısı koptuysa) süren scrape kaynak ve
+    sayfa aralarında durdurulur, zamanlayıcı çalışan job'lar bitene kadar
+    beklenerek kapatılır ve süreç ancak bundan sonra kilidi bırakıp yeniden
+    yedeğe geçer; böylece başka bir kopya devraldığında arkada çalışmaya
+    devam eden bir scrape kalmaz. Süreç kapanırken (SIGTERM, Ctrl+C) de aynı
+    sıra izlenir. Yeni lider başlarken kaçırılan çalışmaları telafi eder ve
+    yarım kalan koordinat tamamlama işini sürdürür.
+
+    Args:
+        hour: Kendi saati tanımlanmamış kaynaklar için çalışma saati
+        minute: Kendi dakikası tanımlanmamış kaynaklar için çalışma dakikası
+    """
+    kilit = DatabaseLock(LIDER_KILIDI)
+    while True:
+        _durdur.clear()
+        logger.info(f"Lider kilidi bekleniyor ({kilit.sahip})...")
+        kilit.acquire(settings.LEADER_RETRY_SECONDS)
+        logger.info(f"Lider kilidi alındı ({kilit.sahip}), zamanlayıcı başlatılıyor.")
+        export_metrics()
+
+        scheduler = setup_scheduler(hour, minute)
+        # Süreç kapalıyken (veya lider yokken) kaçırılan planlı çalışmaları scheduler başlar başlamaz çek
+        scheduler.add_job(catch_up_missed_scrapes, id="scrape_telafi", replace_existing=True)
+        scheduler.add_job(
+            _liderligi_yenile,
+            'interval',
+            args=[kilit],
+            seconds=settings.LEADER_HEARTBEAT_SECONDS,
+            id="lider_kilidi",
+            replace_existing=True,
+        )
+        # Yeniden başlatmadan önce yarım kalan koordinat tamamlama işini sürdür
+        resume_backfill()
+
+        scheduler.start()
+        try:
+            # Zamanlayıcı arka planda çalışır; ana thread liderlik kaybını veya kapanma sinyalini bekler
+            _durdur.wait()
+        finally:
+            _durdur.set()
+            logger.info("Zamanlayıcı durduruluyor, çalışan job'lar bekleniyor...")
+            scheduler.shutdown(wait=True)
+            stop_backfill()
+            kilit.release()
+            export_metrics()
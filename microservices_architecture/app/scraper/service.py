@@ -2,111 +2,447 @@
 Scraper ana işlevsellik.
 """
 import datetime
+import threading
+import time
 import traceback
-from typing import List
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 from loguru import logger
 
 from app.config import get_settings
 from app.database.connection import SessionLocal
-from app.database.models import Eczane as EczaneModel, NobetciEczane as NobetciEczaneModel
-from app.database.schemas import ScraperEczane
-from app.scraper.parser import parse_eczane_data
+from app.database.models import Eczane as EczaneModel, NobetciEczane as NobetciEczaneModel, ScrapeCalismasi
+from app.database.schemas import ScraperEczane, ScraperKaynagi
+from app.database.snapshots import build_snapshot
+from app.database.statistics import decrement_duty_stats, increment_duty_stats
+from app.database.version import bump_data_version
+from app.scraper.backends import get_backend
+from app.scraper.parser import SayfaYaniti, duty_list_hash, parse_items
+from app.scraper.sources import get_active_sources
+from app.scraper.writer import (
+    bulk_upsert, conflict_free_insert, delete_dropped_duties, has_changes, new_write_stats, pharmacy_field_changes,
+    pharmacy_fingerprint, record_scrape_diff,
+)
+from app.utils.metrics import SCRAPE_STAGE_SECONDS, export_metrics, observe_write_stats
 
 settings = get_settings()
 
-def scrape_and_save():
+def scrape_and_save(kaynak_adlari: Optional[List[str]] = None,
+                    durdur: Optional[threading.Event] = None) -> Dict[str, str]:
     """
-    Web sitesinden nöbetçi eczane bilgilerini çeker ve veritabanına kaydeder.
+    Kaynak sayfalarından nöbetçi eczane bilgilerini çeker ve veritabanına kaydeder.
+    
+    Tüm kaynaklar `app.scraper.engine` içindeki eşzamanlı motorla indirilir.
+    Aynı gün içindeki tekrar çalışmalarda sayfalar koşullu istekle (If-None-Match /
+    If-Modified-Since) indirilir. Sunucu 304 döndürürse veya nöbet listesinin
+    içerik özeti son başarılı çalışmayla aynıysa ayrıştırma, geocoding ve
+    veritabanı yazma adımları atlanır ve çalışma "degisiklik_yok" olarak kaydedilir.
+    
+    Args:
+        kaynak_adlari: Çalıştırılacak kaynakların adları (verilmezse tüm aktif kaynaklar)
+        durdur: Ayarlanırsa henüz indirilmemiş veya işlenmemiş kaynaklar atlanır
+            ("hata" durumu, "durduruldu" mesajı); işlenmekte olan sayfa tamamlanır
+    
+    Returns:
+        Dict[str, str]: Kaynak adı -> çalışma durumu (basarili, degisiklik_yok, veri_yok, hata)
     """
+    from app.scraper.engine import run_sources
+    
+    kaynaklar = get_active_sources(kaynak_adlari)
+    if not kaynaklar:
+        logger.warning("Çalıştırılacak aktif kaynak yok.")
+        return {}
+    
+    logger.info(f"Veri çekme işlemi başlatılıyor ({len(kaynaklar)} kaynak)...")
+    durumlar = run_sources(kaynaklar, durdur)
+    
+    ozet = {}
+    for durum in durumlar.values():
+        ozet[durum] = ozet.get(durum, 0) + 1
+    logger.info(f"Veri çekme işlemi tamamlandı: {ozet}")
+    
+    # Yeni veri yazıldıysa günün nöbet listesi anlık görüntüsünü hazırla
+    if ozet.get("basarili"):
+        _anlik_goruntu_olustur(datetime.date.today())
+    
+    geocode_istatistik = get_geocode_cache_stats()
+    logger.info(
+        f"Geocode önbelleği: {geocode_istatistik['isabet']} isabet, "
+        f"{geocode_istatistik['negatif_isabet']} negatif isabet, "
+        f"{geocode_istatistik['iskalama']} ıskalama, "
+        f"sağlayıcı çağrıları: {geocode_istatistik['saglayici_cagrilari']}"
+    )
+    export_metrics()
+    return durumlar
+
+
+def _anlik_goruntu_olustur(tarih: datetime.date):
+    """Tarihin nöbet listesi anlık görüntüsünü oluşturur; hata olursa sadece loglar."""
+    db = SessionLocal()
     try:
-        logger.info("Veri çekme işlemi başlatılıyor...")
+        build_snapshot(db, tarih)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"{tarih} anlık görüntüsü oluşturulamadı: {str(e)}")
+    finally:
+        db.close()
+
+
+def yeni_calisma(kaynak: ScraperKaynagi) -> ScrapeCalismasi:
+    """Kaynak için "hata" durumunda başlayan yeni bir çalışma kaydı oluşturur."""
+    return ScrapeCalismasi(
+        kaynak=kaynak.ad, tarih=datetime.date.today(), durum="hata", baslangic=datetime.datetime.now()
+    )
+
+
+def process_page(kaynak: ScraperKaynagi, sayfa: SayfaYaniti, calisma: ScrapeCalismasi,
+                 onceki: Optional[ScrapeCalismasi]) -> str:
+    """
+    İndirilmiş sayfayı işler: değişiklik kontrolü, ayrıştırma, koordinatlar ve kayıt.
+    
+    Args:
+        kaynak: Sayfanın kaynağı
+        sayfa: İndirilen sayfa (koşullu istek yanıtı)
+        calisma: Sonuçların yazılacağı çalışma kaydı
+        onceki: Kaynağın son başarılı çalışması (yoksa None)
+    
+    Returns:
+        str: Çalışma durumu
+    """
+    ayni_gun = onceki is not None and onceki.tarih == calisma.tarih
+    calisma.etag = sayfa.etag
+    calisma.last_modified = sayfa.last_modified
+    
+    if sayfa.durum_kodu == 304:
+        logger.info(f"[{kaynak.ad}] Sayfa son çalışmadan beri değişmemiş (304), işlem atlanıyor.")
+        calisma.icerik_hash = onceki.icerik_hash
+        calisma.eczane_sayisi = onceki.eczane_sayisi
+        calisma.durum = "degisiklik_yok"
+        return calisma.durum
+    
+    ayristirma = SCRAPE_STAGE_SECONDS.labels(kaynak.ad, "ayristirma")
+    baslangic = time.perf_counter()
+    backend = get_backend(kaynak.parser)
+    eczane_divleri = backend.iter_items(sayfa.icerik)
+    calisma.icerik_hash = duty_list_hash(eczane_divleri, backend)
+    
+    if ayni_gun and onceki.icerik_hash == calisma.icerik_hash:
+        ayristirma.observe(time.perf_counter() - baslangic)
+        logger.info(f"[{kaynak.ad}] Nöbet listesi son çalışmadan beri değişmemiş, işlem atlanıyor.")
+        calisma.eczane_sayisi = onceki.eczane_sayisi
+        calisma.durum = "degisiklik_yok"
+        return calisma.durum
+    
+    eczane_verileri = parse_items(eczane_divleri, backend)
+    ayristirma.observe(time.perf_counter() - baslangic)
+    
+    # Veri yoksa işlemi durdur
+    if not eczane_verileri:
+        logger.warning(f"[{kaynak.ad}] Çekilecek veri bulunamadı.")
+        calisma.durum = "veri_yok"
+        return calisma.durum
+    
+    logger.info(f"[{kaynak.ad}] {len(eczane_verileri)} adet eczane verisi çekildi.")
+    calisma.eczane_sayisi = len(eczane_verileri)
+    
+    # Kısaltılmış konum bağlantılarını eşzamanlı çöz
+    with SCRAPE_STAGE_SECONDS.labels(kaynak.ad, "kisa_linkler").time():
+        resolve_short_links(eczane_verileri)
+    
+    # Veritabanına kaydet
+    istatistik = save_to_database(eczane_verileri, kaynak)
+    observe_write_stats(kaynak.ad, istatistik)
+    
+    if not has_changes(istatistik):
+        logger.info(f"[{kaynak.ad}] Sayfa değişmiş ama kayıtlı verilerde değişiklik yok.")
+        calisma.durum = "degisiklik_yok"
+        return calisma.durum
+    
+    logger.info(f"[{kaynak.ad}] Veri çekme ve kaydetme işlemi tamamlandı.")
+    calisma.durum = "basarili"
+    return calisma.durum
+
+
+def son_basarili_calismalar(kaynak_adlari: List[str]) -> Dict[str, ScrapeCalismasi]:
+    """
+    Kaynakların en son başarılı (veya değişiklik bulunmayan) çalışmalarını tek sorguda döndürür.
+    
+    Returns:
+        Dict[str, ScrapeCalismasi]: Kaynak adı -> çalışma (hiç çalışması olmayan kaynaklar yer almaz)
+    """
+    db = SessionLocal()
+    try:
+        son_idler = db.query(func.max(ScrapeCalismasi.id)).filter(
+            ScrapeCalismasi.kaynak.in_(kaynak_adlari),
+            ScrapeCalismasi.durum.in_(["basarili", "degisiklik_yok"])
+        ).group_by(ScrapeCalismasi.kaynak)
+        calismalar = db.query(ScrapeCalismasi).filter(ScrapeCalismasi.id.in_(son_idler.scalar_subquery())).all()
+        return {c.kaynak: c for c in calismalar}
+    finally:
+        db.close()
+
+
+def calisma_kaydet(calisma: ScrapeCalismasi):
+    """Çalışma kaydını veritabanına yazar; hata olursa sadece loglar."""
+    db = SessionLocal()
+    try:
+        db.add(calisma)
+        db.commit()
+        logger.info(f"[{calisma.kaynak}] Scrape çalışması kaydedildi: {calisma.durum}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Scrape çalışması kaydedilemedi: {str(e)}")
+    finally:
+        db.close()
+
+
+from app.utils.geocode import (
+    geocode_address, geocode_addresses, get_geocode_cache_stats, is_short_maps_url, resolve_short_urls
+)
+
+def resolve_short_links(eczane_verileri: List[ScraperEczane]):
+    """
+    Koordinatı eksik eczanelerin kısaltılmış konum bağlantılarını eşzamanlı
+    olarak çözer ve bulunan koordinatları eczane verilerine yazar.
+    """
+    eksikler = [
+        e for e in eczane_verileri
+        if not (e.latitude and e.longitude) and is_short_maps_url(e.konum_url)
+    ]
+    if not eksikler:
+        return
+    
+    baslangic = time.perf_counter()
+    koordinatlar = resolve_short_urls(e.konum_url for e in eksikler)
+    
+    bulunan = 0
+    for eczane_veri in eksikler:
+        sonuc = koordinatlar.get(eczane_veri.konum_url)
+        if sonuc:
+            eczane_veri.latitude, eczane_veri.longitude = sonuc
+            bulunan += 1
+    
+    logger.info(
+        f"{len(koordinatlar)} kısaltılmış bağlantı çözüldü, {bulunan} eczane için koordinat bulundu "
+        f"({time.perf_counter() - baslangic:.2f} sn)"
+    )
+
+def _koordinatlari_urlden_tamamla(eczane_veri: ScraperEczane) -> bool:
+    """
+    Koordinatı eksik olan eczane verisi için konum URL'sinden koordinat çıkarır.
+    
+    Returns:
+        bool: Eczane verisinde koordinat var mı
+    """
+    if eczane_veri.latitude and eczane_veri.longitude:
+        return True
+    
+    if eczane_veri.konum_url:
+        from app.utils.geocode import get_coordinates_from_google_maps_url
+        koordinatlar = get_coordinates_from_google_maps_url(eczane_veri.konum_url)
+        if koordinatlar:
+            eczane_veri.latitude, eczane_veri.longitude = koordinatlar
+            logger.info(f"{eczane_veri.isim} için konum URL'sinden koordinatlar çıkarıldı: {koordinatlar}")
+            return True
+    
+    return False
+
+def _koordinatlari_tamamla(eczane_veri: ScraperEczane, sehir: str = "Edremit", ulke: str = "Turkey"):
+    """
+    Koordinatı eksik olan eczane verisi için konum URL'sinden veya adresten koordinat bulur.
+    """
+    if _koordinatlari_urlden_tamamla(eczane_veri):
+        return
+    
+    # Konum URL'sinden çıkarılamazsa, adresten geocoding dene
+    koordinatlar = None
+    if eczane_veri.adres:
+        logger.info(f"{eczane_veri.isim} için adresle geocoding deneniyor...")
+        koordinatlar = geocode_address(eczane_veri.adres, sehir, ulke)
         
-        # Web sitesinden veri çek
-        eczane_verileri = parse_eczane_data(settings.SCRAPER_URL)
+    if koordinatlar:
+        eczane_veri.latitude, eczane_veri.longitude = koordinatlar
+        logger.info(f"Koordinatlar alındı: ({eczane_veri.latitude}, {eczane_veri.longitude})")
+    else:
+        logger.warning(f"{eczane_veri.isim} için koordinatlar bulunamadı")
+
+def _koordinatlari_toplu_tamamla(eczane_verileri: List[ScraperEczane], sehir: str = "Edremit",
+                                 ulke: str = "Turkey"):
+    """
+    Koordinatı eksik olan tüm eczaneler için önce konum URL'lerini dener,
+    kalan adresleri tek seferde geocoding worker'ına gönderir.
+    """
+    eksikler = [e for e in eczane_verileri if not _koordinatlari_urlden_tamamla(e)]
+    if not eksikler:
+        return
+    
+    logger.info(f"{len(eksikler)} eczane için adresle geocoding deneniyor...")
+    koordinatlar = geocode_addresses({e.adres for e in eksikler if e.adres}, sehir, ulke)
+    
+    for eczane_veri in eksikler:
+        sonuc = koordinatlar.get(eczane_veri.adres) if eczane_veri.adres else None
+        if sonuc:
+            eczane_veri.latitude, eczane_veri.longitude = sonuc
+            logger.info(f"{eczane_veri.isim} için koordinatlar alındı: ({eczane_veri.latitude}, {eczane_veri.longitude})")
+        else:
+            logger.warning(f"{eczane_veri.isim} için koordinatlar bulunamadı")
+
+def save_to_database(eczane_verileri: List[ScraperEczane],
+                     kaynak: Optional[ScraperKaynagi] = None) -> Dict[str, Any]:
+    """
+    Çekilen eczane verilerini veritabanına kaydeder.
+    
+    `BULK_WRITE` ayarı açıksa tüm kayıtlar tek işlemde toplu yazılır,
+    kapalıysa eski satır satır yazma yolu kullanılır. İki yolda da sadece
+    yeni ve değişen kayıtlar yazılır, kaynağın listesinden çıkan eczanelerin
+    bugünkü nöbetleri silinir ve değişiklikler `scrape_farklari` tablosuna
+    kaydedilir (bkz. `app.scraper.writer`).
+    
+    Args:
+        eczane_verileri: Çekilen eczane verileri
+        kaynak: Verilerin kaynağı; eczaneler bu kaynağın adıyla etiketlenir ve
+            adresler kaynağın şehir/ülkesiyle geocode edilir (verilmezse Edremit)
+    
+    Returns:
+        Dict[str, Any]: Eklenen/güncellenen/silinen/değişmeyen satır sayıları ve süreler
+    """
+    if settings.BULK_WRITE:
+        return save_to_database_bulk(eczane_verileri, kaynak)
+    return _save_row_by_row(eczane_verileri, kaynak)
+
+def save_to_database_bulk(eczane_verileri: List[ScraperEczane],
+                          kaynak: Optional[ScraperKaynagi] = None) -> Dict[str, Any]:
+    """
+    Çekilen eczane verilerini tek bir transaction içinde toplu olarak kaydeder.
+    """
+    db = SessionLocal()
+    try:
+        bugun = datetime.date.today()
+        logger.info(f"Bugünün tarihi: {bugun}")
+        toplam_baslangic = time.perf_counter()
         
-        # Veri yoksa işlemi durdur
-        if not eczane_verileri:
-            logger.warning("Çekilecek veri bulunamadı.")
-            return
+        baslangic = time.perf_counter()
+        if kaynak:
+            _koordinatlari_toplu_tamamla(eczane_verileri, kaynak.sehir, kaynak.ulke)
+        else:
+            _koordinatlari_toplu_tamamla(eczane_verileri)
+        koordinat_suresi = time.perf_counter() - baslangic
         
-        logger.info(f"{len(eczane_verileri)} adet eczane verisi çekildi.")
+        istatistik = bulk_upsert(db, eczane_verileri, bugun, kaynak.ad if kaynak else None)
         
-        # Veritabanına kaydet
-        save_to_database(eczane_verileri)
+        # API önbelleklerinin geçersiz kılınması için veri sürümünü aynı transaction'da artır
+        if has_changes(istatistik):
+            bump_data_version(db)
         
-        logger.info("Veri çekme ve kaydetme işlemi tamamlandı.")
+        baslangic = time.perf_counter()
+        db.commit()
+        istatistik["sureler"]["koordinatlar"] = koordinat_suresi
+        istatistik["sureler"]["commit"] = time.perf_counter() - baslangic
+        istatistik["sureler"]["toplam"] = time.perf_counter() - toplam_baslangic
         
+        logger.info(
+            f"Toplu yazma tamamlandı: {istatistik['eczane_eklenen']} eczane eklendi, "
+            f"{istatistik['eczane_guncellenen']} eczane güncellendi, "
+            f"{istatistik['nobet_eklenen']} nöbet eklendi, "
+            f"{istatistik['nobet_guncellenen']} nöbet güncellendi, "
+            f"{istatistik['nobet_silinen']} nöbet silindi, "
+            f"{istatistik['eczane_degismeyen']} eczane değişmedi "
+            f"({istatistik['sureler']['toplam']:.3f} sn)"
+        )
+        return istatistik
+                
     except Exception as e:
-        logger.error(f"Veri çekme ve kaydetme sırasında hata oluştu: {str(e)}")
+        db.rollback()
+        logger.error(f"Veritabanına toplu kaydetme sırasında hata oluştu: {str(e)}")
         logger.error(traceback.format_exc())
+        raise
+    finally:
+        db.close()
 
-
-from app.utils.geocode import geocode_address
-
-def save_to_database(eczane_verileri: List[ScraperEczane]):
+def _save_row_by_row(eczane_verileri: List[ScraperEczane],
+                     kaynak: Optional[ScraperKaynagi] = None) -> Dict[str, Any]:
     """
-    Çekilen eczane verilerini veritabanına kaydeder.
+    Çekilen eczane verilerini her eczane için ayrı sorgu ve commit ile kaydeder.
     """
     db = SessionLocal()
+    istatistik = new_write_stats()
+    farklar: List[Dict[str, Any]] = []
+    kaynak_adi = kaynak.ad if kaynak else None
+    listedeki_idler = set()
+    toplam_baslangic = time.perf_counter()
     try:
         bugun = datetime.date.today()
         logger.info(f"Bugünün tarihi: {bugun}")
         
+        koordinat_suresi = commit_suresi = 0.0
+        
+        def commit():
+            nonlocal commit_suresi
+            baslangic = time.perf_counter()
+            db.commit()
+            commit_suresi += time.perf_counter() - baslangic
+        
         for eczane_veri in eczane_verileri:
             # Eczane kaydını bul veya oluştur
             eczane = db.query(EczaneModel).filter(EczaneModel.isim == eczane_veri.isim).first()
             
             # Koordinatları al (eğer eczane_veri'de yoksa ve adres varsa)
-            koordinatlar = None
-            if not eczane_veri.latitude or not eczane_veri.longitude:
-                # Önce konum URL'sinden koordinat çıkarmayı dene
-                if eczane_veri.konum_url:
-                    from app.utils.geocode import get_coordinates_from_google_maps_url
-                    koordinatlar = get_coordinates_from_google_maps_url(eczane_veri.konum_url)
-                    if koordinatlar:
-                        logger.info(f"{eczane_veri.isim} için konum URL'sinden koordinatlar çıkarıldı: {koordinatlar}")
-                
-                # Konum URL'sinden çıkarılamazsa, adresten geocoding dene
-                if not koordinatlar and eczane_veri.adres:
-                    logger.info(f"{eczane_veri.isim} için adresle geocoding deneniyor...")
-                    koordinatlar = geocode_address(eczane_veri.adres)
-                    
-                if koordinatlar:
-                    eczane_veri.latitude, eczane_veri.longitude = koordinatlar
-                    logger.info(f"Koordinatlar alındı: ({eczane_veri.latitude}, {eczane_veri.longitude})")
-                else:
-                    logger.warning(f"{eczane_veri.isim} için koordinatlar bulunamadı")
+            baslangic = time.perf_counter()
+            if kaynak:
+                _koordinatlari_tamamla(eczane_veri, kaynak.sehir, kaynak.ulke)
+            else:
+                _koordinatlari_tamamla(eczane_veri)
+            koordinat_suresi += time.perf_counter() - baslangic
             
             if not eczane:
-                # Yeni eczane oluştur
-                eczane = EczaneModel(
-                    bolge=eczane_veri.bolge,
-                    isim=eczane_veri.isim,
-                    konum_url=eczane_veri.konum_url,
-                    adres=eczane_veri.adres,
-                    telefon=eczane_veri.telefon,
-                    latitude=eczane_veri.latitude,
-                    longitude=eczane_veri.longitude
-                )
-                db.add(eczane)
-                db.commit()
-                db.refresh(eczane)
-                logger.info(f"Yeni eczane kaydı oluşturuldu: {eczane.isim}")
+                # Yeni eczane oluştur (aynı anda başka bir kaynak eklediyse atlanır)
+                eklenen_id = db.execute(
+                    conflict_free_insert(db, EczaneModel, ["isim"])
+                    .values(
+                        bolge=eczane_veri.bolge,
+                        isim=eczane_veri.isim,
+                        konum_url=eczane_veri.konum_url,
+                        adres=eczane_veri.adres,
+                        telefon=eczane_veri.telefon,
+                        latitude=eczane_veri.latitude,
+                        longitude=eczane_veri.longitude,
+                        kaynak=kaynak_adi,
+                        icerik_ozeti=pharmacy_fingerprint(eczane_veri)
+                    )
+                    .returning(EczaneModel.__table__.c.id)
+                ).scalar()
+                commit()
+                eczane = db.query(EczaneModel).filter(EczaneModel.isim == eczane_veri.isim).one()
+                if eklenen_id is not None:
+                    istatistik["eczane_eklenen"] += 1
+                    farklar.append({"islem": "eczane_eklendi", "isim": eczane.isim})
+                    logger.info(f"Yeni eczane kaydı oluşturuldu: {eczane.isim}")
+                else:
+                    istatistik["eczane_degismeyen"] += 1
+            elif eczane.icerik_ozeti != pharmacy_fingerprint(eczane_veri) or (kaynak and eczane.kaynak != kaynak.ad):
+                # Sadece değişen alanları güncelle (koordinatlar sadece yeni koordinat varsa)
+                alanlar = pharmacy_field_changes(eczane, eczane_veri, kaynak_adi)
+                if alanlar:
+                    for alan, (_, yeni) in alanlar.items():
+                        setattr(eczane, alan, yeni)
+                    eczane.icerik_ozeti = pharmacy_fingerprint(eczane_veri)
+                    istatistik["eczane_guncellenen"] += 1
+                    farklar.append({"islem": "eczane_guncellendi", "isim": eczane.isim, "alanlar": alanlar})
+                    logger.info(f"Mevcut eczane bilgileri güncellendi: {eczane.isim}")
+                else:
+                    # Yazılacak alanlar aynı: sadece parmak izini yenile, updated_at korunur
+                    db.execute(
+                        update(EczaneModel)
+                        .where(EczaneModel.id == eczane.id)
+                        .values(icerik_ozeti=pharmacy_fingerprint(eczane_veri), updated_at=EczaneModel.updated_at)
+                        .execution_options(synchronize_session=False)
+                    )
+                    istatistik["eczane_degismeyen"] += 1
+                commit()
             else:
-                # Mevcut eczane bilgilerini güncelle
-                eczane.bolge = eczane_veri.bolge
-                eczane.konum_url = eczane_veri.konum_url
-                eczane.adres = eczane_veri.adres
-                eczane.telefon = eczane_veri.telefon
-                
-                # Koordinatları güncelle (eğer yeni koordinatlar varsa)
-                if eczane_veri.latitude and eczane_veri.longitude:
-                    eczane.latitude = eczane_veri.latitude
-                    eczane.longitude = eczane_veri.longitude
-                
-                db.commit()
-                logger.info(f"Mevcut eczane bilgileri güncellendi: {eczane.isim}")
+                istatistik["eczane_degismeyen"] += 1
+            listedeki_idler.add(eczane.id)
             
             # Bugünün nöbetçi kaydını kontrol et
             nobetci = db.query(NobetciEczaneModel).filter(
@@ -115,20 +451,48 @@ def save_to_database(eczane_verileri: List[ScraperEczane]):
             ).first()
             
             if not nobetci:
-                # Yeni nöbetçi kaydı oluştur
-                nobetci = NobetciEczaneModel(
-                    eczane_id=eczane.id,
-                    tarih=bugun,
-                    not_bilgisi=eczane_veri.not_bilgisi
-                )
-                db.add(nobetci)
-                db.commit()
-                logger.info(f"Yeni nöbetçi eczane kaydı oluşturuldu: {eczane.isim} - {bugun}")
-            else:
+                # Yeni nöbetçi kaydı oluştur (aynı anda başka bir kaynak eklediyse atlanır)
+                eklenen_id = db.execute(
+                    conflict_free_insert(db, NobetciEczaneModel, ["eczane_id", "tarih"])
+                    .values(eczane_id=eczane.id, tarih=bugun, not_bilgisi=eczane_veri.not_bilgisi)
+                    .returning(NobetciEczaneModel.__table__.c.id)
+                ).scalar()
+                if eklenen_id is not None:
+                    increment_duty_stats(db, bugun, [eczane.id])
+                    istatistik["nobet_eklenen"] += 1
+                    farklar.append({"islem": "nobet_eklendi", "isim": eczane.isim})
+                    logger.info(f"Yeni nöbetçi eczane kaydı oluşturuldu: {eczane.isim} - {bugun}")
+                else:
+                    istatistik["nobet_degismeyen"] += 1
+                commit()
+            elif nobetci.not_bilgisi != eczane_veri.not_bilgisi:
                 # Not bilgisini güncelle
+                farklar.append({
+                    "islem": "nobet_guncellendi",
+                    "isim": eczane.isim,
+                    "alanlar": {"not_bilgisi": [nobetci.not_bilgisi, eczane_veri.not_bilgisi]},
+                })
                 nobetci.not_bilgisi = eczane_veri.not_bilgisi
-                db.commit()
+                commit()
+                istatistik["nobet_guncellenen"] += 1
                 logger.info(f"Nöbetçi eczane not bilgisi güncellendi: {eczane.isim} - {bugun}")
+            else:
+                istatistik["nobet_degismeyen"] += 1
+        
+        # Kaynağın bugünkü listesinden çıkan eczanelerin nöbetlerini sil
+        decrement_duty_stats(db, bugun, delete_dropped_duties(db, bugun, kaynak_adi, listedeki_idler, istatistik, farklar))
+        
+        # Değişiklikleri kaydet ve API önbelleklerinin geçersiz kılınması için veri sürümünü artır
+        if has_changes(istatistik):
+            record_scrape_diff(db, kaynak_adi, bugun, istatistik, farklar)
+            bump_data_version(db)
+            commit()
+        
+        istatistik["sureler"]["toplam"] = time.perf_counter() - toplam_baslangic
+        istatistik["sureler"]["koordinatlar"] = koordinat_suresi
+        istatistik["sureler"]["commit"] = commit_suresi
+        istatistik["sureler"]["yazma"] = istatistik["sureler"]["toplam"] - koordinat_suresi - commit_suresi
+        return istatistik
                 
     except Exception as e:
         db.rollback()
@@ -136,4 +500,4 @@ def save_to_database(eczane_verileri: List[ScraperEczane]):
         logger.error(traceback.format_exc())
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
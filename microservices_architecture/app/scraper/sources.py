@@ -0,0 +1,118 @@
+"""
+Scraper kaynakları (belediye nöbetçi eczane sayfaları) kaydı.
+"""
+import datetime
+import json
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from app.config import get_settings
+from app.database.models import Eczane as EczaneModel
+from app.database.schemas import ScraperKaynagi
+from app.utils.geocode import geocode_address, get_coordinates_from_google_maps_url
+
+settings = get_settings()
+
+
+@lru_cache()
+def get_sources() -> List[ScraperKaynagi]:
+    """
+    Tanımlı tüm scraper kaynaklarını döndürür.
+
+    `SOURCES_FILE` ayarı bir JSON dosyasını gösteriyorsa kaynaklar oradan okunur
+    (bkz. `sources.example.json`). Ayar boşsa `SCRAPER_URL` adresindeki tek
+    Edremit kaynağı kullanılır.
+
+    Returns:
+        List[ScraperKaynagi]: Kaynak listesi (pasif kaynaklar dahil)
+    """
+    if not settings.SOURCES_FILE:
+        return [ScraperKaynagi(ad="edremit", url=settings.SCRAPER_URL)]
+
+    with open(settings.SOURCES_FILE, encoding="utf-8") as f:
+        kaynaklar = [ScraperKaynagi(**kayit) for kayit in json.load(f)]
+
+    adlar = [k.ad for k in kaynaklar]
+    tekrarlar = {ad for ad in adlar if adlar.count(ad) > 1}
+    if tekrarlar:
+        raise ValueError(f"Kaynak adları benzersiz olmalı: {', '.join(sorted(tekrarlar))}")
+
+    logger.info(f"{len(kaynaklar)} scraper kaynağı yüklendi: {settings.SOURCES_FILE}")
+    return kaynaklar
+
+
+def get_active_sources(adlar: Optional[Iterable[str]] = None) -> List[ScraperKaynagi]:
+    """
+    Aktif kaynakları döndürür.
+
+    Args:
+        adlar: Sadece bu adlara sahip kaynaklar (verilmezse tüm aktif kaynaklar)
+    """
+    kaynaklar = [k for k in get_sources() if k.aktif]
+    if adlar is None:
+        return kaynaklar
+
+    adlar = set(adlar)
+    bilinmeyen = adlar - {k.ad for k in kaynaklar}
+    if bilinmeyen:
+        logger.warning(f"Bilinmeyen veya pasif kaynaklar atlanıyor: {', '.join(sorted(bilinmeyen))}")
+    return [k for k in kaynaklar if k.ad in adlar]
+
+
+def extra_window_offsets() -> List[int]:
+    """
+    `SCRAPE_EXTRA_WINDOWS` ayarındaki ek çalışma pencerelerini döndürür.
+
+    Ayar, ana çalışma saatine göre virgülle ayrılmış dakika farklarıdır
+    (ör. "-30,30,90"); nöbet listesinin değiştiği saatin öncesinde ve
+    sonrasında da sayfanın çekilmesini sağlar.
+    """
+    return sorted({int(fark) for fark in settings.SCRAPE_EXTRA_WINDOWS.split(",") if fark.strip()})
+
+
+def scrape_times(kaynak: ScraperKaynagi, saat: Optional[int] = None, dakika: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Kaynağın günlük çalışma zamanlarını (saat, dakika) döndürür: ana saat ve ek pencereler.
+
+    Kendi saati tanımlanmamış kaynaklar için verilen saat/dakika, onlar da
+    verilmezse SCRAPE_HOUR/SCRAPE_MINUTE kullanılır.
+    """
+    saat = kaynak.saat if kaynak.saat is not None else (settings.SCRAPE_HOUR if saat is None else saat)
+    dakika = kaynak.dakika if kaynak.dakika is not None else (settings.SCRAPE_MINUTE if dakika is None else dakika)
+    ana = saat * 60 + dakika
+    return sorted({divmod((ana + fark) % (24 * 60), 60) for fark in [0] + extra_window_offsets()})
+
+
+def last_scheduled_scrape(kaynak: ScraperKaynagi, simdi: Optional[datetime.datetime] = None) -> datetime.datetime:
+    """Kaynağın `simdi` veya öncesindeki en son planlı çalışma zamanını döndürür."""
+    simdi = simdi or datetime.datetime.now()
+    adaylar = []
+    for saat, dakika in scrape_times(kaynak):
+        aday = simdi.replace(hour=saat, minute=dakika, second=0, microsecond=0)
+        if aday > simdi:
+            aday -= datetime.timedelta(days=1)
+        adaylar.append(aday)
+    return max(adaylar)
+
+
+def locate_pharmacy(
+    eczane: EczaneModel, kaynaklar: Optional[Dict[str, ScraperKaynagi]] = None
+) -> Optional[Tuple[float, float]]:
+    """
+    Eczanenin koordinatını önce adresinden (kaynağının şehir/ülkesiyle), sonra konum bağlantısından bulur.
+
+    Args:
+        eczane: Koordinatı aranan eczane
+        kaynaklar: Ada göre kaynaklar (verilmezse `get_sources()` kullanılır)
+    """
+    if kaynaklar is None:
+        kaynaklar = {k.ad: k for k in get_sources()}
+    kaynak = kaynaklar.get(eczane.kaynak)
+    sehir, ulke = (kaynak.sehir, kaynak.ulke) if kaynak else ("Edremit", "Turkey")
+
+    koordinatlar = geocode_address(eczane.adres, sehir, ulke) if eczane.adres else None
+    if not koordinatlar and eczane.konum_url:
+        koordinatlar = get_coordinates_from_google_maps_url(eczane.konum_url)
+    return koordinatlar
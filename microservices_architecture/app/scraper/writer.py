@@ -0,0 +1,374 @@
+"""
+Toplu (set tabanlı) ve farka dayalı veritabanı yazma işlemleri.
+
+Her çalışmada kayıtlı durum bir kez yüklenir ve kazınan liste bununla
+karşılaştırılır: sadece yeni satırlar eklenir, içeriği gerçekten değişen
+satırlar güncellenir ve kaynağın bugünkü listesinden çıkan eczanelerin
+nöbetleri silinir. Eczanelerin içeriği `icerik_ozeti` sütunundaki parmak
+iziyle (`pharmacy_fingerprint`) karşılaştırılır; değişmeyen eczaneler için
+hiçbir şey yazılmaz ve `updated_at` sadece gerçek değişikliklerde ilerler.
+Uygulanan değişiklikler çalışma başına bir kayıt olarak `scrape_farklari`
+tablosuna yazılır.
+
+Eklemeler `ON CONFLICT DO NOTHING` ile yapılır (`conflict_free_insert`):
+aynı anda çalışan kaynaklar aynı eczaneyi veya nöbeti eklemeye çalışırsa
+kaybeden taraf hata almaz, satırın id'si eklemeden sonra yeniden okunur.
+Sayılar ve farklar sadece gerçekten eklenen (RETURNING) satırlara göre tutulur.
+"""
+import datetime
+import hashlib
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database.models import Eczane as EczaneModel, NobetciEczane as NobetciEczaneModel, ScrapeFarki
+from app.database.schemas import ScraperEczane
+from app.database.statistics import decrement_duty_stats, increment_duty_stats
+
+settings = get_settings()
+
+# Parmak izine giren, scraper'ın yazdığı eczane alanları
+PARMAK_IZI_ALANLARI = ("bolge", "konum_url", "adres", "telefon", "latitude", "longitude")
+
+# Satır sayısı anahtarlarından değişiklik sayılanlar
+_DEGISIKLIK_ANAHTARLARI = (
+    "eczane_eklenen", "eczane_guncellenen", "nobet_eklenen", "nobet_guncellenen", "nobet_silinen",
+)
+
+
+def _parcalara_bol(satirlar: List[Any], boyut: int):
+    """Listeyi en fazla `boyut` elemanlı parçalara böler."""
+    for i in range(0, len(satirlar), boyut):
+        yield satirlar[i:i + boyut]
+
+
+def conflict_free_insert(db: Session, model, index_elements: List[str]):
+    """
+    Benzersiz anahtarı (`index_elements`) çakışan satırları atlayan INSERT ifadesi.
+
+    PostgreSQL ve SQLite'ın `INSERT ... ON CONFLICT DO NOTHING` sözdizimi kullanılır.
+    İfade tablo üzerinden kurulur: ORM toplu ekleme modu atlanan satırlarla
+    RETURNING sonucunu hata sayar.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model.__table__).on_conflict_do_nothing(index_elements=index_elements)
+
+
+def pharmacy_fingerprint(eczane: Any) -> str:
+    """
+    Eczanenin scraper'dan gelen içeriğinin (`PARMAK_IZI_ALANLARI`) SHA-256 özetini döndürür.
+
+    `ScraperEczane` veya aynı adlı sütunları olan bir veritabanı satırı verilebilir.
+    """
+    degerler = [getattr(eczane, alan) for alan in PARMAK_IZI_ALANLARI]
+    return hashlib.sha256(json.dumps(degerler, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def new_write_stats() -> Dict[str, Any]:
+    """Boş satır sayıları ve aşama süreleri sözlüğü."""
+    return {
+        "eczane_eklenen": 0,
+        "eczane_guncellenen": 0,
+        "eczane_degismeyen": 0,
+        "nobet_eklenen": 0,
+        "nobet_guncellenen": 0,
+        "nobet_degismeyen": 0,
+        "nobet_silinen": 0,
+        "sureler": {},
+    }
+
+
+def has_changes(istatistik: Dict[str, Any]) -> bool:
+    """Yazma istatistiğinde eklenen, güncellenen veya silinen satır olup olmadığını döndürür."""
+    return any(istatistik.get(anahtar) for anahtar in _DEGISIKLIK_ANAHTARLARI)
+
+
+def pharmacy_field_changes(eski: Any, eczane_veri: ScraperEczane, kaynak: Optional[str]) -> Dict[str, list]:
+    """
+    Kayıtlı eczaneye yazılacak alanlardan değeri değişenleri döndürür.
+
+    Koordinatlar sadece yeni koordinat varsa, kaynak etiketi sadece kaynak
+    verildiyse yazılır.
+
+    Returns:
+        Dict[str, list]: Alan adı -> [eski değer, yeni değer]
+    """
+    yeni = {
+        "bolge": eczane_veri.bolge,
+        "konum_url": eczane_veri.konum_url,
+        "adres": eczane_veri.adres,
+        "telefon": eczane_veri.telefon,
+    }
+    if eczane_veri.latitude and eczane_veri.longitude:
+        yeni["latitude"] = eczane_veri.latitude
+        yeni["longitude"] = eczane_veri.longitude
+    if kaynak:
+        yeni["kaynak"] = kaynak
+    return {alan: [getattr(eski, alan), deger] for alan, deger in yeni.items() if getattr(eski, alan) != deger}
+
+
+def delete_dropped_duties(db: Session, tarih: datetime.date, kaynak: Optional[str], listedeki_idler: Iterable[int],
+                          istatistik: Dict[str, Any], farklar: List[Dict[str, Any]]) -> List[int]:
+    """
+    Kaynağın bugünkü listesinde olmayan eczanelerin o tarihteki nöbetlerini siler.
+
+    Sadece son olarak bu kaynağın yazdığı eczanelere bakılır; kaynak verilmezse
+    hiçbir nöbet silinmez. Commit işlemi çağırana bırakılır.
+
+    Returns:
+        List[int]: Nöbeti silinen eczanelerin id'leri
+    """
+    if not kaynak:
+        return []
+
+    listedeki = set(listedeki_idler)
+    silinecekler = [
+        satir for satir in db.execute(
+            select(NobetciEczaneModel.id, NobetciEczaneModel.eczane_id, EczaneModel.isim)
+            .join(EczaneModel, EczaneModel.id == NobetciEczaneModel.eczane_id)
+            .where(NobetciEczaneModel.tarih == tarih, EczaneModel.kaynak == kaynak)
+        )
+        if satir.eczane_id not in listedeki
+    ]
+
+    for parca in _parcalara_bol([satir.id for satir in silinecekler], settings.BULK_BATCH_SIZE):
+        db.execute(delete(NobetciEczaneModel).where(NobetciEczaneModel.id.in_(parca)))
+
+    istatistik["nobet_silinen"] += len(silinecekler)
+    farklar.extend({"islem": "nobet_silindi", "isim": satir.isim} for satir in silinecekler)
+    return [satir.eczane_id for satir in silinecekler]
+
+
+def record_scrape_diff(db: Session, kaynak: Optional[str], tarih: datetime.date,
+                       istatistik: Dict[str, Any], farklar: List[Dict[str, Any]]) -> Optional[ScrapeFarki]:
+    """
+    Çalışmanın değişikliklerini `scrape_farklari` tablosuna tek kayıt olarak ekler.
+
+    Değişiklik yoksa hiçbir şey yazılmaz. Commit işlemi çağırana bırakılır.
+    """
+    if not farklar:
+        return None
+
+    fark = ScrapeFarki(
+        kaynak=kaynak,
+        tarih=tarih,
+        eczane_eklenen=istatistik["eczane_eklenen"],
+        eczane_guncellenen=istatistik["eczane_guncellenen"],
+        nobet_eklenen=istatistik["nobet_eklenen"],
+        nobet_guncellenen=istatistik["nobet_guncellenen"],
+        nobet_silinen=istatistik["nobet_silinen"],
+        farklar=json.dumps(farklar, ensure_ascii=False),
+    )
+    db.add(fark)
+    return fark
+
+
+def bulk_upsert(db: Session, eczane_verileri: List[ScraperEczane], tarih: datetime.date,
+                kaynak: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Eczane ve nöbet kayıtlarını kayıtlı durumla karşılaştırarak tek işlemde (transaction) yazar.
+
+    Sadece eklenen, gerçekten değişen ve (kaynak verildiyse) listeden çıkan
+    kayıtlar yazılır; yazmalar parçalı executemany ile yapılır. Değişiklikler
+    `scrape_farklari` tablosuna kaydedilir. Commit işlemi çağırana bırakılır.
+
+    Args:
+        db: Veritabanı oturumu
+        eczane_verileri: Koordinatları tamamlanmış eczane verileri
+        tarih: Nöbet tarihi
+        kaynak: Eczanelerin etiketleneceği kaynak adı (verilmezse mevcut etiket korunur
+            ve listeden çıkan nöbetler silinmez)
+
+    Returns:
+        Dict[str, Any]: Satır sayıları ve aşama süreleri
+    """
+    istatistik = new_write_stats()
+    farklar: List[Dict[str, Any]] = []
+
+    # Aynı isim birden fazla geldiyse sonuncusu geçerli olur (satır satır yolla aynı davranış)
+    tekil: Dict[str, ScraperEczane] = {}
+    for eczane_veri in eczane_verileri:
+        tekil[eczane_veri.isim] = eczane_veri
+
+    simdi = datetime.datetime.now()
+
+    baslangic = time.perf_counter()
+    eczane_idleri = _eczaneleri_yaz(db, tekil, simdi, kaynak, istatistik, farklar)
+    istatistik["sureler"]["eczaneler"] = time.perf_counter() - baslangic
+
+    baslangic = time.perf_counter()
+    yeni_nobetler = _nobetleri_yaz(db, tekil, eczane_idleri, tarih, simdi, istatistik, farklar)
+    silinen_nobetler = delete_dropped_duties(db, tarih, kaynak, eczane_idleri.values(), istatistik, farklar)
+    istatistik["sureler"]["nobetler"] = time.perf_counter() - baslangic
+
+    # Aylık nöbet sayıları özeti aynı transaction'da güncellenir
+    baslangic = time.perf_counter()
+    increment_duty_stats(db, tarih, yeni_nobetler)
+    decrement_duty_stats(db, tarih, silinen_nobetler)
+    istatistik["sureler"]["istatistikler"] = time.perf_counter() - baslangic
+
+    record_scrape_diff(db, kaynak, tarih, istatistik, farklar)
+    return istatistik
+
+
+def _eczane_satiri(eczane_veri: ScraperEczane, simdi: datetime.datetime, kaynak: Optional[str]) -> Dict[str, Any]:
+    """ScraperEczane nesnesini `eczaneler` tablosu satırına çevirir."""
+    return {
+        "bolge": eczane_veri.bolge,
+        "isim": eczane_veri.isim,
+        "konum_url": eczane_veri.konum_url,
+        "adres": eczane_veri.adres,
+        "telefon": eczane_veri.telefon,
+        "latitude": eczane_veri.latitude,
+        "longitude": eczane_veri.longitude,
+        "kaynak": kaynak,
+        "icerik_ozeti": pharmacy_fingerprint(eczane_veri),
+        "created_at": simdi,
+        "updated_at": simdi,
+    }
+
+
+def _anahtarlara_gore_yaz(db: Session, model, satirlar: List[Dict[str, Any]]):
+    """Güncellemeleri aynı sütun kümesine sahip gruplar halinde executemany ile yazar."""
+    gruplar: Dict[tuple, List[Dict[str, Any]]] = {}
+    for satir in satirlar:
+        gruplar.setdefault(tuple(sorted(satir)), []).append(satir)
+    for grup in gruplar.values():
+        for parca in _parcalara_bol(grup, settings.BULK_BATCH_SIZE):
+            db.execute(update(model), parca)
+
+
+def _eczaneleri_yaz(db, tekil, simdi, kaynak, istatistik, farklar) -> Dict[str, int]:
+    """
+    Yeni eczaneleri ekler; parmak izi veya kaynak etiketi değişen eczanelerin
+    sadece değişen alanlarını günceller.
+
+    Returns:
+        Dict[str, int]: Listedeki eczanelerin isim -> id eşlemesi
+    """
+    mevcut = {
+        satir.isim: satir
+        for satir in db.execute(select(EczaneModel.id, EczaneModel.isim, EczaneModel.icerik_ozeti, EczaneModel.kaynak))
+    }
+
+    yeni_satirlar = []
+    adaylar: Dict[int, ScraperEczane] = {}
+    for isim, eczane_veri in tekil.items():
+        satir = mevcut.get(isim)
+        if satir is None:
+            yeni_satirlar.append(_eczane_satiri(eczane_veri, simdi, kaynak))
+        elif satir.icerik_ozeti != pharmacy_fingerprint(eczane_veri) or (kaynak and satir.kaynak != kaynak):
+            adaylar[satir.id] = eczane_veri
+        else:
+            istatistik["eczane_degismeyen"] += 1
+
+    # Parmak izi değişenlerin kayıtlı satırları alan farkları için yüklenir
+    guncel_satirlar = []
+    for parca in _parcalara_bol(list(adaylar), settings.BULK_BATCH_SIZE):
+        for eski in db.execute(select(EczaneModel.__table__).where(EczaneModel.id.in_(parca))):
+            eczane_veri = adaylar[eski.id]
+            satir = {"id": eski.id, "icerik_ozeti": pharmacy_fingerprint(eczane_veri)}
+            alanlar = pharmacy_field_changes(eski, eczane_veri, kaynak)
+            if alanlar:
+                satir.update({alan: yeni for alan, (_, yeni) in alanlar.items()}, updated_at=simdi)
+                farklar.append({"islem": "eczane_guncellendi", "isim": eski.isim, "alanlar": alanlar})
+                istatistik["eczane_guncellenen"] += 1
+            else:
+                # Yazılacak alanlar aynı (ör. sadece koordinatı olmayan içerik değişti):
+                # yalnızca parmak izi yenilenir, updated_at korunur
+                satir["updated_at"] = eski.updated_at
+                istatistik["eczane_degismeyen"] += 1
+            guncel_satirlar.append(satir)
+
+    # Aynı anda başka bir kaynağın eklediği eczaneler atlanır; sıralı ekleme, eşzamanlı
+    # yazıcıların benzersiz indeks üzerinde birbirini karşılıklı beklemesini (deadlock) önler
+    yeni_satirlar.sort(key=lambda satir: satir["isim"])
+    eklenenler = set()
+    ekle = conflict_free_insert(db, EczaneModel, ["isim"]).returning(EczaneModel.__table__.c.isim)
+    for parca in _parcalara_bol(yeni_satirlar, settings.BULK_BATCH_SIZE):
+        eklenenler.update(db.execute(ekle, parca).scalars())
+    _anahtarlara_gore_yaz(db, EczaneModel, guncel_satirlar)
+    istatistik["eczane_eklenen"] = len(eklenenler)
+    istatistik["eczane_degismeyen"] += len(yeni_satirlar) - len(eklenenler)
+    farklar.extend({"islem": "eczane_eklendi", "isim": satir["isim"]} for satir in yeni_satirlar if satir["isim"] in eklenenler)
+
+    eczane_idleri = {isim: mevcut[isim].id for isim in tekil if isim in mevcut}
+    # Yeni eklenen (veya aynı anda eklenmiş) eczanelerin id'lerini al
+    for parca in _parcalara_bol([satir["isim"] for satir in yeni_satirlar], settings.BULK_BATCH_SIZE):
+        eczane_idleri.update(
+            (isim, eczane_id)
+            for eczane_id, isim in db.execute(select(EczaneModel.id, EczaneModel.isim).where(EczaneModel.isim.in_(parca)))
+        )
+
+    return eczane_idleri
+
+
+def _nobetleri_yaz(db, tekil, eczane_idleri, tarih, simdi, istatistik, farklar) -> List[int]:
+    """
+    O tarihin nöbet kayıtlarını bir kez yükler; yeni nöbetleri ekler, notu
+    değişenleri günceller.
+
+    Returns:
+        List[int]: Nöbeti yeni eklenen eczanelerin id'leri
+    """
+    mevcut = {
+        satir.eczane_id: satir
+        for satir in db.execute(
+            select(NobetciEczaneModel.id, NobetciEczaneModel.eczane_id, NobetciEczaneModel.not_bilgisi)
+            .where(NobetciEczaneModel.tarih == tarih)
+        )
+    }
+
+    yeni_satirlar = []
+    guncel_satirlar = []
+    isimler: Dict[int, str] = {}
+    for isim, eczane_veri in tekil.items():
+        eczane_id = eczane_idleri[isim]
+        satir = mevcut.get(eczane_id)
+        if satir is None:
+            yeni_satirlar.append({
+                "eczane_id": eczane_id,
+                "tarih": tarih,
+                "not_bilgisi": eczane_veri.not_bilgisi,
+                "created_at": simdi,
+            })
+            isimler[eczane_id] = isim
+        elif satir.not_bilgisi != eczane_veri.not_bilgisi:
+            guncel_satirlar.append({"id": satir.id, "not_bilgisi": eczane_veri.not_bilgisi})
+            farklar.append({
+                "islem": "nobet_guncellendi",
+                "isim": isim,
+                "alanlar": {"not_bilgisi": [satir.not_bilgisi, eczane_veri.not_bilgisi]},
+            })
+        else:
+            istatistik["nobet_degismeyen"] += 1
+
+    # Aynı anda başka bir kaynağın eklediği nöbetler atlanır; istatistiklere sadece eklenenler işlenir
+    yeni_satirlar.sort(key=lambda satir: satir["eczane_id"])
+    eklenenler: List[int] = []
+    ekle = (
+        conflict_free_insert(db, NobetciEczaneModel, ["eczane_id", "tarih"])
+        .returning(NobetciEczaneModel.__table__.c.eczane_id)
+    )
+    for parca in _parcalara_bol(yeni_satirlar, settings.BULK_BATCH_SIZE):
+        eklenenler.extend(db.execute(ekle, parca).scalars())
+    for parca in _parcalara_bol(guncel_satirlar, settings.BULK_BATCH_SIZE):
+        db.execute(update(NobetciEczaneModel), parca)
+
+    istatistik["nobet_eklenen"] = len(eklenenler)
+    istatistik["nobet_guncellenen"] = len(guncel_satirlar)
+    istatistik["nobet_degismeyen"] += len(yeni_satirlar) - len(eklenenler)
+    eklenen_kume = set(eklenenler)
+    farklar.extend(
+        {"islem": "nobet_eklendi", "isim": isimler[satir["eczane_id"]]}
+        for satir in yeni_satirlar if satir["eczane_id"] in eklenen_kume
+    )
+
+    return eklenenler
@@ -2,6 +2,6 @@
 Yardımcı fonksiyonlar paket modülü.
 """
 from app.utils.logger import get_logger
-from app.utils.geocode import geocode_address, reverse_geocode
+from app.utils.geocode import geocode_address, geocode_addresses, reverse_geocode, get_geocode_cache_stats
 
-__all__ = ["get_logger", "geocode_address", "reverse_geocode"]
\ No newline at end of file
+__all__ = ["get_logger", "geocode_address", "geocode_addresses", "reverse_geocode", "get_geocode_cache_stats"]
\ No newline at end of file
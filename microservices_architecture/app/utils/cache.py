@@ -0,0 +1,140 @@
+"""
+SQLite dosyası üzerinde kalıcı anahtar-değer önbelleği.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+
+class PersistentCache:
+    """
+    Süreler ve işlemler arasında paylaşılan, TTL ve LRU tahliyeli önbellek.
+
+    Değerler JSON olarak saklanır. `None` değeri "bulunamadı" sonucunu temsil
+    eder (negatif önbellek) ve ayrı bir TTL ile saklanır.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        tablo: str,
+        ttl: Optional[float] = None,
+        negatif_ttl: Optional[float] = None,
+        max_kayit: Optional[int] = None,
+    ):
+        """
+        Args:
+            path: SQLite dosyasının yolu
+            tablo: Önbellek tablosunun adı
+            ttl: Pozitif kayıtların geçerlilik süresi (saniye, None: süresiz)
+            negatif_ttl: Negatif kayıtların geçerlilik süresi (saniye, None: ttl ile aynı)
+            max_kayit: Tutulacak en fazla kayıt sayısı (None: sınırsız)
+        """
+        self.path = path
+        self.tablo = tablo
+        self.ttl = ttl
+        self.negatif_ttl = negatif_ttl if negatif_ttl is not None else ttl
+        self.max_kayit = max_kayit
+        self._kilit = threading.Lock()
+        self._baglanti: Optional[sqlite3.Connection] = None
+        self._sayaclar = {"isabet": 0, "negatif_isabet": 0, "iskalama": 0, "yazma": 0, "tahliye": 0}
+
+    def _baglan(self) -> sqlite3.Connection:
+        """Bağlantıyı ilk kullanımda açar ve tabloyu oluşturur."""
+        if self._baglanti is None:
+            dizin = os.path.dirname(self.path)
+            if dizin and not os.path.exists(dizin):
+                os.makedirs(dizin, exist_ok=True)
+
+            self._baglanti = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._baglanti.execute("PRAGMA journal_mode=WAL")
+            self._baglanti.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.tablo} (
+                    anahtar TEXT PRIMARY KEY,
+                    deger TEXT,
+                    olusturma REAL NOT NULL,
+                    son_erisim REAL NOT NULL
+                )
+            """)
+            self._baglanti.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.tablo}_son_erisim ON {self.tablo}(son_erisim)"
+            )
+        return self._baglanti
+
+    def get(self, anahtar: str) -> Tuple[bool, Any]:
+        """
+        Önbellekten değer okur.
+
+        Returns:
+            Tuple[bool, Any]: (bulundu mu, değer). Negatif kayıtlarda (True, None) döner.
+        """
+        simdi = time.time()
+        try:
+            with self._kilit:
+                baglanti = self._baglan()
+                satir = baglanti.execute(
+                    f"SELECT deger, olusturma FROM {self.tablo} WHERE anahtar = ?", (anahtar,)
+                ).fetchone()
+
+                if satir is not None:
+                    deger = json.loads(satir[0]) if satir[0] is not None else None
+                    ttl = self.ttl if deger is not None else self.negatif_ttl
+                    if ttl is not None and simdi - satir[1] > ttl:
+                        baglanti.execute(f"DELETE FROM {self.tablo} WHERE anahtar = ?", (anahtar,))
+                        satir = None
+                    else:
+                        baglanti.execute(
+                            f"UPDATE {self.tablo} SET son_erisim = ? WHERE anahtar = ?", (simdi, anahtar)
+                        )
+
+                if satir is None:
+                    self._sayaclar["iskalama"] += 1
+                    return False, None
+
+                self._sayaclar["negatif_isabet" if deger is None else "isabet"] += 1
+                return True, deger
+        except sqlite3.Error as e:
+            logger.error(f"Önbellek okuma hatası ({self.tablo}): {str(e)}")
+            self._sayaclar["iskalama"] += 1
+            return False, None
+
+    def set(self, anahtar: str, deger: Any):
+        """Değeri önbelleğe yazar; kayıt sınırı aşılırsa en eski erişilenleri siler."""
+        simdi = time.time()
+        try:
+            with self._kilit:
+                baglanti = self._baglan()
+                baglanti.execute(
+                    f"INSERT OR REPLACE INTO {self.tablo} (anahtar, deger, olusturma, son_erisim) VALUES (?, ?, ?, ?)",
+                    (anahtar, json.dumps(deger) if deger is not None else None, simdi, simdi),
+                )
+                self._sayaclar["yazma"] += 1
+
+                if self.max_kayit:
+                    fazla = baglanti.execute(f"SELECT COUNT(*) FROM {self.tablo}").fetchone()[0] - self.max_kayit
+                    if fazla > 0:
+                        baglanti.execute(
+                            f"DELETE FROM {self.tablo} WHERE anahtar IN "
+                            f"(SELECT anahtar FROM {self.tablo} ORDER BY son_erisim LIMIT ?)",
+                            (fazla,),
+                        )
+                        self._sayaclar["tahliye"] += fazla
+        except sqlite3.Error as e:
+            logger.error(f"Önbellek yazma hatası ({self.tablo}): {str(e)}")
+
+    def istatistik(self) -> Dict[str, Any]:
+        """Bu süreçteki isabet/ıskalama sayaçlarını ve kayıt sayısını döndürür."""
+        sonuc: Dict[str, Any] = dict(self._sayaclar)
+        toplam = sonuc["isabet"] + sonuc["negatif_isabet"] + sonuc["iskalama"]
+        sonuc["isabet_orani"] = (sonuc["isabet"] + sonuc["negatif_isabet"]) / toplam if toplam else None
+        try:
+            with self._kilit:
+                sonuc["kayit_sayisi"] = self._baglan().execute(f"SELECT COUNT(*) FROM {self.tablo}").fetchone()[0]
+        except sqlite3.Error:
+            sonuc["kayit_sayisi"] = None
+        return sonuc
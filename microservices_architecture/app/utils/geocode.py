@@ -1,16 +1,174 @@
 """
 Adres - koordinat dönüşüm işlemleri.
 """
-import requests
+import contextvars
+import re
 import time
-from typing import Tuple, Optional
+import unicodedata
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Tuple, Optional
+from urllib.parse import urlparse
 from loguru import logger
-from geopy.geocoders import Nominatim
+
+from app.config import get_settings
+from app.utils.cache import PersistentCache
+from app.utils.geocode_worker import GeocodeWorker
+from app.utils.metrics import observe_geocoder
+from app.utils.ratelimit import TokenBucket
+
+# geopy ve requests sadece sağlayıcıya istek yapılırken yüklenir; scraper ve API
+# bu modülü içe aktardığında (örn. URL'den koordinat ayrıştırma) yüklenmezler
+if TYPE_CHECKING:
+    from geopy.geocoders import Nominatim
+
+settings = get_settings()
+
+# Geocoding sağlayıcısına yapılan gerçek istek sayıları (bu süreç için)
+_saglayici_cagrilari = {"geocode": 0, "reverse": 0}
+
+
+class ProviderCallCounter:
+    """Bir `count_provider_calls` bloğundan gönderilen isteklerin sağlayıcı çağrı sayısı."""
+
+    def __init__(self):
+        self.sayi = 0
+
+
+# Etkin sayaç; worker istekleri gönderenin bağlamında çalıştırdığı için çağrılar gönderene yazılır
+_cagri_sayaci: "contextvars.ContextVar[Optional[ProviderCallCounter]]" = contextvars.ContextVar(
+    "geocode_cagri_sayaci", default=None
+)
+
+# Türkçe büyük/küçük harf dönüşümü (I -> ı, İ -> i)
+_TURKCE_KUCUK_HARF = str.maketrans({"I": "ı", "İ": "i"})
+
+# Aynı ülkeyi ifade eden yazımlar
+_ULKE_ADLARI = {"turkey": "türkiye", "turkiye": "türkiye", "türkiye": "türkiye"}
+
+
+@lru_cache()
+def _geocode_cache() -> PersistentCache:
+    """Geocoding sonuçlarının kalıcı önbelleğini döndürür."""
+    return PersistentCache(
+        settings.GEOCODE_CACHE_PATH,
+        "geocode_onbellegi",
+        ttl=settings.GEOCODE_CACHE_TTL_DAYS * 86400,
+        negatif_ttl=settings.GEOCODE_CACHE_NEGATIVE_TTL_HOURS * 3600,
+        max_kayit=settings.GEOCODE_CACHE_MAX_ENTRIES,
+    )
+
+
+@lru_cache()
+def _geolocator() -> "Nominatim":
+    """Tüm çağrılarda kullanılan Nominatim istemcisini döndürür."""
+    from geopy.geocoders import Nominatim
+
+    adres = urlparse(settings.GEOCODER_URL)
+    return Nominatim(user_agent="EdremitEczaneAPI/1.0", domain=adres.netloc + adres.path.rstrip("/"), scheme=adres.scheme)
+
+
+@lru_cache()
+def _rate_limiter() -> TokenBucket:
+    """Geocoding sağlayıcısına yapılan tüm isteklerin paylaştığı hız sınırlayıcıyı döndürür."""
+    return TokenBucket(
+        settings.GEOCODE_RATE_PER_SECOND,
+        settings.GEOCODE_RATE_BURST,
+        settings.GEOCODE_RATE_STATE_FILE or None,
+    )
+
+
+@lru_cache()
+def _worker() -> GeocodeWorker:
+    """Sağlayıcı isteklerini sıraya koyan geocoding worker'ını döndürür."""
+    return GeocodeWorker()
+
+
+def _turkce_kucuk(metin: str) -> str:
+    """Metni Türkçe kurallarına göre küçük harfe çevirir."""
+    return unicodedata.normalize("NFC", metin).translate(_TURKCE_KUCUK_HARF).lower()
+
+
+def _normalize_parca(metin: str) -> str:
+    """Adres parçasını küçük harfe çevirir, boşlukları ve kenar noktalamalarını temizler."""
+    metin = re.sub(r"\s+", " ", _turkce_kucuk(metin))
+    return metin.strip(" .;:-")
+
+
+def normalize_address(address: str, city: str = "Edremit", country: str = "Turkey") -> str:
+    """
+    Adresi önbellek anahtarı olarak kullanılabilecek standart biçime getirir.
+    
+    Türkçe harf dönüşümü yapılır, boşluklar sadeleştirilir ve adresin sonunda
+    tekrar eden şehir/ülke bilgisi atılarak tek bir şehir/ülke soneki eklenir.
+    Böylece "Cumhuriyet Mah., EDREMİT, Türkiye" ile "cumhuriyet mah." aynı
+    anahtarı üretir.
+    
+    Args:
+        address: Adres
+        city: Şehir adı
+        country: Ülke adı
+        
+    Returns:
+        str: Normalleştirilmiş adres
+    """
+    sehir = _normalize_parca(city)
+    ulke = _normalize_parca(country)
+    ulke = _ULKE_ADLARI.get(ulke, ulke)
+    
+    parcalar = [_normalize_parca(p) for p in re.split(r"[,\n]", address or "")]
+    parcalar = [p for p in parcalar if p]
+    
+    # Adresin sonundaki şehir/ülke tekrarlarını at
+    while parcalar and (parcalar[-1] == sehir or _ULKE_ADLARI.get(parcalar[-1], parcalar[-1]) == ulke):
+        parcalar.pop()
+    
+    return ", ".join(parcalar + [sehir, ulke])
+
+
+def get_geocode_cache_stats() -> Dict[str, Any]:
+    """
+    Geocoding önbelleğinin isabet/ıskalama sayaçlarını ve sağlayıcı çağrı sayılarını döndürür.
+    """
+    istatistik = _geocode_cache().istatistik()
+    istatistik["saglayici_cagrilari"] = dict(_saglayici_cagrilari)
+    istatistik["kuyruk"] = _worker().istatistik()
+    istatistik["hiz_siniri_bekleme_sn"] = _rate_limiter().toplam_bekleme
+    return istatistik
+
+
+@contextmanager
+def count_provider_calls() -> Iterator[ProviderCallCounter]:
+    """
+    Blok içinde bu thread'in gönderdiği isteklerin yaptığı sağlayıcı çağrılarını sayar.
+
+    Süreçteki diğer geocoding istekleri (ör. scraper) sayılmaz; başka bir
+    çağıranın bekleyen isteğine bağlanan (tekilleştirilen) istekler de
+    sağlayıcı çağrısı yapmadığı için sayılmaz.
+    """
+    sayac = ProviderCallCounter()
+    token = _cagri_sayaci.set(sayac)
+    try:
+        yield sayac
+    finally:
+        _cagri_sayaci.reset(token)
+
+
+def _saglayici_cagrisi(tur: str):
+    """Sağlayıcıya yapılan bir isteği süreç sayacına ve (varsa) etkin sayaca işler."""
+    _saglayici_cagrilari[tur] += 1
+    sayac = _cagri_sayaci.get()
+    if sayac is not None:
+        sayac.sayi += 1
+
 
 def geocode_address(address: str, city: str = "Edremit", country: str = "Turkey") -> Optional[Tuple[float, float]]:
     """
     Adresi koordinatlara (enlem, boylam) çevirir.
-    Önce Geopy kütüphanesi ile dener, başarısız olursa doğrudan Nominatim API'ye istek yapar.
+    Önce kalıcı önbelleğe bakar; bulunamazsa isteği geocoding worker'ına
+    gönderir ve sonucu bekler. Worker önce Geopy kütüphanesi ile dener,
+    başarısız olursa doğrudan Nominatim API'ye istek yapar. Bulunamayan
+    adresler de (negatif sonuç) önbelleğe yazılır.
     
     Args:
         address: Koordinatları alınacak adres
@@ -24,27 +182,101 @@ def geocode_address(address: str, city: str = "Edremit", country: str = "Turkey"
         logger.warning("Geocode için adres boş")
         return None
     
-    # Adres hazırla
-    full_address = f"{address}, {city}, {country}"
+    return geocode_addresses([address], city, country)[address]
+
+
+def geocode_addresses(addresses: Iterable[str], city: str = "Edremit",
+                      country: str = "Turkey") -> Dict[str, Optional[Tuple[float, float]]]:
+    """
+    Birden fazla adresi toplu olarak koordinatlara çevirir.
     
+    Önbellekte olmayan adreslerin hepsi worker kuyruğuna bir kerede eklenir;
+    aynı adrese normalleştirilen istekler tek bir sağlayıcı çağrısıyla çözülür.
+    
+    Args:
+        addresses: Adresler
+        city: Şehir adı (varsayılan: Edremit)
+        country: Ülke adı (varsayılan: Turkey)
+        
+    Returns:
+        Dict[str, Optional[Tuple[float, float]]]: Adres -> koordinat (çözülemezse None)
+    """
+    sonuclar: Dict[str, Optional[Tuple[float, float]]] = {}
+    bekleyenler = []
+    
+    for address in addresses:
+        if not address:
+            logger.warning("Geocode için adres boş")
+            sonuclar[address] = None
+            continue
+        
+        anahtar = f"adres:{normalize_address(address, city, country)}"
+        bulundu, onbellekteki = _geocode_cache().get(anahtar)
+        if bulundu:
+            logger.debug(f"Geocode önbellekten döndü: {anahtar} -> {onbellekteki}")
+            sonuclar[address] = tuple(onbellekteki) if onbellekteki else None
+            continue
+        
+        future = _worker().submit(anahtar, _geocode_and_store, anahtar, f"{address}, {city}, {country}")
+        bekleyenler.append((address, future))
+    
+    for address, future in bekleyenler:
+        try:
+            sonuclar[address] = future.result()
+        except Exception as e:
+            logger.error(f"Geocode işlemi hatası: {address}: {str(e)}")
+            sonuclar[address] = None
+    
+    return sonuclar
+
+
+def _geocode_and_store(anahtar: str, full_address: str) -> Optional[Tuple[float, float]]:
+    """Adresi sağlayıcıya sorar ve kesin cevabı önbelleğe yazar (worker thread'inde çalışır)."""
+    # Kuyrukta beklerken başka bir süreç aynı adresi çözmüş olabilir
+    bulundu, onbellekteki = _geocode_cache().get(anahtar)
+    if bulundu:
+        return tuple(onbellekteki) if onbellekteki else None
+    
+    koordinatlar, kesin = _geocode_remote(full_address)
+    
+    # Sadece sağlayıcının kesin cevabını sakla (ağ hatalarını önbelleğe yazma)
+    if kesin:
+        _geocode_cache().set(anahtar, list(koordinatlar) if koordinatlar else None)
+    
+    return koordinatlar
+
+
+def _geocode_remote(full_address: str) -> Tuple[Optional[Tuple[float, float]], bool]:
+    """
+    Adresi geocoding sağlayıcısına sorar.
+    
+    Returns:
+        Tuple: (koordinatlar veya None, sağlayıcı kesin cevap verdi mi)
+    """
+    import requests
+
     # Yöntem 1: Geopy kütüphanesi ile
+    baslangic = None
     try:
-        geolocator = Nominatim(user_agent="EdremitEczaneAPI/1.0")
-        location = geolocator.geocode(full_address, timeout=10)
+        _rate_limiter().acquire()
+        _saglayici_cagrisi("geocode")
+        baslangic = time.perf_counter()
+        location = _geolocator().geocode(full_address, timeout=settings.GEOCODER_TIMEOUT)
+        observe_geocoder("geocode", "geopy", "bulundu" if location else "bulunamadi", time.perf_counter() - baslangic)
         
         if location:
             logger.info(f"Geopy ile geocode başarılı: {full_address} -> ({location.latitude}, {location.longitude})")
-            return (location.latitude, location.longitude)
+            return (location.latitude, location.longitude), True
         else:
             logger.warning(f"Geopy ile koordinat bulunamadı: {full_address}")
     except Exception as e:
+        if baslangic is not None:
+            observe_geocoder("geocode", "geopy", "hata", time.perf_counter() - baslangic)
         logger.error(f"Geopy ile geocode işlemi hatası: {str(e)}")
     
     # Yöntem 2: Doğrudan Nominatim API çağrısı
+    baslangic = sure = None
     try:
-        # API rate limit - saniyede 1 istekten fazla yapmamak için
-        time.sleep(1)
-        
         # Nominatim API için parametreler
         params = {
             'q': full_address,
@@ -54,18 +286,27 @@ def geocode_address(address: str, city: str = "Edremit", country: str = "Turkey"
         }
         
         # API isteği
-        response = requests.get('https://nominatim.openstreetmap.org/search', params=params, 
-                                headers={'User-Agent': 'EdremitEczaneAPI/1.0'})
+        # API rate limit - paylaşılan token bucket üzerinden
+        _rate_limiter().acquire()
+        _saglayici_cagrisi("geocode")
+        baslangic = time.perf_counter()
+        response = requests.get(f"{settings.GEOCODER_URL.rstrip('/')}/search", params=params, 
+                                headers={'User-Agent': 'EdremitEczaneAPI/1.0'},
+                                timeout=settings.GEOCODER_TIMEOUT)
+        sure = time.perf_counter() - baslangic
         
         if response.status_code != 200:
+            observe_geocoder("geocode", "api", "hata", sure)
             logger.error(f"Geocode API hatası: {response.status_code}")
-            return None
+            return None, False
         
         data = response.json()
         
         if not data:
+            observe_geocoder("geocode", "api", "bulunamadi", sure)
             logger.warning(f"API ile koordinat bulunamadı: {full_address}")
-            return None
+            return None, True
+        observe_geocoder("geocode", "api", "bulundu", sure)
         
         # İlk sonucu al
         location = data[0]
@@ -73,17 +314,21 @@ def geocode_address(address: str, city: str = "Edremit", country: str = "Turkey"
         lon = float(location['lon'])
         
         logger.info(f"API ile geocode başarılı: {full_address} -> ({lat}, {lon})")
-        return (lat, lon)
+        return (lat, lon), True
         
     except Exception as e:
+        if baslangic is not None and sure is None:
+            observe_geocoder("geocode", "api", "hata", time.perf_counter() - baslangic)
         logger.error(f"API ile geocode işlemi hatası: {str(e)}")
-        return None
+        return None, False
 
 
 def reverse_geocode(lat: float, lon: float) -> Optional[str]:
     """
     Koordinatları adrese çevirir.
-    Önce Geopy ile dener, başarısız olursa Nominatim API'ye doğrudan istek yapar.
+    Önce kalıcı önbelleğe bakar; bulunamazsa isteği geocoding worker'ına
+    gönderir. Worker önce Geopy ile dener, başarısız olursa Nominatim API'ye
+    doğrudan istek yapar.
     
     Args:
         lat: Enlem
@@ -96,25 +341,59 @@ def reverse_geocode(lat: float, lon: float) -> Optional[str]:
         logger.warning("Reverse geocode için koordinatlar eksik")
         return None
     
+    anahtar = f"koordinat:{lat:.6f},{lon:.6f}"
+    bulundu, onbellekteki = _geocode_cache().get(anahtar)
+    if bulundu:
+        logger.debug(f"Reverse geocode önbellekten döndü: {anahtar} -> {onbellekteki}")
+        return onbellekteki
+    
+    try:
+        return _worker().submit(anahtar, _reverse_geocode_and_store, anahtar, lat, lon).result()
+    except Exception as e:
+        logger.error(f"Reverse geocode işlemi hatası: ({lat}, {lon}): {str(e)}")
+        return None
+
+
+def _reverse_geocode_and_store(anahtar: str, lat: float, lon: float) -> Optional[str]:
+    """Koordinatları sağlayıcıya sorar ve kesin cevabı önbelleğe yazar (worker thread'inde çalışır)."""
+    address, kesin = _reverse_geocode_remote(lat, lon)
+    if kesin:
+        _geocode_cache().set(anahtar, address)
+    return address
+
+
+def _reverse_geocode_remote(lat: float, lon: float) -> Tuple[Optional[str], bool]:
+    """
+    Koordinatları geocoding sağlayıcısına sorar.
+    
+    Returns:
+        Tuple: (adres veya None, sağlayıcı kesin cevap verdi mi)
+    """
+    import requests
+
     # Yöntem 1: Geopy kütüphanesi ile
+    baslangic = None
     try:
-        geolocator = Nominatim(user_agent="EdremitEczaneAPI/1.0")
-        location = geolocator.reverse((lat, lon), timeout=10)
+        _rate_limiter().acquire()
+        _saglayici_cagrisi("reverse")
+        baslangic = time.perf_counter()
+        location = _geolocator().reverse((lat, lon), timeout=settings.GEOCODER_TIMEOUT)
+        observe_geocoder("reverse", "geopy", "bulundu" if location else "bulunamadi", time.perf_counter() - baslangic)
         
         if location:
             address = location.address
             logger.info(f"Geopy ile reverse geocode başarılı: ({lat}, {lon}) -> {address}")
-            return address
+            return address, True
         else:
             logger.warning(f"Geopy ile adres bulunamadı: ({lat}, {lon})")
     except Exception as e:
+        if baslangic is not None:
+            observe_geocoder("reverse", "geopy", "hata", time.perf_counter() - baslangic)
         logger.error(f"Geopy ile reverse geocode işlemi hatası: {str(e)}")
     
     # Yöntem 2: Doğrudan Nominatim API çağrısı
+    baslangic = sure = None
     try:
-        # API rate limit - saniyede 1 istekten fazla yapmamak için
-        time.sleep(1)
-        
         # Nominatim API için parametreler
         params = {
             'lat': lat,
@@ -124,32 +403,146 @@ def reverse_geocode(lat: float, lon: float) -> Optional[str]:
         }
         
         # API isteği
-        response = requests.get('https://nominatim.openstreetmap.org/reverse', params=params, 
-                                headers={'User-Agent': 'EdremitEczaneAPI/1.0'})
+        # API rate limit - paylaşılan token bucket üzerinden
+        _rate_limiter().acquire()
+        _saglayici_cagrisi("reverse")
+        baslangic = time.perf_counter()
+        response = requests.get(f"{settings.GEOCODER_URL.rstrip('/')}/reverse", params=params, 
+                                headers={'User-Agent': 'EdremitEczaneAPI/1.0'},
+                                timeout=settings.GEOCODER_TIMEOUT)
+        sure = time.perf_counter() - baslangic
         
         if response.status_code != 200:
+            observe_geocoder("reverse", "api", "hata", sure)
             logger.error(f"Reverse geocode API hatası: {response.status_code}")
-            return None
+            return None, False
         
         data = response.json()
         
         if 'error' in data:
+            observe_geocoder("reverse", "api", "bulunamadi", sure)
             logger.warning(f"API ile adres bulunamadı: ({lat}, {lon})")
-            return None
+            return None, True
+        observe_geocoder("reverse", "api", "bulundu", sure)
         
         # Adresi al
         address = data.get('display_name', '')
         
         logger.info(f"API ile reverse geocode başarılı: ({lat}, {lon}) -> {address}")
-        return address
+        return address, True
         
     except Exception as e:
+        if baslangic is not None and sure is None:
+            observe_geocoder("reverse", "api", "hata", time.perf_counter() - baslangic)
         logger.error(f"API ile reverse geocode işlemi hatası: {str(e)}")
-        return None
+        return None, False
+
+def is_short_maps_url(url: str) -> bool:
+    """URL'nin kısaltılmış bir Google Maps bağlantısı (goo.gl) olup olmadığını döndürür."""
+    return bool(url) and ("goo.gl" in url or "maps.app.goo.gl" in url)
+
+
+@lru_cache()
+def _short_link_cache() -> PersistentCache:
+    """Kısa bağlantı -> hedef URL/koordinat eşlemelerinin kalıcı önbelleğini döndürür."""
+    # Kısa bağlantıların hedefi değişmediği için kayıtlar süresizdir
+    return PersistentCache(settings.GEOCODE_CACHE_PATH, "kisa_link_onbellegi", max_kayit=settings.GEOCODE_CACHE_MAX_ENTRIES)
+
+
+def _resolve_short_url_remote(url: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Kısaltılmış URL'nin yönlendirmelerini takip eder.
+    
+    Returns:
+        Tuple: ({"url": hedef URL, "koordinat": [enlem, boylam] veya None} veya None,
+                sonuç kesin mi - ağ hatalarında False)
+    """
+    import requests
+
+    try:
+        logger.info(f"Kısaltılmış URL tespit edildi: {url}")
+        response = requests.head(url, allow_redirects=True, timeout=settings.SHORTLINK_TIMEOUT)
+        if response.status_code != 200:
+            logger.warning(f"Kısaltılmış URL çözülemedi ({response.status_code}): {url}")
+            return None, response.status_code < 500
+        
+        # Yönlendirilen URL'yi al
+        final_url = response.url
+        logger.info(f"URL yönlendirmesi: {final_url}")
+        
+        koordinatlar = parse_coordinates_from_url(final_url)
+        if koordinatlar:
+            logger.info(f"Kısaltılmış URL'den koordinatlar bulundu: {koordinatlar}")
+        return {"url": final_url, "koordinat": list(koordinatlar) if koordinatlar else None}, True
+    except Exception as e:
+        logger.error(f"Kısaltılmış URL işleme hatası: {str(e)}")
+        return None, False
+
+
+def resolve_short_urls(urls: Iterable[str]) -> Dict[str, Optional[Tuple[float, float]]]:
+    """
+    Kısaltılmış Google Maps bağlantılarını eşzamanlı olarak çözer.
+    
+    Önbellekte olan bağlantılar için ağ isteği yapılmaz; kalanlar
+    `SHORTLINK_MAX_WORKERS` thread'lik bir havuzda, istek başına
+    `SHORTLINK_TIMEOUT` süre sınırıyla çözülür ve önbelleğe yazılır.
+    
+    Args:
+        urls: Kısaltılmış bağlantılar
+        
+    Returns:
+        Dict[str, Optional[Tuple[float, float]]]: Bağlantı -> koordinat (çıkarılamazsa None)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    sonuclar: Dict[str, Optional[Tuple[float, float]]] = {}
+    cozulecekler: List[str] = []
+    
+    for url in dict.fromkeys(urls):
+        bulundu, onbellekteki = _short_link_cache().get(url)
+        if bulundu:
+            koordinat = onbellekteki.get("koordinat") if onbellekteki else None
+            sonuclar[url] = tuple(koordinat) if koordinat else None
+        else:
+            cozulecekler.append(url)
+    
+    if not cozulecekler:
+        return sonuclar
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(settings.SHORTLINK_MAX_WORKERS, len(cozulecekler)))) as havuz:
+        for url, (sonuc, kesin) in zip(cozulecekler, havuz.map(_resolve_short_url_remote, cozulecekler)):
+            if kesin:
+                _short_link_cache().set(url, sonuc)
+            koordinat = sonuc.get("koordinat") if sonuc else None
+            sonuclar[url] = tuple(koordinat) if koordinat else None
+    
+    return sonuclar
+
 
 def get_coordinates_from_google_maps_url(url: str) -> Optional[Tuple[float, float]]:
     """
     Google Maps URL'inden koordinat bilgilerini çıkarır.
+    Kısaltılmış bağlantılar önbellek üzerinden çözülür.
+    
+    Args:
+        url: Google Maps URL'i
+        
+    Returns:
+        Tuple[float, float]: (enlem, boylam) koordinat çifti, çıkarılamazsa None
+    """
+    if not url:
+        return None
+    
+    # Kısaltılmış goo.gl URL'lerini işle
+    if is_short_maps_url(url):
+        return resolve_short_urls([url]).get(url)
+    
+    return parse_coordinates_from_url(url)
+
+
+def parse_coordinates_from_url(url: str) -> Optional[Tuple[float, float]]:
+    """
+    Uzun Google Maps URL'inin metninden koordinatları çıkarır (ağ isteği yapmaz).
     
     Args:
         url: Google Maps URL'i
@@ -161,34 +554,6 @@ def get_coordinates_from_google_maps_url(url: str) -> Optional[Tuple[float, floa
         return None
     
     try:
-        # Kısaltılmış goo.gl URL'lerini işle
-        if "goo.gl" in url or "maps.app.goo.gl" in url:
-            # Kısaltılmış URL'leri takip etmemiz gerekiyor
-            try:
-                logger.info(f"Kısaltılmış URL tespit edildi: {url}")
-                response = requests.head(url, allow_redirects=True)
-                if response.status_code == 200:
-                    # Yönlendirilen URL'yi al
-                    final_url = response.url
-                    logger.info(f"URL yönlendirmesi: {final_url}")
-                    
-                    # Yönlendirilen URL'de koordinat kontrolü yap
-                    if "/@" in final_url:
-                        coords_part = final_url.split("/@")[1].split("/")[0]
-                        coords = coords_part.split(",")
-                        if len(coords) >= 2:
-                            try:
-                                lat = float(coords[0])
-                                lon = float(coords[1])
-                                logger.info(f"Kısaltılmış URL'den koordinatlar bulundu: ({lat}, {lon})")
-                                return (lat, lon)
-                            except ValueError:
-                                logger.warning(f"Kısaltılmış URL'den geçersiz koordinatlar: {coords}")
-            except Exception as e:
-                logger.error(f"Kısaltılmış URL işleme hatası: {str(e)}")
-            
-            return None
-                
         # Normal maps URL'leri için kontroller
         if "maps" not in url:
             return None
@@ -235,4 +600,4 @@ def get_coordinates_from_google_maps_url(url: str) -> Optional[Tuple[float, floa
         return None
     except Exception as e:
         logger.error(f"URL'den koordinat çıkarma hatası: {str(e)}")
-        return None
\ No newline at end of file
+        return None
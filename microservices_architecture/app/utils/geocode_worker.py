@@ -0,0 +1,80 @@
+"""
+Geocoding isteklerini kuyruktan sırayla işleyen arka plan worker'ı.
+"""
+import contextvars
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+from loguru import logger
+
+
+class GeocodeWorker:
+    """
+    Geocoding isteklerini tek bir arka plan thread'inde işler.
+
+    Aynı anahtarla gelen ve henüz tamamlanmamış istekler tekrar kuyruğa
+    alınmaz; çağıranların hepsi aynı Future'ı bekler. Hız sınırı, sağlayıcıya
+    istek atan fonksiyonların içinde (TokenBucket) uygulanır. Her istek, onu
+    kuyruğa ekleyen thread'in bağlamında (contextvars) çalıştırılır.
+    """
+
+    def __init__(self, ad: str = "geocode-worker"):
+        self.ad = ad
+        self._kuyruk: "queue.Queue" = queue.Queue()
+        self._bekleyenler: Dict[str, Future] = {}
+        self._kilit = threading.Lock()
+        self._thread = None
+        self._sayaclar = {"gonderilen": 0, "tekillestirilen": 0, "tamamlanan": 0, "hata": 0}
+
+    def submit(self, anahtar: str, fonksiyon: Callable[..., Any], *args) -> Future:
+        """
+        İsteği kuyruğa ekler.
+
+        Args:
+            anahtar: Tekilleştirme anahtarı (ör. normalleştirilmiş adres)
+            fonksiyon: Worker thread'inde çağrılacak fonksiyon
+            *args: Fonksiyonun argümanları
+
+        Returns:
+            Future: Fonksiyonun sonucunu taşıyan Future
+        """
+        with self._kilit:
+            self._sayaclar["gonderilen"] += 1
+            future = self._bekleyenler.get(anahtar)
+            if future is not None:
+                self._sayaclar["tekillestirilen"] += 1
+                return future
+
+            future = Future()
+            self._bekleyenler[anahtar] = future
+            self._kuyruk.put((anahtar, contextvars.copy_context(), fonksiyon, args, future))
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._calis, name=self.ad, daemon=True)
+                self._thread.start()
+
+        return future
+
+    def _calis(self):
+        """Kuyruktaki istekleri sırayla işler."""
+        while True:
+            anahtar, baglam, fonksiyon, args, future = self._kuyruk.get()
+            try:
+                future.set_result(baglam.run(fonksiyon, *args))
+                self._sayaclar["tamamlanan"] += 1
+            except Exception as e:
+                logger.error(f"Geocode worker hatası ({anahtar}): {str(e)}")
+                self._sayaclar["hata"] += 1
+                future.set_exception(e)
+            finally:
+                with self._kilit:
+                    self._bekleyenler.pop(anahtar, None)
+                self._kuyruk.task_done()
+
+    def istatistik(self) -> Dict[str, Any]:
+        """Kuyruk sayaçlarını döndürür."""
+        sonuc: Dict[str, Any] = dict(self._sayaclar)
+        sonuc["kuyruktaki"] = self._kuyruk.qsize()
+        return sonuc
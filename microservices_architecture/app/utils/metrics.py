@@ -0,0 +1,175 @@
+"""
+Prometheus metrikleri.
+
+API ve scraper süreçleri aynı metrik tanımlarını kullanır. API metrikleri
+`GET /metrics` ile sunulur; scraper süreci her çalışmanın sonunda metrikleri
+node_exporter textfile dizinine yazar ve/veya bir Pushgateway'e gönderir
+(`METRICS_TEXTFILE`, `METRICS_PUSHGATEWAY_URL`).
+
+Birden fazla API süreci (`WEB_CONCURRENCY` > 1) çalışıyorsa süreçler
+başlatılmadan önce `PROMETHEUS_MULTIPROC_DIR` ortam değişkeni boş bir dizine
+ayarlanmalıdır; `/metrics` bu durumda tüm süreçlerin değerlerini birleştirir.
+"""
+import os
+from typing import Any, Dict
+
+from loguru import logger
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client import push_to_gateway, write_to_textfile
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Scraper aşamaları milisaniyelerden (ayrıştırma) dakikalara (geocoding) kadar sürebilir
+_ASAMA_ARALIKLARI = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+_GEOCODER_ARALIKLARI = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30)
+# Kilit bekleme ve tutulma süreleri: anında alınmadan günlerce liderliğe kadar
+_KILIT_ARALIKLARI = (0.01, 0.1, 1, 10, 60, 300, 900, 3600, 4 * 3600, 24 * 3600, 7 * 24 * 3600)
+
+SCRAPE_STAGE_SECONDS = Histogram(
+    "eczane_scrape_stage_duration_seconds",
+    "Scraper aşama süreleri (indirme, ayristirma, kisa_linkler, koordinatlar, eczaneler, nobetler, istatistikler, yazma, commit)",
+    ["source", "stage"],
+    buckets=_ASAMA_ARALIKLARI,
+)
+SCRAPE_DURATION_SECONDS = Histogram(
+    "eczane_scrape_duration_seconds",
+    "Bir kaynağın indirme, işleme ve kayıt dahil toplam çalışma süresi",
+    ["source", "status"],
+    buckets=_ASAMA_ARALIKLARI,
+)
+SCRAPE_RUNS = Counter(
+    "eczane_scrape_runs_total",
+    "Scraper çalışmaları (durum: basarili, degisiklik_yok, veri_yok, hata)",
+    ["source", "status"],
+)
+SCRAPE_ROWS = Counter(
+    "eczane_scrape_rows_total",
+    "Scraper çalışmalarında işlenen satırlar (eklenen, guncellenen, silinen, degismeyen)",
+    ["source", "table", "operation"],
+)
+GEOCODER_SECONDS = Histogram(
+    "eczane_geocoder_request_duration_seconds",
+    "Geocoding sağlayıcısına yapılan isteklerin süresi",
+    ["operation", "method"],
+    buckets=_GEOCODER_ARALIKLARI,
+)
+GEOCODER_REQUESTS = Counter(
+    "eczane_geocoder_requests_total",
+    "Geocoding sağlayıcısına yapılan istekler (sonuç: bulundu, bulunamadi, hata)",
+    ["operation", "method", "outcome"],
+)
+LOCK_ATTEMPTS = Counter(
+    "eczane_lock_attempts_total",
+    "Süreçler arası kilit alma denemeleri (sonuç: alindi, mesgul, hata)",
+    ["lock", "outcome"],
+)
+LOCK_WAIT_SECONDS = Histogram(
+    "eczane_lock_wait_seconds",
+    "Kilidin beklenmeye başlanmasından alınmasına kadar geçen süre",
+    ["lock"],
+    buckets=_KILIT_ARALIKLARI,
+)
+LOCK_HOLD_SECONDS = Histogram(
+    "eczane_lock_hold_seconds",
+    "Kilidin alınmasından bırakılmasına (veya kaybedilmesine) kadar tutulduğu süre",
+    ["lock"],
+    buckets=_KILIT_ARALIKLARI,
+)
+LOCK_HELD = Gauge(
+    "eczane_lock_held",
+    "Bu süreç kilidi tutuyorsa 1 (scraper lider kilidi için: lider mi)",
+    ["lock"],
+    multiprocess_mode="livesum",
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "eczane_http_request_duration_seconds",
+    "API isteklerinin süresi (route şablonuna göre)",
+    ["method", "route"],
+)
+HTTP_REQUESTS = Counter(
+    "eczane_http_requests_total",
+    "API istekleri (route şablonu ve durum koduna göre)",
+    ["method", "route", "status"],
+)
+
+# (istatistik anahtarı, tablo, işlem)
+_SATIR_SAYACLARI = (
+    ("eczane_eklenen", "eczaneler", "eklenen"),
+    ("eczane_guncellenen", "eczaneler", "guncellenen"),
+    ("nobet_eklenen", "nobetci_eczaneler", "eklenen"),
+    ("nobet_guncellenen", "nobetci_eczaneler", "guncellenen"),
+    ("nobet_silinen", "nobetci_eczaneler", "silinen"),
+    ("eczane_degismeyen", "eczaneler", "degismeyen"),
+    ("nobet_degismeyen", "nobetci_eczaneler", "degismeyen"),
+)
+
+
+def observe_write_stats(kaynak: str, istatistik: Dict[str, Any]):
+    """
+    `save_to_database` sonucundaki aşama sürelerini ve satır sayılarını metriklere işler.
+
+    Args:
+        kaynak: Kaynak adı
+        istatistik: Eklenen/güncellenen satır sayıları ve "sureler" sözlüğü
+    """
+    for asama, sure in istatistik.get("sureler", {}).items():
+        if asama != "toplam":
+            SCRAPE_STAGE_SECONDS.labels(kaynak, asama).observe(sure)
+    for anahtar, tablo, islem in _SATIR_SAYACLARI:
+        SCRAPE_ROWS.labels(kaynak, tablo, islem).inc(istatistik.get(anahtar, 0))
+
+
+def observe_geocoder(islem: str, yontem: str, sonuc: str, sure: float):
+    """
+    Geocoding sağlayıcısına yapılan bir isteği metriklere işler.
+
+    Args:
+        islem: "geocode" veya "reverse"
+        yontem: "geopy" veya "api"
+        sonuc: "bulundu", "bulunamadi" veya "hata"
+        sure: İstek süresi (saniye; hız sınırı beklemesi hariç)
+    """
+    GEOCODER_SECONDS.labels(islem, yontem).observe(sure)
+    GEOCODER_REQUESTS.labels(islem, yontem, sonuc).inc()
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Sunulacak metrik kayıt defterini döndürür (çok süreçli modda tüm süreçlerin birleşimi)."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> bytes:
+    """Metrikleri Prometheus metin biçiminde döndürür."""
+    return generate_latest(metrics_registry())
+
+
+def export_metrics():
+    """
+    Scraper metriklerini ayarlanan hedeflere yazar; hata olursa sadece loglar.
+
+    `METRICS_TEXTFILE` dosyası node_exporter textfile toplayıcısı için
+    atomik olarak yeniden yazılır. `METRICS_PUSHGATEWAY_URL` verilmişse
+    metrikler `METRICS_PUSHGATEWAY_JOB` iş adıyla gönderilir.
+    """
+    if settings.METRICS_TEXTFILE:
+        try:
+            dizin = os.path.dirname(settings.METRICS_TEXTFILE)
+            if dizin and not os.path.exists(dizin):
+                os.makedirs(dizin, exist_ok=True)
+            write_to_textfile(settings.METRICS_TEXTFILE, metrics_registry())
+        except Exception as e:
+            logger.error(f"Metrikler dosyaya yazılamadı: {settings.METRICS_TEXTFILE}: {str(e)}")
+
+    if settings.METRICS_PUSHGATEWAY_URL:
+        try:
+            push_to_gateway(settings.METRICS_PUSHGATEWAY_URL, job=settings.METRICS_PUSHGATEWAY_JOB,
+                            registry=metrics_registry())
+        except Exception as e:
+            logger.error(f"Metrikler Pushgateway'e gönderilemedi: {settings.METRICS_PUSHGATEWAY_URL}: {str(e)}")
@@ -0,0 +1,109 @@
+"""
+Süreçler arası paylaşılan hız sınırlayıcı (token bucket).
+"""
+import json
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+from loguru import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: dosya kilidi yok, sınır sadece süreç içinde uygulanır
+    fcntl = None
+
+
+class TokenBucket:
+    """
+    Token bucket hız sınırlayıcı.
+
+    Durum (kalan token ve son dolum zamanı) bir dosyada tutulur ve her
+    erişimde dosya kilitlenir; böylece aynı dosyayı kullanan tüm thread'ler
+    ve süreçler (API ve scraper) tek bir hız sınırını paylaşır.
+    """
+
+    def __init__(self, hiz: float, kapasite: float = 1, durum_dosyasi: Optional[str] = None):
+        """
+        Args:
+            hiz: Saniyede eklenen token sayısı (izin verilen istek hızı)
+            kapasite: Biriktirilebilecek en fazla token (ani istek sayısı)
+            durum_dosyasi: Paylaşılan durum dosyası (None: sadece bu süreç)
+        """
+        self.hiz = hiz
+        self.kapasite = max(kapasite, 1)
+        self.durum_dosyasi = durum_dosyasi if fcntl is not None else None
+        self._kilit = threading.Lock()
+        self._durum: Optional[Tuple[float, float]] = None
+        self.toplam_bekleme = 0.0
+
+        if durum_dosyasi and fcntl is None:
+            logger.warning("Dosya kilidi desteklenmiyor, hız sınırı sadece bu süreçte uygulanacak")
+
+        if self.durum_dosyasi:
+            dizin = os.path.dirname(self.durum_dosyasi)
+            if dizin and not os.path.exists(dizin):
+                os.makedirs(dizin, exist_ok=True)
+
+    def _token_al(self, durum: Optional[Tuple[float, float]], simdi: float) -> Tuple[Tuple[float, float], float]:
+        """
+        Token'ları doldurur ve mümkünse bir token harcar.
+
+        Returns:
+            Tuple: (yeni durum, beklenmesi gereken süre; 0 ise token alındı)
+        """
+        if durum is None:
+            tokenlar, son = self.kapasite, simdi
+        else:
+            tokenlar, son = durum
+            tokenlar = min(self.kapasite, tokenlar + max(simdi - son, 0) * self.hiz)
+
+        if tokenlar >= 1:
+            return (tokenlar - 1, simdi), 0.0
+        return (tokenlar, simdi), (1 - tokenlar) / self.hiz
+
+    def _dosyada_token_al(self, simdi: float) -> float:
+        """Durum dosyasını kilitleyerek token almayı dener."""
+        with open(self.durum_dosyasi, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                icerik = f.read()
+                try:
+                    durum = tuple(json.loads(icerik)) if icerik else None
+                except ValueError:
+                    durum = None
+
+                yeni_durum, bekle = self._token_al(durum, simdi)
+
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(yeni_durum))
+                f.flush()
+                return bekle
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def acquire(self) -> float:
+        """
+        Bir token alınana kadar bekler.
+
+        Returns:
+            float: Beklenen toplam süre (saniye)
+        """
+        beklenen = 0.0
+        while True:
+            with self._kilit:
+                simdi = time.time()
+                if self.durum_dosyasi:
+                    bekle = self._dosyada_token_al(simdi)
+                else:
+                    self._durum, bekle = self._token_al(self._durum, simdi)
+
+            if bekle <= 0:
+                self.toplam_bekleme += beklenen
+                return beklenen
+
+            time.sleep(bekle)
+            beklenen += bekle
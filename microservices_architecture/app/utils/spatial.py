@@ -0,0 +1,114 @@
+"""
+Mekânsal indeks (enlem/boylam ızgarası) ve haversine mesafesi.
+"""
+import heapq
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+DUNYA_YARICAPI_KM = 6371.0088
+_DERECE_KM = math.pi * DUNYA_YARICAPI_KM / 180
+
+# Halka sınırı, paralel boyunca ölçülen mesafeye göre hesaplanır; büyük daire
+# mesafesi bundan biraz kısa olabileceği için sınır bu oranla gevşetilir.
+_SINIR_PAYI = 0.95
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """İki nokta arasındaki büyük daire mesafesini kilometre olarak döndürür."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dlat = p2 - p1
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dlon / 2) ** 2
+    return 2 * DUNYA_YARICAPI_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    """
+    Noktaları sabit boyutlu enlem/boylam hücrelerine dağıtan ızgara indeksi.
+
+    En yakın k nokta sorgusu, sorgu noktasının hücresinden başlayarak
+    halkalar halinde genişler ve sadece bu hücrelerdeki adaylar için mesafe
+    hesaplar. Bir sonraki halkadaki en yakın olası nokta, bulunan k'ıncı
+    noktadan uzaksa arama durur. Boylam ±180 derecede sarmaz.
+    """
+
+    def __init__(self, noktalar: Iterable[Tuple[float, float, Any]], hucre_derece: float = 0.05):
+        """
+        Args:
+            noktalar: (enlem, boylam, veri) üçlüleri
+            hucre_derece: Hücre kenar uzunluğu (derece)
+        """
+        self.hucre_derece = hucre_derece
+        self._hucreler: Dict[Tuple[int, int], List[Tuple[float, float, Any]]] = defaultdict(list)
+        self.nokta_sayisi = 0
+        en_buyuk_enlem = 0.0
+
+        for lat, lon, veri in noktalar:
+            self._hucreler[self._hucre(lat, lon)].append((lat, lon, veri))
+            en_buyuk_enlem = max(en_buyuk_enlem, abs(lat))
+            self.nokta_sayisi += 1
+
+        self._hucreler = dict(self._hucreler)
+        if self._hucreler:
+            satirlar = [i for i, _ in self._hucreler]
+            sutunlar = [j for _, j in self._hucreler]
+            self._sinirlar = (min(satirlar), max(satirlar), min(sutunlar), max(sutunlar))
+        else:
+            self._sinirlar = (0, 0, 0, 0)
+
+        # Bir halka genişliğinin en kısa karşılığı (boylam derecesi en yüksek enlemde en kısadır)
+        self._halka_km = hucre_derece * _DERECE_KM * min(1.0, math.cos(math.radians(min(en_buyuk_enlem + hucre_derece, 90.0))))
+
+    def _hucre(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.hucre_derece), math.floor(lon / self.hucre_derece)
+
+    def _halka(self, ci: int, cj: int, r: int):
+        """(ci, cj) hücresine Chebyshev uzaklığı tam olarak r olan dolu hücrelerin noktalarını üretir."""
+        if r == 0:
+            yield from self._hucreler.get((ci, cj), ())
+            return
+
+        # Sadece indeksin kapsadığı hücreler dolaşılır (uzak sorgularda halkalar çok büyür)
+        imin, imax, jmin, jmax = self._sinirlar
+        j_bas, j_son = max(cj - r, jmin), min(cj + r, jmax)
+        for i in (ci - r, ci + r):
+            if imin <= i <= imax:
+                for j in range(j_bas, j_son + 1):
+                    yield from self._hucreler.get((i, j), ())
+        i_bas, i_son = max(ci - r + 1, imin), min(ci + r - 1, imax)
+        for j in (cj - r, cj + r):
+            if jmin <= j <= jmax:
+                for i in range(i_bas, i_son + 1):
+                    yield from self._hucreler.get((i, j), ())
+
+    def nearest(self, lat: float, lon: float, k: int) -> List[Tuple[float, Any]]:
+        """
+        Sorgu noktasına en yakın k noktayı döndürür.
+
+        Returns:
+            List[Tuple[float, Any]]: Yakından uzağa (mesafe_km, veri) çiftleri
+        """
+        if not self.nokta_sayisi or k <= 0:
+            return []
+
+        ci, cj = self._hucre(lat, lon)
+        imin, imax, jmin, jmax = self._sinirlar
+        son_halka = max(ci - imin, imax - ci, cj - jmin, jmax - cj)
+
+        # En yakın k aday, mesafeye göre ters sıralı yığında tutulur
+        yigin: List[Tuple[float, int, Any]] = []
+        sira = 0
+        for r in range(son_halka + 1):
+            # r'inci halkadaki noktalar sorgu noktasına en az (r - 1) hücre uzaklıktadır
+            if len(yigin) == k and (r - 1) * self._halka_km * _SINIR_PAYI > -yigin[0][0]:
+                break
+            for nlat, nlon, veri in self._halka(ci, cj, r):
+                mesafe = haversine_km(lat, lon, nlat, nlon)
+                sira += 1
+                if len(yigin) < k:
+                    heapq.heappush(yigin, (-mesafe, sira, veri))
+                elif mesafe < -yigin[0][0]:
+                    heapq.heapreplace(yigin, (-mesafe, sira, veri))
+
+        return [(-eksi_mesafe, veri) for eksi_mesafe, _, veri in sorted(yigin, reverse=True)]
@@ -0,0 +1,7 @@
+"""
+Performans ölçüm (benchmark) betikleri.
+
+Betikler `microservices_architecture` dizininden modül olarak çalıştırılır:
+
+    python -m benchmarks.bench_writer
+"""
@@ -0,0 +1,199 @@
+"""
+Eşzamanlı scraper motorunun yerel fixture sunucusuna karşı ölçümü.
+
+Birden fazla loopback adresinde (127.0.0.1, 127.0.0.2, ...) dinleyen yerel bir
+HTTP sunucusu her kaynak için `benchmarks/fixtures/edremit_tipik.html`
+sayfasını, eczane adlarının başına kaynak adını ekleyerek ve yapay bir
+gecikmeyle sunar. Kısaltılmış konum bağlantıları koordinatlı uzun URL'lerle
+değiştirilir; adresle geocoding istekleri aynı sunucudaki sahte Nominatim'e
+gider. Böylece ölçüm sırasında dışarıya hiçbir ağ isteği yapılmaz.
+
+Kaynaklar önce sırayla (eşzamanlılık 1), sonra yapılandırılan sınırlarla
+çekilir; süre, sunucu başına görülen en yüksek eşzamanlı istek sayısı ve
+yazılan satırlar raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_engine --kaynak 200 --sunucu 4 --gecikme 0.2
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "edremit_tipik.html")
+
+
+def fixture_sayfasi() -> str:
+    """Kısa bağlantıları koordinatlı uzun URL'lerle değiştirilmiş fixture sayfasını döndürür."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        sayfa = f.read()
+
+    sayac = iter(range(10 ** 6))
+    return re.sub(
+        r'https://(?:goo\.gl/maps|maps\.app\.goo\.gl)/[^"]+',
+        lambda _: f"https://www.google.com/maps?q=39.{next(sayac):04d},27.0100",
+        sayfa,
+    )
+
+
+class FixtureIsleyici(BaseHTTPRequestHandler):
+    """/kaynak/<ad> için fixture sayfasını, /search için sahte geocoding cevabını döndürür."""
+
+    def do_GET(self):
+        yol = urlparse(self.path).path
+        sunucu = self.server
+
+        if yol == "/search":
+            self._yanit(json.dumps([{"lat": "39.59", "lon": "27.02", "display_name": "Edremit"}]).encode(),
+                        "application/json")
+            return
+
+        if not yol.startswith("/kaynak/"):
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        ad = yol.rsplit("/", 1)[-1]
+        with sunucu.kilit:
+            sunucu.ucustaki += 1
+            sunucu.en_fazla = max(sunucu.en_fazla, sunucu.ucustaki)
+        try:
+            time.sleep(sunucu.gecikme)
+            sayfa = sunucu.sayfa.replace('itemwrap_title">', f'itemwrap_title">{ad} ')
+            self._yanit(sayfa.encode("utf-8"), "text/html; charset=utf-8")
+        finally:
+            with sunucu.kilit:
+                sunucu.ucustaki -= 1
+
+    def _yanit(self, veri: bytes, tur: str):
+        self.send_response(200)
+        self.send_header("Content-Type", tur)
+        self.send_header("Content-Length", str(len(veri)))
+        self.end_headers()
+        self.wfile.write(veri)
+
+    def log_message(self, *args):
+        pass
+
+
+def sunuculari_baslat(adet: int, gecikme: float):
+    """127.0.0.1 ... 127.0.0.<adet> adreslerinde aynı portta fixture sunucuları başlatır."""
+    sayfa = fixture_sayfasi()
+    sunucular = []
+    port = 0
+    for i in range(1, adet + 1):
+        sunucu = ThreadingHTTPServer((f"127.0.0.{i}", port), FixtureIsleyici)
+        port = sunucu.server_address[1]
+        sunucu.sayfa, sunucu.gecikme = sayfa, gecikme
+        sunucu.kilit, sunucu.ucustaki, sunucu.en_fazla = threading.Lock(), 0, 0
+        threading.Thread(target=sunucu.serve_forever, daemon=True).start()
+        sunucular.append(sunucu)
+    return sunucular
+
+
+def veritabanini_temizle():
+    """Önceki ölçümün çalışma ve eczane kayıtlarını siler."""
+    from app.database.connection import SessionLocal
+    from app.database.models import Eczane, NobetciEczane, ScrapeCalismasi
+
+    db = SessionLocal()
+    try:
+        for model in (NobetciEczane, Eczane, ScrapeCalismasi):
+            db.query(model).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def satir_sayilari():
+    """eczaneler ve nobetci_eczaneler tablolarındaki satır sayılarını döndürür."""
+    from app.database.connection import SessionLocal
+    from app.database.models import Eczane, NobetciEczane
+
+    db = SessionLocal()
+    try:
+        return db.query(Eczane).count(), db.query(NobetciEczane).count()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kaynak", type=int, default=200, help="Kaynak (belediye sayfası) sayısı")
+    parser.add_argument("--sunucu", type=int, default=4, help="Kaynakların dağıtıldığı sunucu (loopback adresi) sayısı")
+    parser.add_argument("--gecikme", type=float, default=0.2, help="Sayfa başına yapay sunucu gecikmesi (sn)")
+    parser.add_argument("--eszamanli", type=int, default=None, help="SCRAPER_MAX_CONCURRENCY (varsayılan: ayar)")
+    parser.add_argument("--sunucu-basina", type=int, default=None, help="SCRAPER_MAX_PER_HOST (varsayılan: ayar)")
+    parser.add_argument("--database-url", default=None, help="Boş bir test veritabanı (varsayılan: geçici SQLite)")
+    args = parser.parse_args()
+
+    sunucular = sunuculari_baslat(args.sunucu, args.gecikme)
+    port = sunucular[0].server_address[1]
+
+    gecici = tempfile.mkdtemp(prefix="bench_engine_")
+    os.environ.update({
+        "DATABASE_URL": args.database_url or f"sqlite:///{os.path.join(gecici, 'bench.db')}",
+        "LOG_FILE": os.path.join(gecici, "bench.log"),
+        "GEOCODER_URL": f"http://127.0.0.1:{port}",
+        "GEOCODE_RATE_PER_SECOND": "1000",
+        "GEOCODE_RATE_STATE_FILE": "",
+        "GEOCODE_CACHE_PATH": os.path.join(gecici, "cache.sqlite3"),
+    })
+
+    from loguru import logger
+    from app.config import get_settings
+    from app.database.models import create_tables
+    from app.database.schemas import ScraperKaynagi
+    from app.scraper.engine import run_sources
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    create_tables()
+
+    settings = get_settings()
+    kaynaklar = [
+        ScraperKaynagi(ad=f"belediye{i:04d}", url=f"http://127.0.0.{i % args.sunucu + 1}:{port}/kaynak/belediye{i:04d}")
+        for i in range(args.kaynak)
+    ]
+    eszamanli = args.eszamanli or settings.SCRAPER_MAX_CONCURRENCY
+    sunucu_basina = args.sunucu_basina or settings.SCRAPER_MAX_PER_HOST
+
+    print(f"{args.kaynak} kaynak, {args.sunucu} sunucu, sayfa başına {args.gecikme:.2f} sn gecikme")
+    print(f"{'mod':<10} {'genel':>6} {'sunucu':>7} {'süre (sn)':>10} {'en fazla/sunucu':>16} "
+          f"{'eczane':>8} {'nöbet':>8}  durumlar")
+
+    for mod, genel, sunucu_siniri in (("sirali", 1, 1), ("eszamanli", eszamanli, sunucu_basina)):
+        veritabanini_temizle()
+        settings.SCRAPER_MAX_CONCURRENCY = genel
+        settings.SCRAPER_MAX_PER_HOST = sunucu_siniri
+        for sunucu in sunucular:
+            sunucu.en_fazla = 0
+
+        baslangic = time.perf_counter()
+        durumlar = run_sources(kaynaklar)
+        sure = time.perf_counter() - baslangic
+
+        ozet = defaultdict(int)
+        for durum in durumlar.values():
+            ozet[durum] += 1
+        en_fazla = max(s.en_fazla for s in sunucular)
+        eczane, nobet = satir_sayilari()
+        print(f"{mod:<10} {genel:>6} {sunucu_siniri:>7} {sure:>10.2f} {en_fazla:>16} "
+              f"{eczane:>8} {nobet:>8}  {dict(ozet)}")
+
+        if en_fazla > sunucu_siniri:
+            raise SystemExit("Sunucu başına bağlantı sınırı aşıldı")
+
+    for sunucu in sunucular:
+        sunucu.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Geocoding worker'ı ve paylaşılan hız sınırının yerel sahte sunucuya karşı ölçümü.
+
+Nominatim'i taklit eden yerel bir HTTP sunucusu başlatır, birden fazla süreç ve
+thread'den aynı anda (tekrarlayan adreslerle) geocode isteği gönderir ve
+sunucuya gelen isteklerin hızını yapılandırılan sınırla karşılaştırır.
+
+Kullanım:
+    python -m benchmarks.bench_geocode_worker --hiz 10 --surec 2 --thread 8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class SahteNominatim(BaseHTTPRequestHandler):
+    """/search ve /reverse uçlarını taklit eden istek işleyici."""
+
+    def do_GET(self):
+        adres = urlparse(self.path)
+        sorgu = parse_qs(adres.query)
+        self.server.istek_zamanlari.append(time.time())
+
+        if adres.path == "/search":
+            q = sorgu.get("q", [""])[0]
+            govde = [] if "bulunamaz" in q else [{"lat": "39.59", "lon": "27.02", "display_name": q}]
+        elif adres.path == "/reverse":
+            govde = {"display_name": "Edremit, Balıkesir, Türkiye"}
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        veri = json.dumps(govde).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(veri)))
+        self.end_headers()
+        self.wfile.write(veri)
+
+    def log_message(self, *args):
+        pass
+
+
+def sahte_sunucu_baslat() -> ThreadingHTTPServer:
+    """Sahte sunucuyu rastgele bir portta arka planda başlatır."""
+    sunucu = ThreadingHTTPServer(("127.0.0.1", 0), SahteNominatim)
+    sunucu.istek_zamanlari = []
+    threading.Thread(target=sunucu.serve_forever, daemon=True).start()
+    return sunucu
+
+
+def surec_calistir(surec_no: int, thread_sayisi: int, adres_sayisi: int, kuyruk):
+    """Bir süreç içinde birden fazla thread'den geocode isteği gönderir."""
+    from loguru import logger
+    from app.utils.geocode import geocode_address, get_geocode_cache_stats
+
+    logger.remove()
+
+    # Her adres iki kez istenir; yarısı diğer süreçlerle ortak
+    adresler = [f"Ortak Sok. No:{i}" if i % 2 else f"Süreç {surec_no} Sok. No:{i}" for i in range(adres_sayisi)]
+    adresler = adresler * 2 + ["bulunamaz sok."]
+
+    with ThreadPoolExecutor(max_workers=thread_sayisi) as havuz:
+        list(havuz.map(geocode_address, adresler))
+
+    kuyruk.put(get_geocode_cache_stats())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hiz", type=float, default=10.0, help="İzin verilen istek/saniye")
+    parser.add_argument("--surec", type=int, default=2, help="Süreç sayısı")
+    parser.add_argument("--thread", type=int, default=8, help="Süreç başına thread sayısı")
+    parser.add_argument("--adres", type=int, default=20, help="Süreç başına farklı adres sayısı")
+    args = parser.parse_args()
+
+    sunucu = sahte_sunucu_baslat()
+    gecici = tempfile.mkdtemp(prefix="bench_geocode_")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(gecici, 'bench.db')}",
+        "LOG_FILE": os.path.join(gecici, "bench.log"),
+        "GEOCODER_URL": f"http://127.0.0.1:{sunucu.server_address[1]}",
+        "GEOCODE_RATE_PER_SECOND": str(args.hiz),
+        "GEOCODE_RATE_BURST": "1",
+        "GEOCODE_RATE_STATE_FILE": os.path.join(gecici, "rate.state"),
+        "GEOCODE_CACHE_PATH": os.path.join(gecici, "cache.sqlite3"),
+    })
+
+    kuyruk = multiprocessing.Queue()
+    surecler = [
+        multiprocessing.Process(target=surec_calistir, args=(i, args.thread, args.adres, kuyruk))
+        for i in range(args.surec)
+    ]
+    baslangic = time.time()
+    for surec in surecler:
+        surec.start()
+    istatistikler = [kuyruk.get() for _ in surecler]
+    for surec in surecler:
+        surec.join()
+    sure = time.time() - baslangic
+    sunucu.shutdown()
+
+    zamanlar = sorted(sunucu.istek_zamanlari)
+    olculen_hiz = (len(zamanlar) - 1) / (zamanlar[-1] - zamanlar[0]) if len(zamanlar) > 1 else 0.0
+    gonderilen = sum(i["kuyruk"]["gonderilen"] for i in istatistikler)
+    tekil = sum(i["kuyruk"]["tekillestirilen"] for i in istatistikler)
+    isabet = sum(i["isabet"] + i["negatif_isabet"] for i in istatistikler)
+
+    print(f"Süreç x thread: {args.surec} x {args.thread}, toplam süre: {sure:.2f} sn")
+    print(f"Sunucuya gelen istek: {len(zamanlar)}")
+    print(f"Ölçülen hız: {olculen_hiz:.2f} istek/sn (sınır: {args.hiz:.2f})")
+    print(f"Worker'a gönderilen: {gonderilen}, uçuştaki aynı istekle birleştirilen: {tekil}, önbellek isabeti: {isabet}")
+
+    if olculen_hiz > args.hiz * 1.05:
+        raise SystemExit("Hız sınırı aşıldı")
+
+
+if __name__ == "__main__":
+    main()
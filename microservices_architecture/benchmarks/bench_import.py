@@ -0,0 +1,119 @@
+"""
+Soğuk başlangıç içe aktarma süresi bütçesi.
+
+API ve scraper giriş modüllerini yeni bir Python sürecinde `-X importtime`
+ile içe aktarır ve her modül için en iyi (en kısa) toplam süreyi bütçeyle
+karşılaştırır. Ayrıca içe aktarma sırasında:
+
+- veritabanına bağlanılmadığını (SQLite dosyası oluşmamalı),
+- sadece kullanıldığında gereken ağır paketlerin (geopy, requests, psycopg2)
+  yüklenmediğini
+
+kontrol eder. Bir kontrol başarısız olursa betik hata koduyla biter; CI'da
+içe aktarma süresi gerilemelerini yakalamak için kullanılabilir.
+
+Kullanım:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --tekrar 10 --butce app.api.main=900 --butce app.scraper.service=600
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+# Modül -> içe aktarma süresi bütçesi (ms); fastapi, sqlalchemy ve pydantic dahil
+VARSAYILAN_BUTCELER = {
+    "app.api.main": 1000.0,
+    "app.scraper.service": 750.0,
+}
+
+# İçe aktarma sırasında yüklenmemesi gereken paketler
+YASAK_MODULLER = ("geopy", "requests", "psycopg2")
+
+_SATIR = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def ice_aktar(modul: str, database_url: str, log_dosyasi: str) -> Tuple[Dict[str, Tuple[int, int]], List[str]]:
+    """
+    Modülü yeni bir süreçte içe aktarır.
+
+    Returns:
+        Tuple: (modül -> (kendi süresi, toplam süre) mikrosaniye, yüklenen yasak modüller)
+    """
+    betik = (
+        "import sys\n"
+        f"import {modul}\n"
+        f"print(','.join(m for m in {YASAK_MODULLER!r} if m in sys.modules))\n"
+    )
+    ortam = {**os.environ, "DATABASE_URL": database_url, "LOG_FILE": log_dosyasi, "LOG_LEVEL": "WARNING"}
+    sonuc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", betik],
+        env=ortam, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True,
+    )
+    sureler = {}
+    for satir in sonuc.stderr.splitlines():
+        eslesme = _SATIR.match(satir)
+        if eslesme and eslesme.group(4) not in sureler:
+            sureler[eslesme.group(4)] = (int(eslesme.group(1)), int(eslesme.group(2)))
+    yuklenenler = [m for m in sonuc.stdout.strip().split(",") if m]
+    return sureler, yuklenenler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İçe aktarma süresi bütçesi")
+    parser.add_argument("--tekrar", type=int, default=5, help="Her modül için süreç sayısı (en iyisi alınır)")
+    parser.add_argument("--butce", action="append", default=[], metavar="MODUL=MS",
+                        help="Modül bütçesi (varsayılanların yerine geçer, birden fazla verilebilir)")
+    parser.add_argument("--ilk", type=int, default=10, help="En yavaş kaç app modülü listelensin")
+    args = parser.parse_args()
+
+    butceler = dict(VARSAYILAN_BUTCELER)
+    for deger in args.butce:
+        modul, _, ms = deger.partition("=")
+        butceler[modul] = float(ms)
+
+    gecici = tempfile.mkdtemp(prefix="bench_import_")
+    db_dosyasi = os.path.join(gecici, "ice_aktarma.db")
+    database_url = f"sqlite:///{db_dosyasi}"
+    log_dosyasi = os.path.join(gecici, "bench.log")
+
+    hatalar = []
+    for modul, butce in butceler.items():
+        en_iyi = None
+        for _ in range(args.tekrar):
+            sureler, yuklenenler = ice_aktar(modul, database_url, log_dosyasi)
+            if en_iyi is None or sureler[modul][1] < en_iyi[modul][1]:
+                en_iyi = sureler
+        toplam_ms = en_iyi[modul][1] / 1000
+
+        durum = "tamam" if toplam_ms <= butce else "BÜTÇE AŞILDI"
+        print(f"\n{modul}: {toplam_ms:.1f} ms (bütçe {butce:.0f} ms) - {durum}")
+        if toplam_ms > butce:
+            hatalar.append(f"{modul} içe aktarma süresi {toplam_ms:.1f} ms > {butce:.0f} ms")
+        if yuklenenler:
+            hatalar.append(f"{modul} içe aktarılırken yüklendi: {', '.join(yuklenenler)}")
+
+        # En uzun kendi süresi olan uygulama modülleri
+        uygulama = sorted(
+            ((ad, kendi) for ad, (kendi, _) in en_iyi.items() if ad == "app" or ad.startswith("app.")),
+            key=lambda x: x[1], reverse=True,
+        )
+        for ad, kendi in uygulama[:args.ilk]:
+            print(f"  {kendi / 1000:8.1f} ms  {ad}")
+
+    if os.path.exists(db_dosyasi):
+        hatalar.append("İçe aktarma sırasında veritabanına bağlanıldı (SQLite dosyası oluştu)")
+
+    if hatalar:
+        print("\nBaşarısız:")
+        for hata in hatalar:
+            print(f"  - {hata}")
+        sys.exit(1)
+    print("\nTüm kontroller geçti.")
+
+
+if __name__ == "__main__":
+    main()
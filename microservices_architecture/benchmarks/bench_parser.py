@@ -0,0 +1,107 @@
+"""
+HTML ayrıştırıcı arka uçlarının eşdeğerlik kontrolü ve karşılaştırması.
+
+`benchmarks/fixtures/` altındaki her sayfa tüm arka uçlarla ayrıştırılır.
+Arka uçların ürettiği ScraperEczane listeleri birebir aynı değilse betik hata
+koduyla çıkar. Ardından sayfa başına ayrıştırma süresi (medyan) ve en yüksek
+bellek kullanımı raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_parser --tekrar 20
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+FIXTURE_DIZINI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture_sayfalari():
+    """Fixture sayfalarını (ad, içerik) olarak döndürür."""
+    sayfalar = []
+    for yol in sorted(glob.glob(os.path.join(FIXTURE_DIZINI, "*.html"))):
+        with open(yol, "rb") as f:
+            sayfalar.append((os.path.basename(yol), f.read()))
+    return sayfalar
+
+
+def esdegerlik_kontrolu(sayfalar, backendler) -> bool:
+    """Tüm arka uçların her sayfa için aynı çıktıyı ürettiğini doğrular."""
+    from app.scraper.parser import parse_eczane_html
+
+    basarili = True
+    referans_backend = backendler[0]
+    for ad, icerik in sayfalar:
+        referans = [e.dict() for e in parse_eczane_html(icerik, referans_backend)]
+        for backend in backendler[1:]:
+            sonuc = [e.dict() for e in parse_eczane_html(icerik, backend)]
+            if sonuc != referans:
+                basarili = False
+                print(f"FARK: {ad}: {referans_backend.name} ({len(referans)} eczane) != {backend.name} ({len(sonuc)} eczane)")
+                for beklenen, gelen in zip(referans, sonuc):
+                    if beklenen != gelen:
+                        print(f"  {referans_backend.name}: {beklenen}")
+                        print(f"  {backend.name}: {gelen}")
+                        break
+        print(f"{ad}: {len(referans)} eczane")
+    return basarili
+
+
+def olc(icerik: bytes, backend, tekrar: int):
+    """
+    Ayrıştırma süresinin medyanını (ms) ve en yüksek bellek kullanımını (KiB) ölçer.
+
+    Bellek tracemalloc ile ölçülür; lxml'in C kütüphanesinde (libxml2) yaptığı
+    ayırmalar bu sayıya dahil değildir.
+    """
+    from app.scraper.parser import parse_eczane_html
+
+    sureler = []
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        parse_eczane_html(icerik, backend)
+        sureler.append((time.perf_counter() - baslangic) * 1000)
+
+    tracemalloc.start()
+    parse_eczane_html(icerik, backend)
+    _, tepe = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(sureler), tepe / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tekrar", type=int, default=20, help="Sayfa başına ölçüm tekrarı")
+    args = parser.parse_args()
+
+    gecici = tempfile.mkdtemp(prefix="bench_parser_")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(gecici, 'bench.db')}")
+    os.environ.setdefault("LOG_FILE", os.path.join(gecici, "bench.log"))
+
+    from loguru import logger
+    from app.scraper.backends import BACKENDS
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    backendler = [sinif() for sinif in BACKENDS.values()]
+    sayfalar = fixture_sayfalari()
+
+    if not esdegerlik_kontrolu(sayfalar, backendler):
+        raise SystemExit("Arka uçların çıktıları farklı")
+
+    print(f"\n{'sayfa':<30} {'arka uç':<8} {'boyut (KiB)':>12} {'süre (ms)':>10} {'bellek (KiB)':>13}")
+    for ad, icerik in sayfalar:
+        for backend in backendler:
+            sure, bellek = olc(icerik, backend, args.tekrar)
+            print(f"{ad:<30} {backend.name:<8} {len(icerik) / 1024:>12.1f} {sure:>10.2f} {bellek:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+En yakın nöbetçi eczane aramasının (mekânsal indeks) gecikme ölçümü.
+
+Türkiye sınırları içinde rastgele koordinatlı sentetik eczaneleri bugünün
+nöbetçisi olarak veritabanına yazar. Ardından:
+
+1. günlük indeksin oluşturulma süresini,
+2. indeks üzerinde doğrudan k-en-yakın sorgularının p50/p95/p99 gecikmesini,
+3. `GET /api/nobetci-eczaneler/yakin` endpoint'inin (uygulama içinde, ağsız)
+   p50/p95/p99 gecikmesini
+
+raporlar ve örnek sorgularda sonuçları kaba kuvvet aramasıyla karşılaştırır.
+
+Kullanım:
+    python -m benchmarks.bench_yakin --eczane 100000 --sorgu 10000
+"""
+import argparse
+import datetime
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Türkiye'yi kabaca kapsayan dikdörtgen
+ENLEM = (36.0, 42.0)
+BOYLAM = (26.0, 45.0)
+
+
+def yuzdelikler(sureler_ms):
+    """p50, p95 ve p99 değerlerini döndürür."""
+    sirali = sorted(sureler_ms)
+    return tuple(sirali[min(len(sirali) - 1, int(len(sirali) * oran))] for oran in (0.50, 0.95, 0.99))
+
+
+def sentetik_eczaneler(adet: int, rastgele: random.Random):
+    """Rastgele koordinatlı sentetik eczane verisi üretir."""
+    from app.database.schemas import ScraperEczane
+
+    return [
+        ScraperEczane(
+            bolge=f"BÖLGE {i % 81}",
+            isim=f"Sentetik Eczane {i:06d}",
+            konum_url="",
+            adres=f"Cumhuriyet Mah. {i} Sok.",
+            telefon="0266 000 00 00",
+            latitude=rastgele.uniform(*ENLEM),
+            longitude=rastgele.uniform(*BOYLAM),
+        )
+        for i in range(adet)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eczane", type=int, default=100000, help="Nöbetçi eczane sayısı")
+    parser.add_argument("--sorgu", type=int, default=10000, help="İndeks üzerinde ölçülecek sorgu sayısı")
+    parser.add_argument("--istek", type=int, default=2000, help="Endpoint üzerinden ölçülecek istek sayısı")
+    parser.add_argument("--k", type=int, default=5, help="Sorgu başına eczane sayısı")
+    parser.add_argument("--database-url", default=None, help="Boş bir test veritabanı (varsayılan: geçici SQLite)")
+    args = parser.parse_args()
+
+    gecici = tempfile.mkdtemp(prefix="bench_yakin_")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(gecici, 'bench.db')}"
+    os.environ.setdefault("LOG_FILE", os.path.join(gecici, "bench.log"))
+
+    from loguru import logger
+    from fastapi.testclient import TestClient
+    from app.api.main import app
+    from app.api.spatial_index import get_duty_index
+    from app.database.connection import Base, SessionLocal, engine
+    from app.database.models import create_tables
+    from app.database.version import bump_data_version
+    from app.scraper.writer import bulk_upsert
+    from app.utils.spatial import haversine_km
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    rastgele = random.Random(42)
+    bugun = datetime.date.today()
+
+    Base.metadata.drop_all(bind=engine)
+    create_tables()
+    veriler = sentetik_eczaneler(args.eczane, rastgele)
+    db = SessionLocal()
+    try:
+        bulk_upsert(db, veriler, bugun)
+        bump_data_version(db)
+        db.commit()
+
+        baslangic = time.perf_counter()
+        indeks = get_duty_index(db, bugun)
+        olusturma = time.perf_counter() - baslangic
+    finally:
+        db.close()
+
+    sorgular = [(rastgele.uniform(*ENLEM), rastgele.uniform(*BOYLAM)) for _ in range(args.sorgu)]
+
+    # Kaba kuvvet aramasıyla doğruluk kontrolü
+    noktalar = [(e.latitude, e.longitude, e.isim) for e in veriler]
+    for lat, lon in sorgular[:20]:
+        beklenen = [isim for _, isim in sorted((haversine_km(lat, lon, a, b), isim) for a, b, isim in noktalar)[:args.k]]
+        bulunan = [nobet["eczane"]["isim"] for _, nobet in indeks.nearest(lat, lon, args.k)]
+        if bulunan != beklenen:
+            raise SystemExit(f"Sonuçlar kaba kuvvet aramasından farklı: ({lat}, {lon})")
+
+    sureler = []
+    for lat, lon in sorgular:
+        baslangic = time.perf_counter()
+        indeks.nearest(lat, lon, args.k)
+        sureler.append((time.perf_counter() - baslangic) * 1000)
+    indeks_p, indeks_ort = yuzdelikler(sureler), statistics.mean(sureler)
+
+    with TestClient(app) as client:
+        sureler = []
+        for lat, lon in sorgular[:args.istek]:
+            baslangic = time.perf_counter()
+            yanit = client.get("/api/nobetci-eczaneler/yakin", params={"lat": lat, "lon": lon, "k": args.k})
+            sureler.append((time.perf_counter() - baslangic) * 1000)
+            if yanit.status_code != 200 or len(yanit.json()) != args.k:
+                raise SystemExit(f"Beklenmeyen yanıt: {yanit.status_code} {yanit.text[:200]}")
+    endpoint_p, endpoint_ort = yuzdelikler(sureler), statistics.mean(sureler)
+
+    print(f"{engine.dialect.name} - {args.eczane} nöbetçi eczane, k={args.k}")
+    print(f"İndeks oluşturma: {olusturma:.2f} sn (veritabanından okuma dahil)")
+    print(f"{'ölçüm':<18} {'adet':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'ort (ms)':>9}")
+    print(f"{'indeks sorgusu':<18} {args.sorgu:>7} {indeks_p[0]:>9.3f} {indeks_p[1]:>9.3f} {indeks_p[2]:>9.3f} "
+          f"{indeks_ort:>9.3f}")
+    print(f"{'endpoint':<18} {args.istek:>7} {endpoint_p[0]:>9.3f} {endpoint_p[1]:>9.3f} {endpoint_p[2]:>9.3f} "
+          f"{endpoint_ort:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,10 +27,13 @@ if __name__ == "__main__":
     
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", 8000))
+    kapanma_suresi = int(os.getenv("API_GRACEFUL_SHUTDOWN_SECONDS", 5))
     
     uvicorn.run(
         "app.api.main:app",
         host=host,
         port=port,
-        reload=True
+        reload=True,
+        # Açık bağlantılar (canlı yayın akışları) bu süreden sonra kesilir ve shutdown olayı çalışır
+        timeout_graceful_shutdown=kapanma_suresi
     )
\ No newline at end of file
@@ -3,10 +3,9 @@ Bu script, eczane scraper'ını çalıştıran ana dosyadır.
 Belirtilen saatte otomatik olarak çalıştırılacaktır.
 """
 import os
+import signal
 import sys
-import time
 from dotenv import load_dotenv
-from apscheduler.schedulers.background import BackgroundScheduler
 from loguru import logger
 
 # Projenin kök dizinini sys.path'e ekle
@@ -24,30 +23,28 @@ logger.add(
     format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}"
 )
 
-from app.scraper.service import scrape_and_save
-from app.scraper.scheduler import setup_scheduler
+from app.config import get_settings
+from app.database.models import create_tables
+from app.scraper.scheduler import run_leader_scheduler
 
 if __name__ == "__main__":
     logger.info("Eczane Scraper başlatılıyor...")
+    settings = get_settings()
     
-    # Günlük çalışma saati
-    scrape_hour = int(os.getenv("SCRAPE_HOUR", 15))
-    scrape_minute = int(os.getenv("SCRAPE_MINUTE", 0))
-    
-    # Scheduler'ı kur
-    scheduler = setup_scheduler(scrape_hour, scrape_minute)
-    scheduler.start()
+    # Scraper'ın kullandığı tabloların varlığından emin ol
+    if settings.AUTO_MIGRATE:
+        create_tables()
     
-    logger.info(f"Scheduler başlatıldı. Her gün saat {scrape_hour}:{scrape_minute:02d}'de çalışacak.")
+    # Günlük çalışma saati
+    scrape_hour = settings.SCRAPE_HOUR
+    scrape_minute = settings.SCRAPE_MINUTE
     
-    # Başlangıçta bir kez çalıştır
-    logger.info("Başlangıç verisi çekiliyor...")
-    scrape_and_save()
+    # docker stop (SIGTERM) da Ctrl+C gibi düzgün kapansın
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
     
+    logger.info(f"Scheduler her gün saat {scrape_hour}:{scrape_minute:02d}'de çalışacak (sadece lider kopyada).")
     try:
-        # Uygulamayı çalışır durumda tut
-        while True:
-            time.sleep(60)
+        # Lider kilidini bekler, alınca zamanlayıcıyı çalıştırır; ana thread burada kalır
+        run_leader_scheduler(scrape_hour, scrape_minute)
     except (KeyboardInterrupt, SystemExit):
         logger.info("Uygulama kapatılıyor...")
-        scheduler.shutdown()
\ No newline at end of file